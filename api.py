@@ -23,8 +23,9 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from guvna import Guvna, LibraryIndex
-from banks import ensure_curiosity_table
+from banks import ensure_curiosity_table, ensure_curiosity_queue_table
 from curiosity import CuriosityEngine
+import threat_intel
 from session import (
     ensure_session_table,
     load_session,
@@ -274,10 +275,11 @@ def serve_client():
 # ---------------------------------------------------------------------------
 @app.on_event("startup")
 def on_startup() -> None:
-    """Boot sequence: ensure tables, start curiosity background thread."""
+    """Boot sequence: ensure tables, start curiosity and threat intel threads."""
     try:
         ensure_curiosity_table()
-        logger.info("Banks curiosity table ready.")
+        ensure_curiosity_queue_table()
+        logger.info("Banks curiosity tables ready.")
     except Exception as e:
         logger.warning("Could not ensure curiosity table on startup: %s", e)
     try:
@@ -290,12 +292,16 @@ def on_startup() -> None:
         logger.info("Curiosity engine started (she thinks when nobody's talking).")
     else:
         logger.info("Curiosity engine idle (no search_fn wired).")
+    # One worker per host wins the refresher lock and polls the feeds;
+    # the rest map the snapshot it publishes.
+    threat_intel.start_background()
 
 @app.on_event("shutdown")
 def on_shutdown() -> None:
-    """Clean shutdown: stop curiosity thread."""
+    """Clean shutdown: stop curiosity and threat intel threads."""
     curiosity_engine.stop_background()
     logger.info("Curiosity engine stopped.")
+    threat_intel.stop_background()
 
 # ---------------------------------------------------------------------------
 # Pydantic models
@@ -599,6 +605,8 @@ def run_rilie(req: RilieRequest, request: Request) -> Dict[str, Any]:
     snapshot_talk_memory(talk_memory, session)
     save_session(session)
 
+    # Kitchen runners-up are for TALK, not the customer.
+    result.pop("alternates", None)
     if req.chef_mode:
         return result
     return build_plate(result)
@@ -17,6 +17,8 @@ Assumes:
   - Table banks_self_reflection created by migration V003 (see ensure_self_reflection_table).
   - Table banks_dna_log created by migration V004 (see ensure_dna_log_table).
   - Table banks_domain_usage created by migration V005 (see ensure_domain_usage_table).
+  - Table banks_curiosity_queue created by migration V007 (see ensure_curiosity_queue_table).
+  - Table banks_measurestick created by migration V008 (see ensure_measurestick_table).
 """
 
 import os
@@ -84,6 +86,49 @@ def ensure_curiosity_table():
         logger.warning("Could not ensure curiosity table: %s", e)
 
 
+# ---------------------------------------------------------------------------
+# Auto-create curiosity queue table — tangents waiting, shared by all workers
+# ---------------------------------------------------------------------------
+
+def ensure_curiosity_queue_table():
+    """
+    Idempotently create banks_curiosity_queue if it doesn't exist yet.
+    The durable form of curiosity.CuriosityQueue: any worker pushes,
+    the curiosity leader claims rows with FOR UPDATE SKIP LOCKED.
+    tangent_key is the normalized tangent, so duplicates never land;
+    priority is the aging rank (interest - aging * hours since epoch).
+    Safe to call on every startup.
+    """
+    sql = """
+        CREATE TABLE IF NOT EXISTS banks_curiosity_queue (
+            id              BIGSERIAL PRIMARY KEY,
+            tangent         TEXT NOT NULL,
+            tangent_key     TEXT NOT NULL UNIQUE,
+            seed_query      TEXT,
+            relevance       FLOAT DEFAULT 0.0,
+            interest        FLOAT DEFAULT 0.0,
+            priority        FLOAT NOT NULL DEFAULT 0.0,
+            attempts        INT DEFAULT 0,
+            claimed_at      TIMESTAMPTZ,
+            queued_at       TIMESTAMPTZ DEFAULT now()
+        );
+        ALTER TABLE banks_curiosity_queue
+            ADD COLUMN IF NOT EXISTS priority FLOAT NOT NULL DEFAULT 0.0;
+        CREATE INDEX IF NOT EXISTS idx_curiosity_queue_claim
+            ON banks_curiosity_queue (claimed_at, id);
+        CREATE INDEX IF NOT EXISTS idx_curiosity_queue_priority
+            ON banks_curiosity_queue (priority DESC, id);
+    """
+    try:
+        with get_db_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+            conn.commit()
+        logger.info("banks_curiosity_queue table ensured.")
+    except Exception as e:
+        logger.warning("Could not ensure curiosity_queue table: %s", e)
+
+
 # ---------------------------------------------------------------------------
 # Auto-create self-reflection table
 # ---------------------------------------------------------------------------
@@ -207,6 +252,44 @@ def ensure_domain_usage_table():
         logger.warning("Could not ensure domain_usage table: %s", e)
 
 
+# ---------------------------------------------------------------------------
+# Auto-create measurestick signal table
+# ---------------------------------------------------------------------------
+
+def ensure_measurestick_table():
+    """
+    Idempotently create banks_measurestick if it doesn't exist yet.
+    One row per SAMPLED turn (see rilie_measurestick): quality signal for
+    offline study, never read on the request path.
+    Safe to call on every startup.
+    """
+    sql = """
+        CREATE TABLE IF NOT EXISTS banks_measurestick (
+            id                SERIAL PRIMARY KEY,
+            stimulus          TEXT NOT NULL,
+            rilie_response    TEXT NOT NULL,
+            baseline_response TEXT NOT NULL,
+            relevance         FLOAT DEFAULT 0,
+            originality       FLOAT DEFAULT 0,
+            coherence         FLOAT DEFAULT 0,
+            google_hits       INTEGER DEFAULT -1,
+            recommendation    TEXT,
+            reason            TEXT,
+            created_at        TIMESTAMPTZ DEFAULT now()
+        );
+        CREATE INDEX IF NOT EXISTS idx_measurestick_created
+            ON banks_measurestick (created_at);
+    """
+    try:
+        with get_db_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+            conn.commit()
+        logger.info("banks_measurestick table ensured.")
+    except Exception as e:
+        logger.warning("Could not ensure measurestick table: %s", e)
+
+
 # ---------------------------------------------------------------------------
 # Ensure ALL tables — single call for startup
 # ---------------------------------------------------------------------------
@@ -217,9 +300,11 @@ def ensure_all_tables():
     Graceful — each table creation is independent.
     """
     ensure_curiosity_table()
+    ensure_curiosity_queue_table()
     ensure_self_reflection_table()
     ensure_dna_log_table()
     ensure_domain_usage_table()
+    ensure_measurestick_table()
 
 
 # ---------------------------------------------------------------------------
@@ -352,6 +437,21 @@ def search_banks_by_keywords(
 # Minimum quality score for a curiosity insight to be kept
 CURIOSITY_TASTE_THRESHOLD = 0.6
 
+# Called with the stored row (id included) every time an insight is kept.
+# The in-process resurfacing index (curiosity_index.py) listens here.
+_curiosity_listeners: List[Callable[[Dict], None]] = []
+
+
+def add_curiosity_listener(fn: Callable[[Dict], None]) -> None:
+    """Register fn(row) to hear about every kept insight this process stores."""
+    if fn not in _curiosity_listeners:
+        _curiosity_listeners.append(fn)
+
+
+def remove_curiosity_listener(fn: Callable[[Dict], None]) -> None:
+    if fn in _curiosity_listeners:
+        _curiosity_listeners.remove(fn)
+
 def store_curiosity(
     seed_query: str,
     tangent: str,
@@ -382,12 +482,14 @@ def store_curiosity(
             (origin, seed_query, tangent, research, insight, quality_score, kept)
         VALUES
             (%s, %s, %s, %s, %s, %s, %s)
+        RETURNING id, created_at
     """
     try:
         with get_db_conn() as conn:
             with conn.cursor() as cur:
                 cur.execute(sql, (origin, seed_query, tangent,
                                   research, insight, quality_score, kept))
+                row_id, created_at = cur.fetchone()
             conn.commit()
         logger.info("Curiosity stored [kept=%s, score=%.2f]: %s",
                      kept, quality_score, tangent[:80])
@@ -395,9 +497,52 @@ def store_curiosity(
         logger.error("Failed to store curiosity: %s", e)
         return False
 
+    if kept:
+        row = {
+            "id": row_id,
+            "origin": origin,
+            "seed_query": seed_query,
+            "tangent": tangent,
+            "insight": insight,
+            "quality_score": quality_score,
+            "created_at": created_at,
+        }
+        for fn in list(_curiosity_listeners):
+            try:
+                fn(row)
+            except Exception as e:
+                logger.warning("Curiosity listener failed: %s", e)
+
     return kept
 
 
+def load_kept_curiosities(after_id: int = 0, limit: int = 5000) -> List[Dict]:
+    """
+    Kept insights with id > after_id, oldest first, at most `limit`.
+    Page through with the last id seen — how the resurfacing index loads.
+    """
+    sql = """
+        SELECT
+            id,
+            origin,
+            seed_query,
+            tangent,
+            insight,
+            quality_score,
+            created_at
+        FROM banks_curiosity
+        WHERE kept = TRUE
+          AND id > %s
+        ORDER BY id
+        LIMIT %s
+    """
+    with get_db_conn() as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+            cur.execute(sql, (after_id, limit))
+            rows = cur.fetchall()
+    return [dict(r) for r in rows]
+
+
 def search_curiosity(
     query_text: str,
     limit: int = 5,
@@ -788,6 +933,91 @@ def get_domain_usage_stats() -> Dict:
         return {"domains": [], "total_probes": 0}
 
 
+# ---------------------------------------------------------------------------
+# Measurestick signals — sampled turns, written in batches
+# ---------------------------------------------------------------------------
+
+def store_measurestick_signals(signals: List[Dict[str, Any]]) -> int:
+    """
+    Insert a batch of measurestick signals in one statement.
+
+    Each signal has stimulus, rilie_response, baseline_response and the
+    measure dict from rilie_foundation._measurestick. Texts are cut to
+    500 chars, as they always were.
+
+    Returns:
+        Number of rows inserted. Raises on database errors; the caller
+        (a background writer) decides what a lost batch costs.
+    """
+    if not signals:
+        return 0
+    rows = []
+    for s in signals:
+        measure = s.get("measure") or {}
+        rows.append((
+            (s.get("stimulus") or "")[:500],
+            (s.get("rilie_response") or "")[:500],
+            (s.get("baseline_response") or "")[:500],
+            measure.get("relevance", 0),
+            measure.get("originality", 0),
+            measure.get("coherence", 0),
+            measure.get("google_hits", -1),
+            measure.get("recommendation", ""),
+            measure.get("reason", ""),
+            s.get("created_at"),
+        ))
+    sql = """
+        INSERT INTO banks_measurestick
+            (stimulus, rilie_response, baseline_response,
+             relevance, originality, coherence, google_hits,
+             recommendation, reason, created_at)
+        VALUES
+            %s
+    """
+    with get_db_conn() as conn:
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(
+                cur, sql, rows,
+                template="(%s,%s,%s,%s,%s,%s,%s,%s,%s,COALESCE(%s,now()))",
+            )
+        conn.commit()
+    return len(rows)
+
+
+def get_measurestick_stats(days: int = 7) -> Dict:
+    """
+    The measurestick metric, computed offline from sampled turns.
+
+    Averages and recommendation mix over the last `days`. Every row is a
+    sample, so these are estimates of the whole population of turns.
+    """
+    sql = """
+        SELECT
+            count(*)                                        AS sampled,
+            avg(relevance)                                  AS relevance,
+            avg(originality)                                AS originality,
+            avg(coherence)                                  AS coherence,
+            avg(google_hits) FILTER (WHERE google_hits >= 0) AS google_hits,
+            count(*) FILTER (WHERE recommendation = 'SERVE')           AS serve,
+            count(*) FILTER (WHERE recommendation = 'ANNOTATE')        AS annotate,
+            count(*) FILTER (WHERE recommendation = 'PREFER_BASELINE') AS prefer_baseline
+        FROM banks_measurestick
+        WHERE created_at >= now() - make_interval(days => %s)
+    """
+    try:
+        with get_db_conn() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
+                cur.execute(sql, (days,))
+                row = dict(cur.fetchone())
+        for key in ("relevance", "originality", "coherence", "google_hits"):
+            row[key] = round(float(row[key]), 3) if row[key] is not None else None
+        row["days"] = days
+        return row
+    except Exception as e:
+        logger.error("Failed to get measurestick stats: %s", e)
+        return {"sampled": 0, "days": days}
+
+
 # ---------------------------------------------------------------------------
 # Unified search — everything RILIE knows
 # ---------------------------------------------------------------------------
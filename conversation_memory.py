@@ -49,6 +49,7 @@ import logging
 import re
 import random
 import time
+from collections import Counter
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 
@@ -57,6 +58,16 @@ logger = logging.getLogger("conversation_memory")
 # The default name. Eleven meanings. One word.
 DEFAULT_NAME = "Mate"
 
+# Per-session bounds. Energy reads the last 3 turns, register the last
+# 3 detections; a little slack past that, nothing more.
+ENERGY_WINDOW = 8
+REGISTER_WINDOW = 3
+# Moments carried in the session row: the most recent beautiful ones,
+# then the most recent ordinary ones, oldest first.
+MOMENT_STATE_MAX = 40
+MOMENT_STATE_ORDINARY = 10
+MOMENT_EXCERPT_WORDS = 40   # longest excerpt any behavior quotes back
+
 # ============================================================================
 # MOMENT — a single conversational beat worth remembering
 # ============================================================================
@@ -113,6 +124,7 @@ class EnergyTracker:
 
         energy = max(0.0, min(1.0, raw))
         self.history.append(energy)
+        del self.history[:-ENERGY_WINDOW]
         return energy
 
     @property
@@ -1400,6 +1412,90 @@ class ConversationMemory:
             "christening_done": self._christening_done,
         }
 
+    # -----------------------------------------------------------------
+    # SESSION STATE — the memory rides in the session row
+    # -----------------------------------------------------------------
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Compact, JSON-ready per-session state.
+
+        Energy and moment numbers go in as parallel arrays, moment text as
+        excerpts no longer than any behavior quotes back. At most
+        MOMENT_STATE_MAX moments: recent beautiful ones first in line,
+        then the last few ordinary ones.
+        """
+        beautiful = [i for i, m in enumerate(self.moments) if m.is_beautiful]
+        ordinary = [i for i, m in enumerate(self.moments) if not m.is_beautiful]
+        ordinary = ordinary[-MOMENT_STATE_ORDINARY:]
+        keep = sorted(beautiful[-(MOMENT_STATE_MAX - len(ordinary)):] + ordinary)
+        kept = [self.moments[i] for i in keep]
+        return {
+            "energy": [round(e, 3) for e in self.energy_tracker.history],
+            "register": list(self.register.register_history),
+            "m_turn": [m.turn for m in kept],
+            "m_resonance": [round(m.resonance, 3) for m in kept],
+            "m_energy": [round(m.user_energy, 3) for m in kept],
+            "m_time": [int(m.timestamp) for m in kept],
+            "m_words": [self._excerpt(m.user_words, MOMENT_EXCERPT_WORDS) for m in kept],
+            "m_domain": [m.domain_hit for m in kept],
+            "m_tone": [m.tone for m in kept],
+            "m_tag": [m.tag for m in kept],
+            "prev_domains": list(self.prev_domains),
+            "last_polaroid_turn": self.last_polaroid_turn,
+            "christened": self._christening_done,
+            "pending_question": self._pending_question,
+        }
+
+    def load_state(self, state: Optional[Dict[str, Any]]) -> None:
+        """
+        Replace all per-session state with `state` (from to_state()).
+
+        None or an empty dict gives a fresh conversation, so one shared
+        instance can serve session after session without carrying any of
+        them over. turn_count and user_name come from the session row.
+
+        The row is JSONB, written by whatever version saved it last. A
+        field that doesn't parse falls back to its fresh value, and a
+        moment that doesn't parse is skipped. Junk never fails the turn.
+        """
+        state = state if isinstance(state, dict) else {}
+
+        def listed(key: str) -> list:
+            value = state.get(key)
+            return value if isinstance(value, list) else []
+
+        pending = state.get("pending_question")
+        self._pending_question = pending if isinstance(pending, str) else None
+        try:
+            energy = [float(e) for e in listed("energy")][-ENERGY_WINDOW:]
+        except (TypeError, ValueError):
+            energy = []
+        self.energy_tracker.history = energy
+        history = [str(r) for r in listed("register")][-REGISTER_WINDOW:]
+        self.register.register_history = history
+        self.register.current_register = (
+            Counter(history).most_common(1)[0][0] if history else "casual"
+        )
+        columns = [listed(k) for k in (
+            "m_turn", "m_words", "m_domain", "m_tone",
+            "m_resonance", "m_tag", "m_energy", "m_time",
+        )]
+        self.moments = []
+        for turn, words, domain, tone, res, tag, energy, ts in zip(*columns):
+            try:
+                self.moments.append(Moment(
+                    int(turn), str(words), str(domain or ""), str(tone),
+                    float(res), str(tag), float(energy), float(ts)))
+            except (TypeError, ValueError):
+                continue
+        self.prev_domains = [str(d) for d in listed("prev_domains")]
+        try:
+            self.last_polaroid_turn = int(state.get("last_polaroid_turn", 0))
+        except (TypeError, ValueError):
+            self.last_polaroid_turn = 0
+        self._christening_done = bool(state.get("christened", False))
+
 
 # ============================================================================
 # REGISTER GATE — speak the language the LISTENER speaks
@@ -1460,8 +1556,8 @@ class RegisterGate:
             register = "casual"
 
         self.register_history.append(register)
+        del self.register_history[:-REGISTER_WINDOW]
         recent = self.register_history[-3:]
-        from collections import Counter
         self.current_register = Counter(recent).most_common(1)[0][0]
         return self.current_register
 
@@ -1620,3 +1716,68 @@ def apply_sequence_bonus(moments: List[Moment]) -> None:
         bonus = 0.1
         curr.resonance = min(1.0, curr.resonance + bonus)
         return
+
+
+# ============================================================================
+# FOOTPRINT — python conversation_memory.py
+# ============================================================================
+
+def _bench_footprint(sessions: int = 200, turns: int = 60) -> None:
+    """Shared buffer vs per-session state: what each session costs."""
+    import json
+    import tracemalloc
+
+    rng = random.Random(40)
+    domains = ["music", "physics", "cooking", "history", "", "philosophy"]
+    tones = ["curious", "neutral", "excited", "reflective"]
+    words = ("rakim coltrane entropy grief joy river kitchen why how "
+             "compression source beauty truth the a of and").split()
+
+    def say() -> str:
+        n = rng.choice((4, 12, 30, 120))
+        return " ".join(rng.choice(words) for _ in range(n)) + rng.choice(("?", "!", "."))
+
+    def turn(mem: ConversationMemory) -> None:
+        d = rng.choice(domains)
+        mem.process_turn(say(), [d] if d else [], rng.random(), rng.choice(tones))
+
+    # Before: one instance, every session's turns land in it.
+    tracemalloc.start()
+    base = tracemalloc.take_snapshot()
+    shared = ConversationMemory()
+    shared.turn_count = 3
+    for _ in range(sessions * turns):
+        turn(shared)
+    shared_bytes = sum(st.size_diff for st in
+                       tracemalloc.take_snapshot().compare_to(base, "filename"))
+    tracemalloc.stop()
+
+    # After: load → turn → save per request; only the rows persist.
+    mem = ConversationMemory()
+    rows: Dict[int, Dict[str, Any]] = {}
+    for _ in range(sessions * turns):
+        sid = rng.randrange(sessions)
+        mem.load_state(rows.get(sid))
+        mem.turn_count = 3
+        turn(mem)
+        rows[sid] = mem.to_state()
+    row_bytes = [len(json.dumps(r)) for r in rows.values()]
+
+    tracemalloc.start()
+    base = tracemalloc.take_snapshot()
+    loaded = ConversationMemory()
+    loaded.load_state(max(rows.values(), key=lambda r: len(json.dumps(r))))
+    live_bytes = sum(st.size_diff for st in
+                     tracemalloc.take_snapshot().compare_to(base, "filename"))
+    tracemalloc.stop()
+
+    print(f"shared instance after {sessions * turns} turns: "
+          f"{len(shared.moments)} moments, {shared_bytes / 1024:.0f} KiB, "
+          f"energy history {len(shared.energy_tracker.history)}")
+    print(f"per-session row: mean {sum(row_bytes) / len(row_bytes) / 1024:.1f} KiB, "
+          f"max {max(row_bytes) / 1024:.1f} KiB")
+    print(f"largest session loaded live: {live_bytes / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    _bench_footprint()
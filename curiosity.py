@@ -8,23 +8,70 @@ researches it, runs it through the Triangle, and stores worthy
 insights back into Banks.
 
 She doesn't just answer. She *wonders*.
+
+With a database configured, the queue lives in Postgres (shared by every
+gunicorn worker, survives restarts) and only one worker per deployment,
+the curiosity leader, actually processes it. Without one, everything
+stays in-process like before.
+
+Resurfacing reads curiosity_index.CuriosityIndex, which every worker
+keeps in memory and refreshes from the background loop.
 """
 
+import heapq
+import itertools
 import logging
+import math
+import os
 import threading
 import time
 from collections import deque
-from typing import Dict, Any, List, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Any, List, Optional, Callable
 
-from banks import store_curiosity, search_curiosity, get_curiosity_stats
+from banks import (
+    get_db_conn,
+    store_curiosity,
+    get_curiosity_stats,
+    add_curiosity_listener,
+    remove_curiosity_listener,
+)
+from curiosity_index import CuriosityIndex, RESURFACE_MIN_SCORE
 
 logger = logging.getLogger("curiosity")
 
 
+def _worth_queueing(relevance: float, interest: float) -> bool:
+    """The filter: not useful to the user right now, but interesting."""
+    return relevance < 0.5 and interest >= 0.7
+
+
+def _tangent_key(tangent: str) -> str:
+    return tangent.lower().strip()
+
+
 # ---------------------------------------------------------------------------
 # The Queue — tangents waiting to be explored
 # ---------------------------------------------------------------------------
 
+# Waiting raises priority: interest + AGING * hours waited. Because every
+# item ages at the same rate, that ordering equals ordering by the fixed
+# rank interest - AGING * queued_at, so the heap never needs rekeying.
+CURIOSITY_AGING_PER_HOUR = 0.3
+
+# What a full queue does with one more tangent.
+#   drop_lowest — evict the lowest-ranked item, unless the newcomer is lower
+#   drop_oldest — evict the oldest (the old deque(maxlen) behaviour)
+#   reject_new  — keep what's there, turn the newcomer away
+DROP_POLICIES = ("drop_lowest", "drop_oldest", "reject_new")
+
+
+def _rank(interest: float, queued_at: float,
+          aging_per_hour: float = CURIOSITY_AGING_PER_HOUR) -> float:
+    return interest - aging_per_hour * queued_at / 3600.0
+
+
 class CuriosityQueue:
     """
     Thread-safe queue of tangents RILIE wants to explore.
@@ -33,55 +80,500 @@ class CuriosityQueue:
       - seed_query: the user query that sparked it (str)
       - relevance: how relevant it was to the user response (float, 0-1)
       - interest: how interesting it is on its own (float, 0-1)
+
+    Highest interest first, with aging so nothing starves. Duplicates
+    (normalized tangent text) are caught by a dict, not a scan. Two heaps
+    over the same entries give the best (pop) and worst (eviction) item;
+    removed entries are marked dead and skipped lazily. Every way a
+    tangent can fail to get in, or get pushed out, is counted.
     """
-    def __init__(self, max_size: int = 50):
-        self._queue: deque = deque(maxlen=max_size)
+    def __init__(
+        self,
+        max_size: int = 50,
+        drop_policy: str = "drop_lowest",
+        aging_per_hour: float = CURIOSITY_AGING_PER_HOUR,
+    ):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"drop_policy must be one of {DROP_POLICIES}")
+        self.max_size = max_size
+        self.drop_policy = drop_policy
+        self.aging_per_hour = aging_per_hour
+        # entry = [rank, seq, key, item, alive]
+        self._best: List[tuple] = []          # (-rank, seq, entry)
+        self._worst: List[tuple] = []         # (rank, -seq, entry)
+        self._index: Dict[str, list] = {}     # key → entry, insertion order = age
+        self._seq = itertools.count()
         self._lock = threading.Lock()
+        self.counters: Dict[str, int] = dict.fromkeys(
+            ("queued", "popped", "filtered", "duplicate", "rejected", "evicted"), 0
+        )
 
     def push(self, tangent: str, seed_query: str,
              relevance: float, interest: float) -> bool:
         """
         Add a tangent to the curiosity queue.
         Only queues if: low relevance to user BUT high self-interest.
-        Returns True if queued, False if filtered out.
+        Returns True if queued, False if filtered out, a duplicate, or
+        turned away by the drop policy.
         """
-        # The filter: not useful to the user right now, but interesting
-        if relevance >= 0.5 or interest < 0.7:
+        if not _worth_queueing(relevance, interest):
+            with self._lock:
+                self.counters["filtered"] += 1
             return False
 
+        now = time.time()
         item = {
             "tangent": tangent,
             "seed_query": seed_query,
             "relevance": relevance,
             "interest": interest,
-            "queued_at": time.time(),
+            "queued_at": now,
         }
+        key = _tangent_key(tangent)
+        rank = _rank(interest, now, self.aging_per_hour)
 
         with self._lock:
-            # Don't queue duplicates (same tangent text)
-            for existing in self._queue:
-                if existing["tangent"].lower().strip() == tangent.lower().strip():
+            if key in self._index:
+                self.counters["duplicate"] += 1
+                return False
+            if len(self._index) >= self.max_size:
+                if self.drop_policy == "reject_new":
+                    self.counters["rejected"] += 1
                     return False
-            self._queue.append(item)
-            logger.info("Curiosity queued [interest=%.2f]: %s", interest, tangent[:80])
-            return True
+                if self.drop_policy == "drop_oldest":
+                    victim = next(iter(self._index.values()))
+                else:
+                    victim = self._peek_worst()
+                    if victim[0] >= rank:
+                        self.counters["rejected"] += 1
+                        return False
+                self._remove(victim)
+                self.counters["evicted"] += 1
+                logger.info("Curiosity evicted (%s): %s", self.drop_policy,
+                            victim[3]["tangent"][:80])
+            seq = next(self._seq)
+            entry = [rank, seq, key, item, True]
+            self._index[key] = entry
+            heapq.heappush(self._best, (-rank, seq, entry))
+            heapq.heappush(self._worst, (rank, -seq, entry))
+            self.counters["queued"] += 1
+        logger.info("Curiosity queued [interest=%.2f]: %s", interest, tangent[:80])
+        return True
 
     def pop(self) -> Optional[Dict]:
-        """Pop the next tangent to explore. Returns None if empty."""
+        """Pop the highest-priority tangent. Returns None if empty."""
         with self._lock:
-            if not self._queue:
-                return None
-            return self._queue.popleft()
+            while self._best:
+                entry = heapq.heappop(self._best)[2]
+                if entry[4]:
+                    self._remove(entry)
+                    self.counters["popped"] += 1
+                    return entry[3]
+            return None
+
+    def done(self, item: Dict) -> None:
+        """Nothing to acknowledge: pop() already removed it."""
 
     def peek_all(self) -> List[Dict]:
-        """View everything in the queue without removing."""
+        """View everything in the queue, in pop order, without removing."""
         with self._lock:
-            return list(self._queue)
+            entries = sorted(self._index.values(), key=lambda e: (-e[0], e[1]))
+        return [e[3] for e in entries]
 
     @property
     def size(self) -> int:
         with self._lock:
-            return len(self._queue)
+            return len(self._index)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.counters, "size": len(self._index),
+                    "max_size": self.max_size, "drop_policy": self.drop_policy}
+
+    def _peek_worst(self) -> list:
+        while not self._worst[0][2][4]:
+            heapq.heappop(self._worst)
+        return self._worst[0][2]
+
+    def _remove(self, entry: list) -> None:
+        entry[4] = False
+        del self._index[entry[2]]
+        # Dead entries linger in the other heap; rebuild once they dominate.
+        live = len(self._index)
+        if len(self._best) > 2 * live + 64:
+            self._best = [(-e[0], e[1], e) for e in self._index.values()]
+            heapq.heapify(self._best)
+        if len(self._worst) > 2 * live + 64:
+            self._worst = [(e[0], -e[1], e) for e in self._index.values()]
+            heapq.heapify(self._worst)
+
+
+# ---------------------------------------------------------------------------
+# The Durable Queue — same tangents, in Postgres, shared by every worker
+# ---------------------------------------------------------------------------
+
+# A claimed tangent that isn't done() within the lease (worker died
+# mid-search) goes back in line, up to MAX_ATTEMPTS claims in all.
+CLAIM_LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+
+_CLAIMABLE = """
+    (claimed_at IS NULL OR claimed_at < now() - make_interval(secs => %s))
+    AND attempts < %s
+"""
+
+
+class PostgresCuriosityQueue:
+    """
+    CuriosityQueue over banks_curiosity_queue (banks.ensure_curiosity_queue_table).
+
+    Any worker can push. pop() claims the best claimable row with
+    FOR UPDATE SKIP LOCKED, so concurrent claimers never block on or
+    double-claim a row; done() deletes it once processed. Rows carry the
+    same aging rank as the in-process queue, and a full queue applies
+    the same drop policy. Counters are this process's share. DB errors
+    are logged and read as "nothing there".
+    """
+    _KEEP_ORDER = {"drop_lowest": "priority DESC, id", "drop_oldest": "id DESC"}
+
+    def __init__(self, max_size: int = 50, drop_policy: str = "drop_lowest",
+                 aging_per_hour: float = CURIOSITY_AGING_PER_HOUR):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"drop_policy must be one of {DROP_POLICIES}")
+        self.max_size = max_size
+        self.drop_policy = drop_policy
+        self.aging_per_hour = aging_per_hour
+        self.counters: Dict[str, int] = dict.fromkeys(
+            ("queued", "popped", "filtered", "duplicate", "rejected", "evicted"), 0
+        )
+
+    def push(self, tangent: str, seed_query: str,
+             relevance: float, interest: float) -> bool:
+        if not _worth_queueing(relevance, interest):
+            self.counters["filtered"] += 1
+            return False
+        outcome = "queued"
+        try:
+            with get_db_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO banks_curiosity_queue
+                            (tangent, tangent_key, seed_query, relevance, interest, priority)
+                        VALUES (%s, %s, %s, %s, %s,
+                                %s - %s * EXTRACT(EPOCH FROM now()) / 3600.0)
+                        ON CONFLICT (tangent_key) DO NOTHING
+                        RETURNING id
+                        """,
+                        (tangent, _tangent_key(tangent), seed_query, relevance,
+                         interest, interest, self.aging_per_hour),
+                    )
+                    row = cur.fetchone()
+                    if row is None:
+                        outcome = "duplicate"
+                    elif self.drop_policy == "reject_new":
+                        cur.execute(
+                            "SELECT count(*) FROM banks_curiosity_queue "
+                            "WHERE claimed_at IS NULL"
+                        )
+                        if cur.fetchone()[0] > self.max_size:
+                            outcome = "rejected"
+                    else:
+                        # Past max_size, the policy's worst waiting rows go.
+                        cur.execute(
+                            f"""
+                            DELETE FROM banks_curiosity_queue
+                            WHERE id IN (
+                                SELECT id FROM banks_curiosity_queue
+                                WHERE claimed_at IS NULL
+                                ORDER BY {self._KEEP_ORDER[self.drop_policy]}
+                                OFFSET %s
+                            )
+                            RETURNING id
+                            """,
+                            (self.max_size,),
+                        )
+                        gone = [r[0] for r in cur.fetchall()]
+                        if row[0] in gone:
+                            outcome = "rejected"
+                        self.counters["evicted"] += len(gone) - (row[0] in gone)
+                    if outcome == "rejected" and self.drop_policy == "reject_new":
+                        conn.rollback()
+                    else:
+                        # Rows out of attempts go too.
+                        cur.execute(
+                            """
+                            DELETE FROM banks_curiosity_queue
+                            WHERE attempts >= %s
+                              AND claimed_at < now() - make_interval(secs => %s)
+                            """,
+                            (MAX_ATTEMPTS, CLAIM_LEASE_SECONDS),
+                        )
+                        conn.commit()
+        except Exception as e:
+            logger.error("Failed to queue curiosity: %s", e)
+            return False
+        self.counters[outcome] += 1
+        if outcome == "queued":
+            logger.info("Curiosity queued [interest=%.2f]: %s", interest, tangent[:80])
+        return outcome == "queued"
+
+    def pop(self) -> Optional[Dict]:
+        """Claim the best claimable tangent. Call done() when finished."""
+        sql = f"""
+            UPDATE banks_curiosity_queue
+            SET claimed_at = now(), attempts = attempts + 1
+            WHERE id = (
+                SELECT id FROM banks_curiosity_queue
+                WHERE {_CLAIMABLE}
+                ORDER BY priority DESC, id
+                FOR UPDATE SKIP LOCKED
+                LIMIT 1
+            )
+            RETURNING id, tangent, seed_query, relevance, interest,
+                      EXTRACT(EPOCH FROM queued_at)
+        """
+        try:
+            with get_db_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql, (CLAIM_LEASE_SECONDS, MAX_ATTEMPTS))
+                    row = cur.fetchone()
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to claim curiosity: %s", e)
+            return None
+        if row is None:
+            return None
+        self.counters["popped"] += 1
+        return {
+            "id": row[0],
+            "tangent": row[1],
+            "seed_query": row[2] or "",
+            "relevance": row[3],
+            "interest": row[4],
+            "queued_at": float(row[5]),
+        }
+
+    def done(self, item: Dict) -> None:
+        """Processed (kept or not): remove it for good."""
+        try:
+            with get_db_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("DELETE FROM banks_curiosity_queue WHERE id = %s",
+                                (item["id"],))
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to ack curiosity %s: %s", item.get("id"), e)
+
+    def peek_all(self) -> List[Dict]:
+        try:
+            with get_db_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"""
+                        SELECT tangent, seed_query, relevance, interest,
+                               EXTRACT(EPOCH FROM queued_at)
+                        FROM banks_curiosity_queue
+                        WHERE {_CLAIMABLE}
+                        ORDER BY priority DESC, id LIMIT %s
+                        """,
+                        (CLAIM_LEASE_SECONDS, MAX_ATTEMPTS, self.max_size),
+                    )
+                    rows = cur.fetchall()
+        except Exception as e:
+            logger.error("Failed to read curiosity queue: %s", e)
+            return []
+        return [
+            {"tangent": t, "seed_query": q or "", "relevance": r,
+             "interest": i, "queued_at": float(at)}
+            for t, q, r, i, at in rows
+        ]
+
+    @property
+    def size(self) -> int:
+        try:
+            with get_db_conn() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        f"SELECT count(*) FROM banks_curiosity_queue WHERE {_CLAIMABLE}",
+                        (CLAIM_LEASE_SECONDS, MAX_ATTEMPTS),
+                    )
+                    return cur.fetchone()[0]
+        except Exception as e:
+            logger.error("Failed to size curiosity queue: %s", e)
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "size": self.size,
+                "max_size": self.max_size, "drop_policy": self.drop_policy}
+
+
+def make_curiosity_queue(max_size: int = 50, drop_policy: str = "drop_lowest"):
+    """Postgres queue when DATABASE_URL is set, the in-process heap otherwise."""
+    if os.getenv("DATABASE_URL"):
+        return PostgresCuriosityQueue(max_size, drop_policy)
+    return CuriosityQueue(max_size, drop_policy)
+
+
+# ---------------------------------------------------------------------------
+# The Leader — one curious mind per deployment, not one per worker
+# ---------------------------------------------------------------------------
+
+# pg_advisory_lock key, shared by every worker of every deployment on the DB.
+CURIOSITY_LOCK_KEY = 0x52494C4945   # "RILIE"
+
+
+class CuriosityLeader:
+    """
+    Elects the single curiosity processor with a session-level Postgres
+    advisory lock, held on a connection of its own. When that worker
+    dies, its connection goes and the lock with it; the next worker to
+    ask takes over. Disabled (no DB) means every process leads its own
+    in-process queue, as before.
+    """
+    def __init__(self, enabled: bool, lock_key: int = CURIOSITY_LOCK_KEY):
+        self.enabled = enabled
+        self.lock_key = lock_key
+        self._conn = None
+
+    @property
+    def held(self) -> bool:
+        return not self.enabled or self._conn is not None
+
+    def is_leader(self) -> bool:
+        """Check (and if free, take) leadership. Cheap enough per cycle."""
+        if not self.enabled:
+            return True
+        if self._conn is not None:
+            try:
+                with self._conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                return True
+            except Exception as e:
+                logger.warning("Curiosity leader connection lost: %s", e)
+                self._drop()
+        try:
+            conn = get_db_conn()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s)", (self.lock_key,))
+                won = cur.fetchone()[0]
+        except Exception as e:
+            logger.debug("Curiosity leader election failed: %s", e)
+            return False
+        if not won:
+            conn.close()
+            return False
+        self._conn = conn
+        logger.info("Curiosity leader: this worker (pid %d)", os.getpid())
+        return True
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (self.lock_key,))
+        except Exception:
+            pass
+        self._drop()
+
+    def _drop(self) -> None:
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+
+# ---------------------------------------------------------------------------
+# The Budget — search quota as a token bucket
+# ---------------------------------------------------------------------------
+
+# One token per search call. Defaults sit well under Brave's free tier.
+CURIOSITY_SEARCH_PER_MINUTE = float(os.getenv("RILIE_CURIOSITY_SEARCH_PER_MIN", "30"))
+CURIOSITY_SEARCH_BURST = int(os.getenv("RILIE_CURIOSITY_SEARCH_BURST", "6"))
+CURIOSITY_MAX_WORKERS = int(os.getenv("RILIE_CURIOSITY_WORKERS", "4"))
+
+# Seconds between full rebuilds of the resurfacing index, to drop deleted
+# or unkept rows and catch rows whose ids committed out of order. 0 = off.
+CURIOSITY_INDEX_RELOAD = float(os.getenv("RILIE_CURIOSITY_INDEX_RELOAD_S", "3600"))
+
+
+class TokenBucket:
+    """Refills at `rate` tokens/second up to `burst`. Thread-safe."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def available(self) -> int:
+        with self._lock:
+            self._refill()
+            return int(self._tokens)
+
+    def take(self, n: int) -> int:
+        """Take up to n whole tokens; returns how many were taken."""
+        with self._lock:
+            self._refill()
+            got = max(0, min(n, int(self._tokens)))
+            self._tokens -= got
+            return got
+
+    def give_back(self, n: int) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + n)
+
+    def wait_time(self, n: int = 1) -> float:
+        """Seconds until n tokens (at most `burst`) are available."""
+        n = min(n, self.burst)
+        with self._lock:
+            self._refill()
+            if self._tokens >= n or self.rate <= 0:
+                return 0.0
+            return (n - self._tokens) / self.rate
+
+
+@dataclass
+class CuriosityMetrics:
+    """What the pool has been up to. Latencies are the last 200 items."""
+    cycles: int = 0
+    processed: int = 0
+    kept: int = 0
+    failed: int = 0
+    throttled_cycles: int = 0
+    backlog: int = 0
+    workers: int = 0
+    next_interval: float = 0.0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def summary(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies)
+
+        def pct(p: float) -> float:
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))] * 1000, 1) if lat else 0.0
+
+        return {
+            "cycles": self.cycles,
+            "processed": self.processed,
+            "kept": self.kept,
+            "failed": self.failed,
+            "throttled_cycles": self.throttled_cycles,
+            "backlog": self.backlog,
+            "workers": self.workers,
+            "next_interval_s": round(self.next_interval, 2),
+            "latency_p50_ms": pct(0.50),
+            "latency_p95_ms": pct(0.95),
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -98,6 +590,12 @@ class CuriosityEngine:
     Can run as:
       - Synchronous drain (process all queued items now)
       - Background thread (process on a timer / between conversations)
+
+    Each cycle sizes itself: one worker per max_per_cycle items of
+    backlog (up to max_workers), never more items than the search budget
+    has tokens. With backlog and budget left, the next cycle comes after
+    min_interval; short on budget, as soon as a token refills; idle,
+    after cycle_interval.
     """
     def __init__(
         self,
@@ -105,6 +603,13 @@ class CuriosityEngine:
         triangle_fn: Optional[Callable] = None,
         max_per_cycle: int = 3,
         cycle_interval: float = 60.0,
+        queue=None,
+        max_workers: int = CURIOSITY_MAX_WORKERS,
+        search_budget: Optional[TokenBucket] = None,
+        min_interval: float = 1.0,
+        store_fn: Callable = store_curiosity,
+        index: Optional[CuriosityIndex] = None,
+        index_reload: float = CURIOSITY_INDEX_RELOAD,
     ):
         """
         Args:
@@ -112,14 +617,39 @@ class CuriosityEngine:
                 Same signature as brave_search_sync.
             triangle_fn: callable(stimulus, context) -> dict with 'result' and 'quality_score'
                 A lightweight Triangle pass for curiosity processing.
-            max_per_cycle: max tangents to process per curiosity cycle.
-            cycle_interval: seconds between background cycles (if running threaded).
+            max_per_cycle: tangents per worker per cycle.
+            cycle_interval: seconds between background cycles when idle.
+            queue: CuriosityQueue-like; default per make_curiosity_queue().
+            max_workers: ceiling on concurrent tangents.
+            search_budget: TokenBucket for search calls; default from
+                RILIE_CURIOSITY_SEARCH_PER_MIN / RILIE_CURIOSITY_SEARCH_BURST.
+            min_interval: seconds between cycles while backlog remains.
+            store_fn: same signature as banks.store_curiosity.
+            index: CuriosityIndex that resurfacing reads; default loads
+                from banks_curiosity. While the background thread runs,
+                it also hears every kept store.
+            index_reload: seconds between full index rebuilds in the
+                background loop (0 = only ever page in new rows).
         """
-        self.queue = CuriosityQueue()
+        self.queue = queue if queue is not None else make_curiosity_queue()
+        self.leader = CuriosityLeader(
+            enabled=isinstance(self.queue, PostgresCuriosityQueue)
+        )
         self.search_fn = search_fn
         self.triangle_fn = triangle_fn
         self.max_per_cycle = max_per_cycle
         self.cycle_interval = cycle_interval
+        self.max_workers = max(1, max_workers)
+        self.min_interval = min_interval
+        self.search_budget = search_budget or TokenBucket(
+            CURIOSITY_SEARCH_PER_MINUTE / 60.0, CURIOSITY_SEARCH_BURST
+        )
+        self.store_fn = store_fn
+        self.index = index if index is not None else CuriosityIndex()
+        self.index_reload = index_reload
+        self._next_reload = 0.0
+        self.metrics = CuriosityMetrics()
+        self._metrics_lock = threading.Lock()
         self._running = False
         self._thread: Optional[threading.Thread] = None
 
@@ -176,7 +706,7 @@ class CuriosityEngine:
             return False
 
         # Step 3: Store in Banks
-        kept = store_curiosity(
+        kept = self.store_fn(
             seed_query=seed_query,
             tangent=tangent,
             research=research,
@@ -192,25 +722,85 @@ class CuriosityEngine:
 
         return kept
 
+    def plan(self, backlog: int) -> int:
+        """Workers for this cycle: enough for the backlog, within the pool."""
+        return max(1, min(self.max_workers, math.ceil(backlog / self.max_per_cycle)))
+
+    def _run_item(self, item: Dict) -> bool:
+        t0 = time.perf_counter()
+        try:
+            kept = self.process_one(item)
+        except Exception as e:
+            logger.warning("Curiosity item failed: %s", e)
+            with self._metrics_lock:
+                self.metrics.failed += 1
+            # No done(): a durable claim lapses and the item is retried.
+            return False
+        self.queue.done(item)
+        with self._metrics_lock:
+            self.metrics.latencies.append(time.perf_counter() - t0)
+        return kept
+
     def drain(self) -> Dict[str, int]:
         """
-        Synchronous: process up to max_per_cycle tangents right now.
-        Returns stats: {"processed": N, "kept": M}
+        Synchronous: one cycle. Claims as many tangents as the backlog
+        calls for and the search budget allows, and processes them on
+        up to max_workers threads.
+        Returns stats: {"processed": N, "kept": M, "workers": W}
         """
-        processed = 0
-        kept = 0
-        while processed < self.max_per_cycle:
+        backlog = self.queue.size
+        workers = self.plan(backlog)
+        want = min(backlog, workers * self.max_per_cycle)
+        granted = self.search_budget.take(want) if self.search_fn else want
+
+        items: List[Dict] = []
+        while len(items) < granted:
             item = self.queue.pop()
             if item is None:
                 break
-            processed += 1
-            if self.process_one(item):
-                kept += 1
+            items.append(item)
+        if granted > len(items) and self.search_fn:
+            # Queue ran dry under us; unused tokens go back.
+            self.search_budget.give_back(granted - len(items))
+
+        kept = 0
+        if len(items) == 1:
+            kept = int(self._run_item(items[0]))
+        elif items:
+            with ThreadPoolExecutor(max_workers=min(workers, len(items)),
+                                    thread_name_prefix="rilie-curiosity") as pool:
+                kept = sum(pool.map(self._run_item, items))
 
-        if processed > 0:
-            logger.info("Curiosity drain: processed=%d, kept=%d", processed, kept)
+        with self._metrics_lock:
+            m = self.metrics
+            m.cycles += 1
+            m.processed += len(items)
+            m.kept += kept
+            m.workers = min(workers, len(items))
+            m.backlog = max(0, backlog - len(items))
+            if want and granted < want:
+                m.throttled_cycles += 1
 
-        return {"processed": processed, "kept": kept}
+        if items:
+            logger.info("Curiosity drain: processed=%d, kept=%d, workers=%d, backlog=%d",
+                        len(items), kept, self.metrics.workers, self.metrics.backlog)
+
+        return {"processed": len(items), "kept": kept, "workers": self.metrics.workers}
+
+    def next_interval(self) -> float:
+        """Seconds until the next cycle, from the backlog and the budget."""
+        backlog = self.metrics.backlog
+        if backlog <= 0:
+            interval = self.cycle_interval
+        elif self.search_fn:
+            # Wait for enough tokens to keep every planned worker busy,
+            # not for the first one: one-item cycles serialize the pool.
+            need = min(backlog, self.plan(backlog))
+            interval = max(self.min_interval, self.search_budget.wait_time(need))
+        else:
+            interval = self.min_interval
+        self.metrics.next_interval = interval
+        return interval
 
     # -----------------------------------------------------------------------
     # NEW: Resurface curiosities
@@ -233,11 +823,13 @@ class CuriosityEngine:
             List of relevant past curiosities with their context
         """
         try:
-            # Search Banks for past tangents related to current topic
-            results = search_curiosity(
-                query=current_stimulus,
+            # In-process index: no database on the request path. It fills
+            # from the background loop, so until the first refresh this
+            # simply finds nothing.
+            results = self.index.search(
+                current_stimulus,
                 limit=limit,
-                min_quality=0.6
+                min_score=RESURFACE_MIN_SCORE,
             )
             
             resurfaced = []
@@ -246,8 +838,9 @@ class CuriosityEngine:
                     'tangent': result.get('tangent', ''),
                     'original_context': result.get('seed_query', ''),
                     'insight': result.get('insight', ''),
-                    'timestamp': result.get('timestamp'),
+                    'timestamp': result.get('created_at'),
                     'quality_score': result.get('quality_score', 0.0),
+                    'similarity': result.get('score', 0.0),
                 })
                 
             if resurfaced:
@@ -268,6 +861,8 @@ class CuriosityEngine:
         if self._running:
             return
         self._running = True
+        add_curiosity_listener(self.index.add)
+        self._next_reload = time.monotonic() + self.index_reload
         self._thread = threading.Thread(
             target=self._background_loop,
             daemon=True,
@@ -279,25 +874,42 @@ class CuriosityEngine:
     def stop_background(self):
         """Stop the background curiosity thread."""
         self._running = False
+        remove_curiosity_listener(self.index.add)
         if self._thread:
             self._thread.join(timeout=5)
             self._thread = None
+        self.leader.release()
         logger.info("Curiosity background thread stopped.")
 
     def _background_loop(self):
         """The loop that runs in the background thread."""
         while self._running:
+            interval = self.cycle_interval
+            try:
+                # Every worker keeps its resurfacing index current with
+                # what the leader (in whichever process) has stored. Now
+                # and then it rebuilds instead: refresh() only pages in
+                # ids above the highest seen, so it never drops deleted
+                # rows or picks up ones that committed out of order.
+                if self.index_reload > 0 and time.monotonic() >= self._next_reload:
+                    self._next_reload = time.monotonic() + self.index_reload
+                    self.index.reload()
+                else:
+                    self.index.refresh()
+            except Exception as e:
+                logger.warning("Curiosity index refresh failed: %s", e)
             try:
-                if self.queue.size > 0:
+                # Every worker runs this loop; only the leader drains.
+                if self.leader.is_leader():
                     self.drain()
+                    interval = self.next_interval()
             except Exception as e:
                 logger.error("Curiosity background error: %s", e)
 
             # Sleep in small chunks so we can stop quickly
-            for _ in range(int(self.cycle_interval)):
-                if not self._running:
-                    break
-                time.sleep(1)
+            deadline = time.monotonic() + interval
+            while self._running and time.monotonic() < deadline:
+                time.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
 
     # -----------------------------------------------------------------------
     # Status
@@ -313,8 +925,132 @@ class CuriosityEngine:
                 for i in self.queue.peek_all()
             ],
             "background_running": self._running,
+            "queue_backend": type(self.queue).__name__,
+            "queue_stats": self.queue.stats(),
+            "leader": self.leader.held,
+            "search_tokens": self.search_budget.available(),
+            "pool": self.metrics.summary(),
+            "index": self.index.stats(),
             "db_total": db_stats.get("total", 0),
             "db_kept": db_stats.get("kept", 0),
             "db_avg_quality": round(db_stats.get("avg_quality", 0.0), 3),
             "db_last_curiosity": str(db_stats.get("last_curiosity", "")),
         }
+
+
+# ---------------------------------------------------------------------------
+# BENCHMARK — python curiosity.py   (fake search, no network, no DB)
+# ---------------------------------------------------------------------------
+
+def _bench_pool(items: int = 60, search_latency: float = 0.2,
+                per_minute: float = 240.0, burst: int = 8) -> None:
+    import random
+
+    rng = random.Random(42)
+    in_flight = [0, 0]          # current, peak
+    lock = threading.Lock()
+
+    def fake_search(query: str, n: int) -> List[Dict[str, str]]:
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(search_latency * rng.uniform(0.5, 1.5))
+        with lock:
+            in_flight[0] -= 1
+        return [{"title": query, "snippet": "..."}]
+
+    def fake_store(**row) -> bool:
+        return row["quality_score"] >= 0.6
+
+    engine = CuriosityEngine(
+        search_fn=fake_search,
+        queue=CuriosityQueue(max_size=items),
+        search_budget=TokenBucket(per_minute / 60.0, burst),
+        min_interval=0.05,
+        store_fn=fake_store,
+    )
+    for i in range(items):
+        engine.queue_tangent(f"tangent number {i}", "seed", 0.1, rng.uniform(0.7, 1.0))
+
+    t0 = time.perf_counter()
+    while True:
+        engine.drain()
+        if not engine.queue.size:
+            break
+        time.sleep(engine.next_interval())
+    elapsed = time.perf_counter() - t0
+
+    legacy = math.ceil(items / 3) * 60.0
+    print(f"{items} tangents, search ~{search_latency * 1000:.0f} ms, "
+          f"budget {per_minute:.0f}/min burst {burst}")
+    print(f"  legacy (3 serial per 60 s cycle): ~{legacy:.0f} s")
+    print(f"  pool: {elapsed:.1f} s, peak concurrent searches {in_flight[1]}, "
+          f"{items / elapsed * 60:.0f}/min")
+    print(f"  metrics: {engine.metrics.summary()}")
+
+
+def _bench_queue(sizes=(50, 1_000, 10_000, 100_000)) -> None:
+    """Push/pop cost of the old scanning deque vs the heap, by queue size."""
+    import random
+
+    class ScanDeque:
+        # The pre-heap CuriosityQueue, minus the filter and logging.
+        def __init__(self, n):
+            self._q = deque(maxlen=n)
+
+        def push(self, tangent, seed_query, relevance, interest):
+            for existing in self._q:
+                if _tangent_key(existing["tangent"]) == _tangent_key(tangent):
+                    return False
+            self._q.append({"tangent": tangent, "interest": interest})
+            return True
+
+        def pop(self):
+            return self._q.popleft() if self._q else None
+
+    logging.getLogger("curiosity").setLevel(logging.WARNING)
+    rng = random.Random(43)
+    print(f"{'size':>8} {'scan push us':>13} {'heap push us':>13} "
+          f"{'heap pop us':>12} {'top-decile first':>17}")
+    for n in sizes:
+        tangents = [(f"tangent {i} about {rng.random()}", rng.uniform(0.7, 1.0))
+                    for i in range(n)]
+        # Fresh tangents: the scan has to look at every item to say so.
+        probes = [(f"fresh {i}", 0.8) for i in range(200)]
+
+        scan = ScanDeque(n + len(probes))
+        scan._q.extend({"tangent": t, "interest": i} for t, i in tangents)
+        heap = CuriosityQueue(max_size=n + len(probes))
+        for t, interest in tangents:
+            heap.push(t, "seed", 0.1, interest)
+        timings = []
+        for queue in (scan, heap):
+            t0 = time.perf_counter()
+            for t, interest in probes:
+                queue.push(t, "seed", 0.1, interest)
+            timings.append((time.perf_counter() - t0) / len(probes) * 1e6)
+
+        t0 = time.perf_counter()
+        popped = [heap.pop()["interest"] for _ in range(n)]
+        pop_us = (time.perf_counter() - t0) / n * 1e6
+        cutoff = sorted((i for _, i in tangents), reverse=True)[max(0, n // 10 - 1)]
+        first = popped[: max(1, n // 10)]
+        share = sum(1 for i in first if i >= cutoff) / len(first)
+        print(f"{n:>8} {timings[0]:>13.1f} {timings[1]:>13.2f} {pop_us:>12.2f} "
+              f"{share * 100:>16.0f}%")
+
+    q = CuriosityQueue(max_size=100, drop_policy="drop_lowest")
+    for i in range(1_000):
+        q.push(f"t{i}", "seed", rng.uniform(0.0, 0.6), rng.uniform(0.5, 1.0))
+        q.push(f"t{i % 50}", "seed", 0.1, 0.9)
+    print("drop_lowest counters after 2000 pushes into 100 slots:", q.stats())
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.WARNING)
+    if sys.argv[1:] == ["queue"]:
+        _bench_queue()
+    else:
+        _bench_pool()
@@ -0,0 +1,391 @@
+"""
+curiosity_index.py — WHAT WAS I CURIOUS ABOUT AGAIN?
+=====================================================
+
+Resurfacing a past discovery used to be a Postgres full-text query on
+the request path, every time Guvna went looking. This file keeps the
+kept discoveries in process, as a sparse TF-IDF index, so the question
+"have I wondered about this before?" never leaves the worker.
+
+    index = CuriosityIndex()
+    index.refresh()                         # pages in rows it hasn't seen
+    index.search("why does swing feel late", limit=3)
+
+Storage is an inverted index. Every term owns two packed arrays: the
+rows it appears in and its log term frequency there. A query scores
+only the postings of its own words, as one NumPy scatter-add per word,
+then divides by the stored document norms. That is cosine similarity
+under the current IDF weights.
+
+IDF moves as rows arrive. Postings hold raw term frequency and IDF is
+applied at query time, so they never need rewriting. Only the document
+norms go stale. They are recomputed in memory whenever the corpus has
+grown by NORM_DRIFT since the last time.
+
+Freshness comes from two sides:
+  - banks.store_curiosity tells its listeners about every kept row, so
+    the worker that stored it can find it at once;
+  - refresh() pages in rows with id above the highest one loaded, which
+    picks up what other workers stored.
+reload() rebuilds from scratch off the request path; CuriosityEngine's
+background loop calls it every RILIE_CURIOSITY_INDEX_RELOAD_S. search()
+never touches the database.
+
+Run this file directly for the benchmark.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from rilie_tokens import NOISE_WORDS, TokenizedText, tokenize
+
+logger = logging.getLogger("curiosity_index")
+
+# Renormalize every document once the corpus is this much bigger than
+# it was at the last renormalization.
+NORM_DRIFT = 0.25
+
+# Words in more than this share of rows are "common". When a query also
+# has rarer words, common ones only score the best RESCORE_POOL rows the
+# rarer ones matched. Their IDF is low, so they seldom change the top k,
+# and theirs are the long postings.
+COMMON_DF = 0.1
+
+# Up to this many rows every word scores every row it appears in.
+EXACT_ROWS = 5000
+
+# How many of the rows the rare words found get the common words added.
+RESCORE_POOL = 256
+
+# Below this cosine a past curiosity isn't about the same thing.
+RESURFACE_MIN_SCORE = 0.1
+
+# Rows per page when loading from Banks.
+LOAD_PAGE = 5000
+
+
+def _terms(tokens: TokenizedText) -> Counter:
+    return Counter(w for w in tokens.words if w not in NOISE_WORDS)
+
+
+def _doc_text(row: Dict[str, Any]) -> str:
+    # Same fields the old full-text index covered.
+    return " ".join(
+        row.get(f) or "" for f in ("tangent", "insight", "seed_query")
+    )
+
+
+def _default_loader(after_id: int, limit: int) -> List[Dict[str, Any]]:
+    from banks import load_kept_curiosities
+    return load_kept_curiosities(after_id=after_id, limit=limit)
+
+
+class _Corpus:
+    """Everything one index generation holds. Swapped whole on reload()."""
+
+    def __init__(self) -> None:
+        self.rows: List[Dict[str, Any]] = []
+        self.row_of: Dict[int, int] = {}          # banks id -> row number
+        self.vocab: Dict[str, int] = {}
+        self.df = array("i")
+        self.post_rows: List[array] = []          # term -> array("i") of rows
+        self.post_tf: List[array] = []            # term -> array("f") of 1 + ln(tf)
+        self.doc_terms: List[array] = []          # row -> array("i") of terms
+        self.doc_tf: List[array] = []             # row -> array("f"), same order
+        self.norms = array("f")
+        self.quality = array("f")
+        self.normed_at = 0
+
+    def idf(self, df: int) -> float:
+        return math.log((1 + len(self.rows)) / (1 + df)) + 1.0
+
+    def norm(self, row: int) -> float:
+        df, idf = self.df, self.idf
+        total = 0.0
+        for t, tf in zip(self.doc_terms[row], self.doc_tf[row]):
+            w = tf * idf(df[t])
+            total += w * w
+        return math.sqrt(total) or 1.0
+
+    def add(self, row_data: Dict[str, Any], settle: bool = True) -> bool:
+        """Index one row. settle=False leaves renormalizing to the caller."""
+        row_id = row_data.get("id")
+        if row_id is not None and row_id in self.row_of:
+            return False
+        counts = _terms(TokenizedText(_doc_text(row_data)))
+        if not counts:
+            return False
+
+        row = len(self.rows)
+        terms = array("i")
+        tfs = array("f")
+        for word, c in counts.items():
+            t = self.vocab.get(word)
+            if t is None:
+                t = len(self.vocab)
+                self.vocab[word] = t
+                self.df.append(0)
+                self.post_rows.append(array("i"))
+                self.post_tf.append(array("f"))
+            tf = 1.0 + math.log(c)
+            self.df[t] += 1
+            self.post_rows[t].append(row)
+            self.post_tf[t].append(tf)
+            terms.append(t)
+            tfs.append(tf)
+
+        self.rows.append({
+            k: row_data.get(k) for k in
+            ("id", "origin", "seed_query", "tangent", "insight",
+             "quality_score", "created_at")
+        })
+        if row_id is not None:
+            self.row_of[row_id] = row
+        self.doc_terms.append(terms)
+        self.doc_tf.append(tfs)
+        self.quality.append(float(row_data.get("quality_score") or 0.0))
+        self.norms.append(self.norm(row))
+
+        if settle and len(self.rows) > self.normed_at * (1 + NORM_DRIFT):
+            self.renormalize()
+        return True
+
+    def renormalize(self) -> None:
+        for row in range(len(self.rows)):
+            self.norms[row] = self.norm(row)
+        self.normed_at = len(self.rows)
+
+    def search(self, text: str, limit: int, min_score: float) -> List[Dict[str, Any]]:
+        n = len(self.rows)
+        counts = _terms(tokenize(text))
+        if not n or not counts or limit <= 0:
+            return []
+
+        rare: List[Tuple[int, float]] = []
+        common: List[Tuple[int, float]] = []
+        cutoff = n * COMMON_DF if n > EXACT_ROWS else n
+        qnorm = 0.0
+        for word, c in counts.items():
+            t = self.vocab.get(word)
+            idf = self.idf(0 if t is None else self.df[t])
+            qw = (1.0 + math.log(c)) * idf
+            qnorm += qw * qw
+            if t is not None:
+                (common if self.df[t] > cutoff else rare).append((t, qw * idf))
+        if not rare and not common:
+            return []
+
+        scores = np.zeros(n, dtype=np.float32)
+        # A term lists each row once, so fancy-index += is exact here.
+        for t, weight in (rare or common):
+            rows = np.frombuffer(self.post_rows[t], dtype=np.int32)
+            scores[rows] += np.frombuffer(self.post_tf[t], dtype=np.float32) * weight
+        candidates = (scores != 0).nonzero()[0].astype(np.int32)
+        norms = np.frombuffer(self.norms, dtype=np.float32)
+        if rare and common:
+            # Common words only add to the rows the rare words ranked
+            # best. Postings are in row order, so that is a sorted lookup.
+            if len(candidates) > RESCORE_POOL:
+                partial = scores[candidates] / norms[candidates]
+                candidates = np.sort(candidates[
+                    np.argpartition(-partial, RESCORE_POOL - 1)[:RESCORE_POOL]])
+            for t, weight in common:
+                rows = np.frombuffer(self.post_rows[t], dtype=np.int32)
+                at = np.searchsorted(rows, candidates)
+                inside = at < len(rows)
+                at, found = at[inside], candidates[inside]
+                match = rows[at] == found
+                scores[found[match]] += (
+                    np.frombuffer(self.post_tf[t], dtype=np.float32)[at[match]] * weight)
+
+        sims = scores[candidates] / norms[candidates] / math.sqrt(qnorm)
+        keep = sims >= max(min_score, 1e-6)
+        candidates, sims = candidates[keep], sims[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-sims, limit - 1)[:limit]
+            candidates, sims = candidates[top], sims[top]
+        score = dict(zip(candidates.tolist(), sims.tolist()))
+        ranked = sorted(
+            candidates.tolist(),
+            key=lambda r: (-score[r], -self.quality[r], -r),
+        )
+        return [dict(self.rows[r], score=round(score[r], 4)) for r in ranked]
+
+
+class CuriosityIndex:
+    """
+    Thread-safe TF-IDF index over kept curiosity insights.
+
+    `loader(after_id, limit)` returns kept rows with id > after_id in id
+    order (banks.load_kept_curiosities by default). Rows are dicts with
+    the banks_curiosity columns search_curiosity used to return.
+    """
+
+    def __init__(self, loader: Optional[Callable[..., List[Dict[str, Any]]]] = None,
+                 page: int = LOAD_PAGE):
+        self.loader = loader or _default_loader
+        self.page = page
+        self._corpus = _Corpus()
+        self._loaded_upto = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._corpus.rows)
+
+    def add(self, row: Dict[str, Any]) -> bool:
+        """Index one kept row. Rows already indexed (same id) are skipped."""
+        with self._lock:
+            return self._corpus.add(row)
+
+    def refresh(self) -> int:
+        """Page in kept rows above the highest id loaded. Returns rows added."""
+        with self._refresh_lock:
+            added = 0
+            while True:
+                rows = self.loader(after_id=self._loaded_upto, limit=self.page)
+                with self._lock:
+                    for row in rows:
+                        added += self._corpus.add(row, settle=False)
+                        self._loaded_upto = max(self._loaded_upto, row["id"])
+                if len(rows) < self.page:
+                    break
+            with self._lock:
+                corpus = self._corpus
+                if len(corpus.rows) > corpus.normed_at * (1 + NORM_DRIFT):
+                    corpus.renormalize()
+            self._loaded = True
+        if added:
+            logger.info("Curiosity index: +%d rows (%d total)", added, len(self))
+        return added
+
+    def reload(self) -> int:
+        """Rebuild from scratch and swap in. Picks up deleted or unkept rows."""
+        fresh = CuriosityIndex(self.loader, self.page)
+        fresh.refresh()
+        with self._refresh_lock, self._lock:
+            # Anything a listener added during the rebuild is loaded again
+            # by the next refresh(), since ids only grow.
+            self._corpus = fresh._corpus
+            self._loaded_upto = fresh._loaded_upto
+            self._loaded = True
+        return len(self)
+
+    def search(self, text: str, limit: int = 3,
+               min_score: float = RESURFACE_MIN_SCORE) -> List[Dict[str, Any]]:
+        """
+        Top `limit` rows by cosine similarity to `text`, best first, each
+        with a `score`. Ties go to higher quality, then newer rows.
+        """
+        with self._lock:
+            return self._corpus.search(text, limit, min_score)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c = self._corpus
+            postings = sum(len(p) for p in c.post_rows)
+            return {
+                "rows": len(c.rows),
+                "terms": len(c.vocab),
+                "postings": postings,
+                "loaded": self._loaded,
+                "loaded_upto": self._loaded_upto,
+                # Postings and per-row term lists: 4 + 4 bytes each, twice.
+                "array_bytes": postings * 16 + len(c.rows) * 8,
+            }
+
+
+# ============================================================================
+# BENCHMARK — python curiosity_index.py
+# ============================================================================
+
+def _bench(sizes=(1_000, 10_000, 50_000), queries: int = 2_000) -> None:
+    import random
+    import time
+
+    rng = random.Random(44)
+    # Zipf-ish vocabulary: a few words everywhere, most words rare.
+    vocab = [f"w{i}" for i in range(20_000)]
+    weights = [1.0 / (i + 1) for i in range(len(vocab))]
+
+    def text(n: int) -> str:
+        return " ".join(rng.choices(vocab, weights=weights, k=n))
+
+    def legacy_scan(docs, query: str, limit: int):
+        """Stand-in for scoring every row per request: dict cosine scan."""
+        q = _terms(tokenize(query))
+        out = []
+        for i, d in enumerate(docs):
+            dot = sum(c * d.get(w, 0) for w, c in q.items())
+            if dot:
+                out.append((dot, i))
+        return sorted(out, reverse=True)[:limit]
+
+    print(f"{'rows':>7} {'build s':>8} {'terms':>7} {'p50 us':>8} {'p99 us':>8} "
+          f"{'scan p50 us':>12} {'add us':>7} {'top3 agree':>11}")
+    for n in sizes:
+        rows = [
+            {"id": i + 1, "tangent": text(8), "insight": text(60),
+             "seed_query": text(6), "quality_score": rng.uniform(0.6, 1.0)}
+            for i in range(n)
+        ]
+        probes = [text(rng.randint(3, 12)) for _ in range(queries)]
+
+        index = CuriosityIndex(loader=lambda after_id, limit: [
+            r for r in rows if r["id"] > after_id][:limit])
+        t0 = time.perf_counter()
+        index.refresh()
+        build = time.perf_counter() - t0
+
+        times = []
+        for q in probes:
+            t0 = time.perf_counter()
+            index.search(q, limit=3)
+            times.append(time.perf_counter() - t0)
+        times.sort()
+
+        docs = [_terms(TokenizedText(_doc_text(r))) for r in rows]
+        # Top-3 agreement with scoring every word's postings in full.
+        global COMMON_DF
+        common_df, agree = COMMON_DF, 0
+        for q in probes[:200]:
+            fast = [r["id"] for r in index.search(q, limit=3)]
+            COMMON_DF = 1.0
+            exact = [r["id"] for r in index.search(q, limit=3)]
+            COMMON_DF = common_df
+            agree += len(set(fast) & set(exact)) / len(exact) if exact else not fast
+
+        scan = []
+        for q in probes[:50]:
+            t0 = time.perf_counter()
+            legacy_scan(docs, q, 3)
+            scan.append(time.perf_counter() - t0)
+        scan.sort()
+
+        extra = [{"id": n + 1 + i, "tangent": text(8), "insight": text(60),
+                  "seed_query": text(6), "quality_score": 0.7} for i in range(200)]
+        t0 = time.perf_counter()
+        for r in extra:
+            index.add(r)
+        add = (time.perf_counter() - t0) / len(extra)
+
+        print(f"{n:>7} {build:>8.2f} {index.stats()['terms']:>7} "
+              f"{times[len(times) // 2] * 1e6:>8.0f} {times[int(len(times) * 0.99)] * 1e6:>8.0f} "
+              f"{scan[len(scan) // 2] * 1e6:>12.0f} {add * 1e6:>7.0f} {agree / 200:>11.3f}")
+
+
+if __name__ == "__main__":
+    _bench()
@@ -355,6 +355,32 @@ def wilden_swift_modulate(
     return text
 
 
+# Substring signals behind the 18 modes. rilie_wilden's batch scorer
+# reads the same tables, so the two can never disagree.
+WILDEN_SWIFT_MODES: Tuple[str, ...] = (
+    "literal", "analogous", "metaphorical", "simile", "alliteration",
+    "wit", "clever", "wordplay", "pun", "absurd", "paradoxical", "fun",
+    "funny", "original", "allegory", "story", "poetic", "soulful",
+)
+WILDEN_SWIFT_SIGNALS: Dict[str, Tuple[str, ...]] = {
+    "figurative": ("like a", "as if", "metaphor", "imagine"),
+    "analogous": ("is like", "similar to", "same way", "just as", "reminds me of", "works like"),
+    "metaphorical": ("is a ", "are a ", "the heart of", "the engine of", "the soul of"),
+    "simile": (" like a ", " like the "),
+    "turn": ("but", "except", "however", "actually", "turns out"),
+    "explaining": ("because", "the reason", "this means", "in other words"),
+    "absurd": ("imagine if", "what if", "picture this", "somehow"),
+    "paradoxical": ("and yet", "but also", "both", "neither", "the opposite"),
+    "fun": ("!", "play", "game", "try", "let's", "wild"),
+    "funny": ("joke", "punchline", "laugh", "haha", "imagine"),
+    "template_starts": ("the thing about", "what it comes down to", "the way i"),
+    "story": ("once", "there was", "imagine", "picture", "a man", "a woman"),
+    "arc": ("then", "after", "before", "finally", "first"),
+    "poetic": ("\u2013", "..."),
+    "soulful": ("feel", "heart", "soul", "deep", "real", "human", "alive", "breath"),
+}
+
+
 def wilden_swift_score(
     text: str,
     wit: Optional[WitState] = None,
@@ -367,6 +393,7 @@ def wilden_swift_score(
 
     Scores the response AFTER gates pass.
     Returns the score dict — Talk attaches it to the plate.
+    For a whole tray of candidates at once, see rilie_wilden.score_batch.
     """
     if not text or not text.strip():
         return {"modes_lit": 0, "total_score": 0.0, "top_modes": [], "scores": {}}
@@ -375,21 +402,20 @@ def wilden_swift_score(
     words = tl.split()
     word_count = len(words)
     scores = {}
+    sig = WILDEN_SWIFT_SIGNALS
 
     # 1. LITERAL
-    has_figurative = any(w in tl for w in ["like a", "as if", "metaphor", "imagine"])
+    has_figurative = any(w in tl for w in sig["figurative"])
     scores["literal"] = 0.8 if not has_figurative and word_count < 30 else 0.2
 
     # 2. ANALOGOUS
-    analogy_signals = ["is like", "similar to", "same way", "just as", "reminds me of", "works like"]
-    scores["analogous"] = 0.9 if any(s in tl for s in analogy_signals) else 0.1
+    scores["analogous"] = 0.9 if any(s in tl for s in sig["analogous"]) else 0.1
 
     # 3. METAPHORICAL
-    metaphor_signals = ["is a ", "are a ", "the heart of", "the engine of", "the soul of"]
-    scores["metaphorical"] = 0.9 if any(s in tl for s in metaphor_signals) else 0.1
+    scores["metaphorical"] = 0.9 if any(s in tl for s in sig["metaphorical"]) else 0.1
 
     # 4. SIMILE
-    scores["simile"] = 0.9 if " like a " in tl or " like the " in tl else 0.1
+    scores["simile"] = 0.9 if any(s in tl for s in sig["simile"]) else 0.1
 
     # 5. ALLITERATION
     alliteration_score = 0.0
@@ -401,12 +427,12 @@ def wilden_swift_score(
     scores["alliteration"] = alliteration_score or 0.1
 
     # 6. WIT
-    has_turn = any(w in tl for w in ["but", "except", "however", "actually", "turns out"])
+    has_turn = any(w in tl for w in sig["turn"])
     scores["wit"] = 0.8 if has_turn and word_count < 25 else 0.2
 
     # 7. CLEVER
     scores["clever"] = 0.7 if word_count < 20 and not any(
-        w in tl for w in ["because", "the reason", "this means", "in other words"]
+        w in tl for w in sig["explaining"]
     ) else 0.2
 
     # 8. WORDPLAY
@@ -417,42 +443,35 @@ def wilden_swift_score(
     scores["pun"] = 0.1  # Hard to detect – default low, Roux can boost
 
     # 10. ABSURD
-    absurd_signals = ["imagine if", "what if", "picture this", "somehow"]
-    scores["absurd"] = 0.7 if any(s in tl for s in absurd_signals) else 0.1
+    scores["absurd"] = 0.7 if any(s in tl for s in sig["absurd"]) else 0.1
 
     # 11. PARADOXICAL
-    paradox_signals = ["and yet", "but also", "both", "neither", "the opposite"]
-    scores["paradoxical"] = 0.8 if any(s in tl for s in paradox_signals) else 0.1
+    scores["paradoxical"] = 0.8 if any(s in tl for s in sig["paradoxical"]) else 0.1
 
     # 12. FUN
-    fun_signals = ["!", "play", "game", "try", "let's", "wild"]
-    fun_hits = sum(1 for s in fun_signals if s in tl)
+    fun_hits = sum(1 for s in sig["fun"] if s in tl)
     scores["fun"] = min(1.0, fun_hits * 0.25)
 
     # 13. FUNNY
-    funny_signals = ["joke", "punchline", "laugh", "haha", "imagine"]
-    scores["funny"] = 0.7 if any(s in tl for s in funny_signals) else 0.1
+    scores["funny"] = 0.7 if any(s in tl for s in sig["funny"]) else 0.1
 
     # 14. ORIGINAL
-    template_starts = ["the thing about", "what it comes down to", "the way i"]
-    is_template = any(tl.startswith(t) for t in template_starts)
+    is_template = any(tl.startswith(t) for t in sig["template_starts"])
     scores["original"] = 0.8 if unique_ratio > 0.8 and not is_template else 0.2
 
     # 15. ALLEGORY
-    story_signals = ["once", "there was", "imagine", "picture", "a man", "a woman"]
-    scores["allegory"] = 0.7 if any(s in tl for s in story_signals) else 0.1
+    scores["allegory"] = 0.7 if any(s in tl for s in sig["story"]) else 0.1
 
     # 16. STORY
-    has_arc = any(w in tl for w in ["then", "after", "before", "finally", "first"])
+    has_arc = any(w in tl for w in sig["arc"])
     scores["story"] = 0.7 if has_arc and word_count > 15 else 0.1
 
     # 17. POETIC
-    has_rhythm = tl.count(",") >= 2 or "\u2013" in text or "..." in text
+    has_rhythm = tl.count(",") >= 2 or any(s in tl for s in sig["poetic"])
     scores["poetic"] = 0.7 if has_rhythm and word_count < 30 else 0.2
 
     # 18. SOULFUL
-    soul_signals = ["feel", "heart", "soul", "deep", "real", "human", "alive", "breath"]
-    soul_hits = sum(1 for s in soul_signals if s in tl)
+    soul_hits = sum(1 for s in sig["soulful"] if s in tl)
     scores["soulful"] = min(1.0, soul_hits * 0.3)
 
     # Composite
@@ -89,12 +89,13 @@ AXIOMS:
 
 """
 
-import re
 import math
 import logging
 from dataclasses import dataclass
 from typing import Optional, Tuple, List, Dict, Any
 
+from rilie_tokens import tokenize
+
 logger = logging.getLogger("meaning")
 
 
@@ -523,8 +524,8 @@ def read_meaning(stimulus: str) -> MeaningFingerprint:
 
     raw = stimulus.strip()
 
-    # Tokenize (simple whitespace + punctuation split)
-    tokens = re.findall(r"[\w']+|[?!.,;:]", raw)
+    # Tokenize (simple whitespace + punctuation split) — shared cutting board
+    tokens = list(tokenize(raw).lexemes)
 
     # ① PULSE
     pulse = _compute_pulse(tokens, raw)
@@ -23,17 +23,44 @@ diamonds she pulled from the dishpit.
 
 Assumes Postgres via DATABASE_URL (ElephantSQL in production).
 Falls back to in-memory dicts when no DB is available (local dev).
+
+On Postgres every query borrows from one small connection pool, and
+every store goes through PhotogenicWriter: a background thread that
+writes whatever has piled up in one transaction per batch. Grind
+counting is a single INSERT ... ON CONFLICT DO UPDATE on the pattern.
+Keyword search runs on stored, GIN-indexed tsvector columns, and
+search_all asks all three tables in one query.
+
+In memory, each store has an inverted index (_MemoryIndex) that gives
+the same answers the old filter-and-sort gave.
 """
 
 import os
 import logging
+import atexit
+import bisect
 import datetime
+import heapq
 import json
+import re
+import threading
+import time
+from array import array
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 
 logger = logging.getLogger("photogenic_db")
 
+# Postgres connections shared by reads and the writer thread.
+PHOTOGENIC_POOL_MAX = int(os.getenv("RILIE_PHOTOGENIC_POOL_MAX", "4"))
+# Most rows the writer puts in one transaction.
+PHOTOGENIC_BATCH_SIZE = int(os.getenv("RILIE_PHOTOGENIC_BATCH", "200"))
+# How long the writer lets rows pile up before writing them anyway.
+PHOTOGENIC_FLUSH_SECONDS = float(os.getenv("RILIE_PHOTOGENIC_FLUSH_MS", "50")) / 1000.0
+# Stores block once this many rows are waiting (backpressure, not loss).
+PHOTOGENIC_MAX_PENDING = int(os.getenv("RILIE_PHOTOGENIC_MAX_PENDING", "10000"))
+
 
 # ============================================================================
 # DATA CLASSES — what gets stored
@@ -114,6 +141,371 @@ def classify_compass(tag: str) -> str:
         return "beauty"
 
 
+# ============================================================================
+# IN-MEMORY INDEX — same answers as a filter-and-sort, without the scan
+# ============================================================================
+
+_WORD_RE = re.compile(r"\w+")
+
+# A candidate list bigger than this share of the store isn't worth
+# collecting: walking rows best-first and stopping at `limit` is cheaper.
+WALK_FRACTION = 1 / 16
+
+
+def _trigrams(token: str):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class _MemoryIndex:
+    """
+    One in-memory store, indexed.
+
+    Keyword search keeps its substring meaning (`kw in field.lower()`).
+    Rows are split into word tokens with an inverted index over them, and
+    the vocabulary has a trigram index of its own. If the keyword's
+    longest word piece occurs in a row, it occurs inside one of that
+    row's tokens. So the rows to check are the postings of the tokens
+    that contain the piece, and each is then verified against the real
+    fields. Exact-match fields (compass, domain) have plain postings.
+
+    `order` keeps every row sorted best-first (score desc, then insertion
+    order, as the old stable sort did). Unselective queries walk it and
+    stop after `limit` hits.
+    """
+
+    def __init__(self, text_fields: Tuple[str, ...], exact_fields: Tuple[str, ...],
+                 score_field: str):
+        self.text_fields = text_fields
+        self.exact_fields = exact_fields
+        self.score_field = score_field
+        self.load([])
+
+    def load(self, entries: List[Any]) -> None:
+        """Index `entries` (kept, not copied: add() appends to it)."""
+        self.entries = entries
+        self.scores = array("d", (float(getattr(e, self.score_field)) for e in entries))
+        self.exact: Dict[str, Dict[Any, array]] = {f: {} for f in self.exact_fields}
+        self.postings: Dict[str, array] = {}
+        self._grams: Dict[str, set] = {}
+        for row, entry in enumerate(entries):
+            self._index_row(row, entry)
+        self.order: List[int] = sorted(range(len(entries)), key=self._key)
+
+    def _key(self, row: int) -> Tuple[float, int]:
+        return (-self.scores[row], row)
+
+    def add(self, entry) -> int:
+        row = len(self.entries)
+        self.entries.append(entry)
+        self.scores.append(float(getattr(entry, self.score_field)))
+        self._index_row(row, entry)
+        bisect.insort(self.order, row, key=self._key)
+        return row
+
+    def rescore(self, row: int) -> None:
+        """Re-rank a row whose score field changed in place."""
+        at = bisect.bisect_left(self.order, self._key(row), key=self._key)
+        del self.order[at]
+        self.scores[row] = float(getattr(self.entries[row], self.score_field))
+        bisect.insort(self.order, row, key=self._key)
+
+    def _index_row(self, row: int, entry) -> None:
+        for f in self.exact_fields:
+            self.exact[f].setdefault(getattr(entry, f), array("i")).append(row)
+        tokens = set()
+        for f in self.text_fields:
+            tokens.update(_WORD_RE.findall((getattr(entry, f) or "").lower()))
+        for tok in tokens:
+            post = self.postings.get(tok)
+            if post is None:
+                post = self.postings[tok] = array("i")
+                for g in _trigrams(tok):
+                    self._grams.setdefault(g, set()).add(tok)
+            post.append(row)
+
+    def _tokens_containing(self, piece: str) -> List[str]:
+        if len(piece) < 3:
+            return [t for t in self.postings if piece in t]
+        grams = sorted((self._grams.get(g, ()) for g in _trigrams(piece)), key=len)
+        if not grams[0]:
+            return []
+        return [t for t in set(grams[0]).intersection(*grams[1:]) if piece in t]
+
+    def query(self, keyword: Optional[str] = None, min_score: float = 0.0,
+              limit: int = 5, **exact) -> List[Any]:
+        if limit <= 0:
+            return []
+        exact = {f: v for f, v in exact.items() if v}
+        kw = keyword.lower() if keyword else ""
+
+        sources: List[List[array]] = []
+        for f, v in exact.items():
+            post = self.exact[f].get(v)
+            if post is None:
+                return []
+            sources.append([post])
+        pieces = _WORD_RE.findall(kw)
+        if pieces:
+            tokens = self._tokens_containing(max(pieces, key=len))
+            if not tokens:
+                return []
+            sources.append([self.postings[t] for t in tokens])
+
+        entries, scores, text_fields = self.entries, self.scores, self.text_fields
+
+        def ok(row: int) -> bool:
+            if scores[row] < min_score:
+                return False
+            entry = entries[row]
+            for f, v in exact.items():
+                if getattr(entry, f) != v:
+                    return False
+            return not kw or any(kw in (getattr(entry, f) or "").lower()
+                                 for f in text_fields)
+
+        sizes = [sum(map(len, src)) for src in sources]
+        if sources and min(sizes) <= len(entries) * WALK_FRACTION:
+            rows = set()
+            for post in sources[sizes.index(min(sizes))]:
+                rows.update(post)
+            best = heapq.nsmallest(limit, filter(ok, rows), key=self._key)
+        else:
+            best = []
+            for row in self.order:
+                if scores[row] < min_score:
+                    break
+                if ok(row):
+                    best.append(row)
+                    if len(best) == limit:
+                        break
+        return [entries[r] for r in best]
+
+
+# ============================================================================
+# POOL + BATCHED WRITER — Postgres only
+# ============================================================================
+
+class _BlockingPool:
+    """
+    ThreadedConnectionPool that waits for a free connection instead of
+    raising PoolError when all of them are out.
+    """
+
+    def __init__(self, db_url: str, maxconn: int):
+        import psycopg2.pool
+        self._pool = psycopg2.pool.ThreadedConnectionPool(1, maxconn, db_url)
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    @contextmanager
+    def connection(self):
+        """One pooled connection; commit on success, rollback on error."""
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._pool.getconn()
+            yield conn
+            conn.commit()
+        except Exception:
+            if conn is not None and not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            if conn is not None:
+                self._pool.putconn(conn, close=bool(conn.closed))
+            self._slots.release()
+
+    def close(self) -> None:
+        self._pool.closeall()
+
+
+_TIMESTAMP_COLUMNS = {"created_at", "last_seen"}
+
+
+def _values_template(columns: Tuple[str, ...]) -> str:
+    # Timestamps arrive as ISO strings, '' or datetimes; '' means now().
+    return "(" + ", ".join(
+        "COALESCE(NULLIF(%s::text, '')::timestamptz, now())"
+        if c in _TIMESTAMP_COLUMNS else "%s"
+        for c in columns
+    ) + ")"
+
+
+class _Store:
+    """How rows of one dataclass get written to one table."""
+
+    def __init__(self, table: str, entry_type: type, on_conflict: str = ""):
+        self.table = table
+        self.entry_type = entry_type
+        self.columns = tuple(f.name for f in fields(entry_type))
+        self.template = _values_template(self.columns)
+        self.sql = (f"INSERT INTO {table} ({', '.join(self.columns)}) VALUES %s"
+                    + (f" {on_conflict}" if on_conflict else ""))
+        # Rows with equal keys can't share one ON CONFLICT statement.
+        self.key = (lambda row: row[0].lower()) if on_conflict else None
+
+    def values(self, entry) -> Tuple:
+        return tuple(getattr(entry, c) for c in self.columns)
+
+
+class PhotogenicWriter:
+    """
+    Background batch writer for the three stores.
+
+    submit() queues a row and returns at once. The writer thread wakes
+    when PHOTOGENIC_BATCH_SIZE rows are waiting or PHOTOGENIC_FLUSH_SECONDS
+    after the first one, and writes up to a batch in one transaction:
+    one multi-row INSERT per table. If the batch fails, its rows are
+    retried one by one so a single bad row loses only itself.
+    """
+
+    def __init__(self, pool: _BlockingPool, stores: Dict[str, _Store],
+                 batch_size: int = PHOTOGENIC_BATCH_SIZE,
+                 flush_seconds: float = PHOTOGENIC_FLUSH_SECONDS,
+                 max_pending: int = PHOTOGENIC_MAX_PENDING):
+        self.pool = pool
+        self.stores = stores
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.max_pending = max(self.batch_size, max_pending)
+        self._pending: List[Tuple[str, Tuple]] = []
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._cond = threading.Condition()
+        self._running = True
+        self.stats = {"batches": 0, "rows": 0, "failed": 0, "retried_batches": 0}
+        self._thread = threading.Thread(target=self._loop, daemon=True,
+                                        name="photogenic-writer")
+        self._thread.start()
+
+    def submit(self, kind: str, entry) -> bool:
+        values = self.stores[kind].values(entry)
+        with self._cond:
+            while self._running and len(self._pending) >= self.max_pending:
+                self._cond.wait()
+            if not self._running:
+                return False
+            self._pending.append((kind, values))
+            if len(self._pending) >= self.batch_size or len(self._pending) == 1:
+                self._cond.notify_all()
+        return True
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + self._in_flight
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything submitted so far is written."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flush_waiters += 1
+            try:
+                while self._pending or self._in_flight:
+                    self._cond.notify_all()
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        return False
+                    self._cond.wait(left)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._pending:
+                    return                      # closed and drained
+                # Let a batch fill, unless someone is waiting on flush().
+                deadline = time.monotonic() + self.flush_seconds
+                while (self._running and not self._flush_waiters
+                       and len(self._pending) < self.batch_size
+                       and time.monotonic() < deadline):
+                    self._cond.wait(deadline - time.monotonic())
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                self._in_flight = len(batch)
+                self._cond.notify_all()         # room for blocked submitters
+            try:
+                self._write(batch)
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def _statements(self, batch: List[Tuple[str, Tuple]]):
+        """(store, rows) per statement. Repeated keys go to later rounds."""
+        by_kind: Dict[str, List[Tuple]] = {}
+        for kind, values in batch:
+            by_kind.setdefault(kind, []).append(values)
+        for kind, rows in by_kind.items():
+            store = self.stores[kind]
+            if store.key is None:
+                yield store, rows
+                continue
+            rounds: List[List[Tuple]] = []
+            seen: Dict[str, int] = {}
+            for values in rows:
+                k = store.key(values)
+                n = seen.get(k, 0)
+                seen[k] = n + 1
+                if n == len(rounds):
+                    rounds.append([])
+                rounds[n].append(values)
+            for round_rows in rounds:
+                yield store, round_rows
+
+    def _write(self, batch: List[Tuple[str, Tuple]]) -> None:
+        import psycopg2.extras
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cur:
+                    for store, rows in self._statements(batch):
+                        psycopg2.extras.execute_values(
+                            cur, store.sql, rows, template=store.template,
+                            page_size=self.batch_size)
+            self.stats["batches"] += 1
+            self.stats["rows"] += len(batch)
+            return
+        except Exception as e:
+            logger.error("Photogenic batch of %d failed, retrying singly: %s",
+                         len(batch), e)
+        self.stats["retried_batches"] += 1
+        for kind, values in batch:
+            store = self.stores[kind]
+            try:
+                with self.pool.connection() as conn:
+                    with conn.cursor() as cur:
+                        psycopg2.extras.execute_values(
+                            cur, store.sql, [values], template=store.template)
+                self.stats["rows"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error("PG insert error (%s): %s", store.table, e)
+
+
+# Grind counting: one statement, no read-then-write race.
+_GRIND_UPSERT = """ON CONFLICT ((lower(pattern))) DO UPDATE SET
+        frequency  = photogenic_grind.frequency + 1,
+        confidence = LEAST(1.0, photogenic_grind.confidence + 0.02),
+        last_seen  = now()"""
+
+_SCORE_COLUMN = {"conversations": "resonance", "wonder": "resonance", "grind": "confidence"}
+
+_STORES = {
+    "conversations": _Store("photogenic_conversations", ConversationMoment),
+    "wonder": _Store("photogenic_wonder", WonderEntry),
+    "grind": _Store("photogenic_grind", GrindEntry, on_conflict=_GRIND_UPSERT),
+}
+
+
 # ============================================================================
 # DATABASE LAYER — Postgres when available, in-memory fallback
 # ============================================================================
@@ -142,6 +534,19 @@ class PhotogenicDB:
         self._wonder: List[WonderEntry] = []
         self._grind: List[GrindEntry] = []
 
+        # In-memory indexes over those lists
+        self._conversation_index = _MemoryIndex(
+            ("user_words", "context"), ("compass", "domain"), "resonance")
+        self._wonder_index = _MemoryIndex(
+            ("query", "finding", "opinion"), ("domain",), "resonance")
+        self._grind_index = _MemoryIndex(
+            ("pattern", "insight", "shorthand"), ("domain",), "confidence")
+        self._grind_rows: Dict[str, int] = {}    # lower(pattern) -> row
+
+        # Postgres: pooled connections, batched writes
+        self._pool: Optional[_BlockingPool] = None
+        self._writer: Optional[PhotogenicWriter] = None
+
         if self.use_postgres:
             self._ensure_tables()
         else:
@@ -155,92 +560,132 @@ class PhotogenicDB:
     def _ensure_tables(self):
         """Create the three tables if they don't exist."""
         try:
-            import psycopg2
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
-
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS photogenic_conversations (
-                    id              SERIAL PRIMARY KEY,
-                    user_words      TEXT NOT NULL,
-                    tag             TEXT NOT NULL,
-                    resonance       FLOAT NOT NULL,
-                    domain          TEXT DEFAULT '',
-                    user_name       TEXT DEFAULT '',
-                    context         TEXT DEFAULT '',
-                    compass         TEXT NOT NULL,
-                    turn            INTEGER DEFAULT 0,
-                    conversation_id TEXT DEFAULT '',
-                    created_at      TIMESTAMPTZ DEFAULT now()
-                );
-                CREATE INDEX IF NOT EXISTS idx_pc_compass
-                    ON photogenic_conversations (compass);
-                CREATE INDEX IF NOT EXISTS idx_pc_domain
-                    ON photogenic_conversations (domain);
-                CREATE INDEX IF NOT EXISTS idx_pc_resonance
-                    ON photogenic_conversations (resonance DESC);
-                CREATE INDEX IF NOT EXISTS idx_pc_fts
-                    ON photogenic_conversations
-                    USING gin(to_tsvector('english',
-                        coalesce(user_words,'') || ' ' ||
-                        coalesce(context,'')));
-            """)
-
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS photogenic_wonder (
-                    id              SERIAL PRIMARY KEY,
-                    query           TEXT NOT NULL,
-                    source          TEXT DEFAULT '',
-                    finding         TEXT NOT NULL,
-                    opinion         TEXT NOT NULL,
-                    domain          TEXT DEFAULT '',
-                    resonance       FLOAT DEFAULT 0.0,
-                    tags            TEXT DEFAULT '',
-                    created_at      TIMESTAMPTZ DEFAULT now()
-                );
-                CREATE INDEX IF NOT EXISTS idx_pw_domain
-                    ON photogenic_wonder (domain);
-                CREATE INDEX IF NOT EXISTS idx_pw_fts
-                    ON photogenic_wonder
-                    USING gin(to_tsvector('english',
-                        coalesce(query,'') || ' ' ||
-                        coalesce(finding,'') || ' ' ||
-                        coalesce(opinion,'')));
-            """)
-
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS photogenic_grind (
-                    id              SERIAL PRIMARY KEY,
-                    pattern         TEXT NOT NULL,
-                    frequency       INTEGER DEFAULT 1,
-                    insight         TEXT NOT NULL,
-                    domain          TEXT DEFAULT '',
-                    shorthand       TEXT NOT NULL,
-                    confidence      FLOAT DEFAULT 0.1,
-                    last_seen       TIMESTAMPTZ DEFAULT now(),
-                    created_at      TIMESTAMPTZ DEFAULT now()
-                );
-                CREATE INDEX IF NOT EXISTS idx_pg_domain
-                    ON photogenic_grind (domain);
-                CREATE INDEX IF NOT EXISTS idx_pg_confidence
-                    ON photogenic_grind (confidence DESC);
-                CREATE INDEX IF NOT EXISTS idx_pg_fts
-                    ON photogenic_grind
-                    USING gin(to_tsvector('english',
-                        coalesce(pattern,'') || ' ' ||
-                        coalesce(insight,'') || ' ' ||
-                        coalesce(shorthand,'')));
-            """)
-
-            conn.commit()
-            cur.close()
-            conn.close()
+            self._pool = _BlockingPool(self.db_url, PHOTOGENIC_POOL_MAX)
+            with self._pool.connection() as conn:
+                self._create_tables(conn.cursor())
+            self._writer = PhotogenicWriter(self._pool, _STORES)
+            atexit.register(self.close)
             logger.info("Photogenic tables ensured in Postgres.")
         except Exception as e:
             logger.warning("Could not create Postgres tables: %s — falling back to in-memory", e)
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
             self.use_postgres = False
             self._seed_dummy_data()
 
+    def _create_tables(self, cur):
+        """The three tables, their indexes, and the grind pattern key."""
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS photogenic_conversations (
+                id              SERIAL PRIMARY KEY,
+                user_words      TEXT NOT NULL,
+                tag             TEXT NOT NULL,
+                resonance       FLOAT NOT NULL,
+                domain          TEXT DEFAULT '',
+                user_name       TEXT DEFAULT '',
+                context         TEXT DEFAULT '',
+                compass         TEXT NOT NULL,
+                turn            INTEGER DEFAULT 0,
+                conversation_id TEXT DEFAULT '',
+                created_at      TIMESTAMPTZ DEFAULT now()
+            );
+            CREATE INDEX IF NOT EXISTS idx_pc_compass
+                ON photogenic_conversations (compass);
+            CREATE INDEX IF NOT EXISTS idx_pc_domain
+                ON photogenic_conversations (domain);
+            CREATE INDEX IF NOT EXISTS idx_pc_resonance
+                ON photogenic_conversations (resonance DESC);
+            ALTER TABLE photogenic_conversations
+                ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                GENERATED ALWAYS AS (to_tsvector('english',
+                    coalesce(user_words,'') || ' ' ||
+                    coalesce(context,''))) STORED;
+            CREATE INDEX IF NOT EXISTS idx_pc_tsv
+                ON photogenic_conversations USING gin(search_tsv);
+            DROP INDEX IF EXISTS idx_pc_fts;
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS photogenic_wonder (
+                id              SERIAL PRIMARY KEY,
+                query           TEXT NOT NULL,
+                source          TEXT DEFAULT '',
+                finding         TEXT NOT NULL,
+                opinion         TEXT NOT NULL,
+                domain          TEXT DEFAULT '',
+                resonance       FLOAT DEFAULT 0.0,
+                tags            TEXT DEFAULT '',
+                created_at      TIMESTAMPTZ DEFAULT now()
+            );
+            CREATE INDEX IF NOT EXISTS idx_pw_domain
+                ON photogenic_wonder (domain);
+            CREATE INDEX IF NOT EXISTS idx_pw_resonance
+                ON photogenic_wonder (resonance DESC);
+            ALTER TABLE photogenic_wonder
+                ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                GENERATED ALWAYS AS (to_tsvector('english',
+                    coalesce(query,'') || ' ' ||
+                    coalesce(finding,'') || ' ' ||
+                    coalesce(opinion,''))) STORED;
+            CREATE INDEX IF NOT EXISTS idx_pw_tsv
+                ON photogenic_wonder USING gin(search_tsv);
+            DROP INDEX IF EXISTS idx_pw_fts;
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS photogenic_grind (
+                id              SERIAL PRIMARY KEY,
+                pattern         TEXT NOT NULL,
+                frequency       INTEGER DEFAULT 1,
+                insight         TEXT NOT NULL,
+                domain          TEXT DEFAULT '',
+                shorthand       TEXT NOT NULL,
+                confidence      FLOAT DEFAULT 0.1,
+                last_seen       TIMESTAMPTZ DEFAULT now(),
+                created_at      TIMESTAMPTZ DEFAULT now()
+            );
+            CREATE INDEX IF NOT EXISTS idx_pg_domain
+                ON photogenic_grind (domain);
+            CREATE INDEX IF NOT EXISTS idx_pg_confidence
+                ON photogenic_grind (confidence DESC);
+            ALTER TABLE photogenic_grind
+                ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                GENERATED ALWAYS AS (to_tsvector('english',
+                    coalesce(pattern,'') || ' ' ||
+                    coalesce(insight,'') || ' ' ||
+                    coalesce(shorthand,''))) STORED;
+            CREATE INDEX IF NOT EXISTS idx_pg_tsv
+                ON photogenic_grind USING gin(search_tsv);
+            DROP INDEX IF EXISTS idx_pg_fts;
+        """)
+
+        # Rows an old read-then-write race duplicated are merged into
+        # the oldest before the pattern key can be made unique.
+        cur.execute("""
+            WITH dupes AS (
+                SELECT lower(pattern) AS k, min(id) AS keep,
+                       sum(frequency) AS frequency,
+                       LEAST(1.0, max(confidence)) AS confidence,
+                       max(last_seen) AS last_seen
+                FROM photogenic_grind
+                GROUP BY lower(pattern)
+                HAVING count(*) > 1
+            ), merged AS (
+                UPDATE photogenic_grind g
+                SET frequency = d.frequency,
+                    confidence = d.confidence,
+                    last_seen = d.last_seen
+                FROM dupes d
+                WHERE g.id = d.keep
+            )
+            DELETE FROM photogenic_grind g
+            USING dupes d
+            WHERE lower(g.pattern) = d.k AND g.id <> d.keep;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_pg_pattern_key
+                ON photogenic_grind ((lower(pattern)));
+        """)
+
     # -----------------------------------------------------------------
     # DUMMY DATA — seeds for testing before ElephantSQL is plugged in
     # -----------------------------------------------------------------
@@ -437,11 +882,22 @@ class PhotogenicDB:
             ),
         ]
 
+        self._reindex()
+
         logger.info(
             "PhotogenicDB seeded: %d conversations, %d wonder, %d grind",
             len(self._conversations), len(self._wonder), len(self._grind),
         )
 
+    def _reindex(self):
+        """Rebuild the in-memory indexes over the three lists."""
+        self._conversation_index.load(self._conversations)
+        self._wonder_index.load(self._wonder)
+        self._grind_index.load(self._grind)
+        self._grind_rows = {}
+        for row, g in enumerate(self._grind):
+            self._grind_rows.setdefault(g.pattern.lower(), row)
+
     # -----------------------------------------------------------------
     # STORE — write to the three databases
     # -----------------------------------------------------------------
@@ -453,9 +909,9 @@ class PhotogenicDB:
         moment.compass = classify_compass(moment.tag)
 
         if self.use_postgres:
-            return self._pg_insert("photogenic_conversations", moment.to_dict())
+            return self._writer.submit("conversations", moment)
         else:
-            self._conversations.append(moment)
+            self._conversation_index.add(moment)
             return True
 
     def store_wonder(self, entry: WonderEntry) -> bool:
@@ -464,9 +920,9 @@ class PhotogenicDB:
             entry.created_at = datetime.datetime.now().isoformat()
 
         if self.use_postgres:
-            return self._pg_insert("photogenic_wonder", entry.to_dict())
+            return self._writer.submit("wonder", entry)
         else:
-            self._wonder.append(entry)
+            self._wonder_index.add(entry)
             return True
 
     def store_grind(self, entry: GrindEntry) -> bool:
@@ -475,20 +931,21 @@ class PhotogenicDB:
             entry.created_at = datetime.datetime.now().isoformat()
 
         if self.use_postgres:
-            # Check if pattern already exists — if so, increment frequency
-            existing = self._pg_search_grind(pattern_match=entry.pattern)
-            if existing:
-                return self._pg_increment_grind(existing[0], entry)
-            return self._pg_insert("photogenic_grind", entry.to_dict())
+            # Upsert on lower(pattern): a pattern already seen gets its
+            # frequency and confidence bumped in the same statement.
+            return self._writer.submit("grind", entry)
         else:
             # In-memory: check for existing pattern
-            for g in self._grind:
-                if g.pattern.lower() == entry.pattern.lower():
-                    g.frequency += 1
-                    g.confidence = min(1.0, g.confidence + 0.02)
-                    g.last_seen = entry.last_seen or datetime.datetime.now().isoformat()
-                    return True
-            self._grind.append(entry)
+            key = entry.pattern.lower()
+            row = self._grind_rows.get(key)
+            if row is not None:
+                g = self._grind[row]
+                g.frequency += 1
+                g.confidence = min(1.0, g.confidence + 0.02)
+                g.last_seen = entry.last_seen or datetime.datetime.now().isoformat()
+                self._grind_index.rescore(row)
+                return True
+            self._grind_rows[key] = self._grind_index.add(entry)
             return True
 
     # -----------------------------------------------------------------
@@ -510,21 +967,8 @@ class PhotogenicDB:
         if self.use_postgres:
             return self._pg_query_conversations(compass, domain, keyword, min_resonance, limit)
 
-        # In-memory search
-        results = self._conversations[:]
-        if compass:
-            results = [m for m in results if m.compass == compass]
-        if domain:
-            results = [m for m in results if m.domain == domain]
-        if keyword:
-            kw = keyword.lower()
-            results = [m for m in results
-                       if kw in m.user_words.lower() or kw in m.context.lower()]
-        if min_resonance > 0:
-            results = [m for m in results if m.resonance >= min_resonance]
-
-        results.sort(key=lambda m: m.resonance, reverse=True)
-        return results[:limit]
+        return self._conversation_index.query(
+            keyword, min_resonance, limit, compass=compass, domain=domain)
 
     def get_wonder(
         self,
@@ -536,18 +980,7 @@ class PhotogenicDB:
         if self.use_postgres:
             return self._pg_query_wonder(domain, keyword, limit)
 
-        results = self._wonder[:]
-        if domain:
-            results = [w for w in results if w.domain == domain]
-        if keyword:
-            kw = keyword.lower()
-            results = [w for w in results
-                       if kw in w.query.lower()
-                       or kw in w.finding.lower()
-                       or kw in w.opinion.lower()]
-
-        results.sort(key=lambda w: w.resonance, reverse=True)
-        return results[:limit]
+        return self._wonder_index.query(keyword, 0.0, limit, domain=domain)
 
     def get_grind(
         self,
@@ -560,20 +993,7 @@ class PhotogenicDB:
         if self.use_postgres:
             return self._pg_query_grind(domain, keyword, min_confidence, limit)
 
-        results = self._grind[:]
-        if domain:
-            results = [g for g in results if g.domain == domain]
-        if keyword:
-            kw = keyword.lower()
-            results = [g for g in results
-                       if kw in g.pattern.lower()
-                       or kw in g.insight.lower()
-                       or kw in g.shorthand.lower()]
-        if min_confidence > 0:
-            results = [g for g in results if g.confidence >= min_confidence]
-
-        results.sort(key=lambda g: g.confidence, reverse=True)
-        return results[:limit]
+        return self._grind_index.query(keyword, min_confidence, limit, domain=domain)
 
     # -----------------------------------------------------------------
     # INTEGRATED SEARCH — search all three at once
@@ -589,7 +1009,10 @@ class PhotogenicDB:
         Search all three databases for a keyword.
         Returns the best from each.
         This is what RILIE calls when she needs to THINK.
+        On Postgres that is one query, not three.
         """
+        if self.use_postgres:
+            return self._pg_search_all(keyword, domain, limit)
         return {
             "conversations": self.get_conversations(
                 keyword=keyword, domain=domain, limit=limit
@@ -609,7 +1032,9 @@ class PhotogenicDB:
     def get_stats(self) -> Dict[str, Any]:
         """Database statistics."""
         if self.use_postgres:
-            return self._pg_stats()
+            stats = self._pg_stats()
+            stats["writer"] = dict(self._writer.stats, pending=self._writer.pending)
+            return stats
 
         return {
             "conversations": len(self._conversations),
@@ -636,190 +1061,422 @@ class PhotogenicDB:
     # POSTGRES HELPERS (stubbed — ready for ElephantSQL)
     # -----------------------------------------------------------------
 
-    def _pg_insert(self, table: str, data: Dict) -> bool:
-        """Generic Postgres insert."""
-        try:
-            import psycopg2
-            # Remove 'created_at' if empty — let Postgres default handle it
-            if not data.get("created_at"):
-                data.pop("created_at", None)
-
-            cols = ", ".join(data.keys())
-            placeholders = ", ".join(["%s"] * len(data))
-            sql = f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
-
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
-            cur.execute(sql, list(data.values()))
-            conn.commit()
-            cur.close()
-            conn.close()
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every store so far is in Postgres. No-op in memory."""
+        if self._writer is None:
             return True
+        return self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """Write what's pending and give the connections back."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def _pg_select(self, sql: str, params) -> List[Dict]:
+        """Read through the pool, after any pending writes land."""
+        import psycopg2.extras
+        if self._writer is not None and self._writer.pending:
+            self._writer.flush()
+        with self._pool.connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                cur.execute(sql, params)
+                return cur.fetchall()
+
+    def _pg_where(self, kind: str, keyword, min_score,
+                  exact: Dict[str, Any]) -> Tuple[str, List]:
+        """WHERE clause + params for one store. Keyword hits search_tsv (GIN)."""
+        conditions = []
+        params: List[Any] = []
+        for column, value in exact.items():
+            if value:
+                conditions.append(f"{column} = %s")
+                params.append(value)
+        if keyword:
+            # A literal tsquery, so the planner can see how rare it is.
+            conditions.append("search_tsv @@ plainto_tsquery('english', %s)")
+            params.append(keyword)
+        if min_score > 0:
+            conditions.append(f"{_SCORE_COLUMN[kind]} >= %s")
+            params.append(min_score)
+        return (" AND ".join(conditions) if conditions else "TRUE"), params
+
+    def _pg_query(self, kind: str, keyword, min_score, limit, **exact) -> List[Any]:
+        """Best-first rows of one store, as its dataclass."""
+        store = _STORES[kind]
+        where, params = self._pg_where(kind, keyword, min_score, exact)
+        sql = (f"SELECT {', '.join(store.columns)} FROM {store.table} WHERE {where} "
+               f"ORDER BY {_SCORE_COLUMN[kind]} DESC, id LIMIT %s")
+        try:
+            rows = self._pg_select(sql, params + [limit])
+            return [store.entry_type(**r) for r in rows]
         except Exception as e:
-            logger.error("PG insert error (%s): %s", table, e)
-            return False
+            logger.error("PG %s query error: %s", kind, e)
+            return []
 
     def _pg_query_conversations(self, compass, domain, keyword, min_resonance, limit):
         """Postgres conversation search."""
-        try:
-            import psycopg2
-            conditions = []
-            params = []
-
-            if compass:
-                conditions.append("compass = %s")
-                params.append(compass)
-            if domain:
-                conditions.append("domain = %s")
-                params.append(domain)
-            if keyword:
-                conditions.append(
-                    "to_tsvector('english', coalesce(user_words,'') || ' ' || coalesce(context,'')) "
-                    "@@ plainto_tsquery('english', %s)"
-                )
-                params.append(keyword)
-            if min_resonance > 0:
-                conditions.append("resonance >= %s")
-                params.append(min_resonance)
-
-            where = " AND ".join(conditions) if conditions else "TRUE"
-            sql = f"SELECT * FROM photogenic_conversations WHERE {where} ORDER BY resonance DESC LIMIT %s"
-            params.append(limit)
-
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-            cur.close()
-            conn.close()
-
-            return [ConversationMoment(**{k: v for k, v in r.items() if k != 'id'}) for r in rows]
-        except Exception as e:
-            logger.error("PG conversation query error: %s", e)
-            return []
+        return self._pg_query("conversations", keyword, min_resonance, limit,
+                              compass=compass, domain=domain)
 
     def _pg_query_wonder(self, domain, keyword, limit):
         """Postgres wonder search."""
-        try:
-            import psycopg2
-            conditions = []
-            params = []
-
-            if domain:
-                conditions.append("domain = %s")
-                params.append(domain)
-            if keyword:
-                conditions.append(
-                    "to_tsvector('english', coalesce(query,'') || ' ' || "
-                    "coalesce(finding,'') || ' ' || coalesce(opinion,'')) "
-                    "@@ plainto_tsquery('english', %s)"
-                )
-                params.append(keyword)
-
-            where = " AND ".join(conditions) if conditions else "TRUE"
-            sql = f"SELECT * FROM photogenic_wonder WHERE {where} ORDER BY resonance DESC LIMIT %s"
-            params.append(limit)
-
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-            cur.close()
-            conn.close()
-
-            return [WonderEntry(**{k: v for k, v in r.items() if k != 'id'}) for r in rows]
-        except Exception as e:
-            logger.error("PG wonder query error: %s", e)
-            return []
+        return self._pg_query("wonder", keyword, 0.0, limit, domain=domain)
 
     def _pg_query_grind(self, domain, keyword, min_confidence, limit):
         """Postgres grind search."""
-        try:
-            import psycopg2
-            conditions = []
-            params = []
-
-            if domain:
-                conditions.append("domain = %s")
-                params.append(domain)
-            if keyword:
-                conditions.append(
-                    "to_tsvector('english', coalesce(pattern,'') || ' ' || "
-                    "coalesce(insight,'') || ' ' || coalesce(shorthand,'')) "
-                    "@@ plainto_tsquery('english', %s)"
-                )
-                params.append(keyword)
-            if min_confidence > 0:
-                conditions.append("confidence >= %s")
-                params.append(min_confidence)
-
-            where = " AND ".join(conditions) if conditions else "TRUE"
-            sql = f"SELECT * FROM photogenic_grind WHERE {where} ORDER BY confidence DESC LIMIT %s"
-            params.append(limit)
-
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-            cur.close()
-            conn.close()
-
-            return [GrindEntry(**{k: v for k, v in r.items() if k != 'id'}) for r in rows]
-        except Exception as e:
-            logger.error("PG grind query error: %s", e)
-            return []
-
-    def _pg_search_grind(self, pattern_match: str) -> List[Dict]:
-        """Find existing grind entry by pattern."""
-        try:
-            import psycopg2
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            cur.execute(
-                "SELECT * FROM photogenic_grind WHERE lower(pattern) = lower(%s) LIMIT 1",
-                (pattern_match,),
+        return self._pg_query("grind", keyword, min_confidence, limit, domain=domain)
+
+    def _pg_search_all(self, keyword: str, domain: Optional[str], limit: int) -> Dict[str, List[Any]]:
+        """All three stores in one round trip: a UNION ALL of per-store top-k."""
+        branches = []
+        params: List[Any] = []
+        for kind in ("conversations", "wonder", "grind"):
+            store = _STORES[kind]
+            where, branch_params = self._pg_where(kind, keyword, 0.0, {"domain": domain})
+            branches.append(
+                f"(SELECT %s AS store, to_jsonb(t) - 'id' - 'search_tsv' AS row "
+                f"FROM {store.table} t WHERE {where} "
+                f"ORDER BY {_SCORE_COLUMN[kind]} DESC, id LIMIT %s)"
             )
-            rows = cur.fetchall()
-            cur.close()
-            conn.close()
-            return rows
-        except Exception:
-            return []
-
-    def _pg_increment_grind(self, existing: Dict, new_entry: GrindEntry) -> bool:
-        """Increment frequency and confidence on existing grind entry."""
+            params += [kind] + branch_params + [limit]
+        sql = " UNION ALL ".join(branches)
+        results: Dict[str, List[Any]] = {"conversations": [], "wonder": [], "grind": []}
         try:
-            import psycopg2
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
-            cur.execute(
-                "UPDATE photogenic_grind SET frequency = frequency + 1, "
-                "confidence = LEAST(1.0, confidence + 0.02), "
-                "last_seen = now() WHERE id = %s",
-                (existing["id"],),
-            )
-            conn.commit()
-            cur.close()
-            conn.close()
-            return True
+            for r in self._pg_select(sql, params):
+                results[r["store"]].append(_STORES[r["store"]].entry_type(**r["row"]))
         except Exception as e:
-            logger.error("PG grind increment error: %s", e)
-            return False
+            logger.error("PG search_all error: %s", e)
+        return results
 
     def _pg_stats(self) -> Dict[str, Any]:
         """Get stats from Postgres."""
         try:
-            import psycopg2
-            conn = psycopg2.connect(self.db_url)
-            cur = conn.cursor()
+            self.flush()
             counts = {}
-            for table in ["photogenic_conversations", "photogenic_wonder", "photogenic_grind"]:
-                cur.execute(f"SELECT COUNT(*) FROM {table}")
-                counts[table.replace("photogenic_", "")] = cur.fetchone()[0]
-            cur.close()
-            conn.close()
+            with self._pool.connection() as conn:
+                with conn.cursor() as cur:
+                    for table in ["photogenic_conversations", "photogenic_wonder", "photogenic_grind"]:
+                        cur.execute(f"SELECT COUNT(*) FROM {table}")
+                        counts[table.replace("photogenic_", "")] = cur.fetchone()[0]
             counts["total"] = sum(counts.values())
             counts["backend"] = "postgres"
             return counts
         except Exception as e:
             return {"error": str(e), "backend": "postgres_error"}
+
+
+# ============================================================================
+# BENCHMARK — DATABASE_URL=... python photogenic_db.py
+# ============================================================================
+
+def _legacy_store(db_url: str, kind: str, entry) -> bool:
+    """The old write path: a connection per insert, grind read-then-write."""
+    import psycopg2
+    store = _STORES[kind]
+    conn = psycopg2.connect(db_url)
+    try:
+        with conn.cursor() as cur:
+            if kind == "grind":
+                cur.execute("SELECT id FROM photogenic_grind "
+                            "WHERE lower(pattern) = lower(%s) LIMIT 1", (entry.pattern,))
+                row = cur.fetchone()
+                if row:
+                    cur.execute(
+                        "UPDATE photogenic_grind SET frequency = frequency + 1, "
+                        "confidence = LEAST(1.0, confidence + 0.02), "
+                        "last_seen = now() WHERE id = %s", (row[0],))
+                    conn.commit()
+                    return True
+            cur.execute(
+                f"INSERT INTO {store.table} ({', '.join(store.columns)}) "
+                f"VALUES {store.template}", store.values(entry))
+        conn.commit()
+        return True
+    except Exception:
+        return False
+    finally:
+        conn.close()
+
+
+def _bench_pg(writers: int = 8, per_writer: int = 300, patterns: int = 40) -> None:
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.parse import quote
+    import psycopg2
+
+    base_url = os.getenv("DATABASE_URL", "")
+    if not base_url:
+        print("DATABASE_URL is not set — nothing to benchmark.")
+        return
+
+    def workload(seed: int):
+        rng = random.Random(seed)
+        now = datetime.datetime.now().isoformat()
+        for i in range(per_writer):
+            roll = rng.random()
+            if roll < 0.4:
+                yield "conversations", ConversationMoment(
+                    user_words=f"moment {seed}-{i}", tag="truth", resonance=0.9,
+                    domain="life", user_name="bench", context="bench",
+                    compass="truth", turn=i, conversation_id=f"bench_{seed}",
+                    created_at=now)
+            elif roll < 0.7:
+                yield "wonder", WonderEntry(
+                    query=f"wonder {seed}-{i}", source="bench", finding="f",
+                    opinion="o", domain="music", resonance=0.5, tags="bench",
+                    created_at=now)
+            else:
+                yield "grind", GrindEntry(
+                    pattern=f"Pattern {rng.randrange(patterns)}", frequency=1,
+                    insight="i", domain="psychology", shorthand="s",
+                    confidence=0.1, last_seen="", created_at=now)
+
+    def run(label: str, schema: str, write) -> None:
+        sep = "&" if "?" in base_url else "?"
+        url = f"{base_url}{sep}options={quote(f'-csearch_path={schema}')}"
+        admin = psycopg2.connect(base_url)
+        admin.autocommit = True
+        admin.cursor().execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema}")
+        os.environ["DATABASE_URL"] = url
+        try:
+            db = PhotogenicDB(use_postgres=True)
+            if label == "legacy":
+                # The old tables had no pattern key; races made duplicates.
+                admin.cursor().execute(f"DROP INDEX {schema}.idx_pg_pattern_key")
+
+            def one_writer(seed: int) -> int:
+                return sum(write(db, url, kind, entry) for kind, entry in workload(seed))
+
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(writers) as pool:
+                ok = sum(pool.map(one_writer, range(writers)))
+            db.flush()
+            elapsed = time.perf_counter() - t0
+
+            cur = admin.cursor()
+            cur.execute(f"SELECT count(*), count(DISTINCT lower(pattern)), coalesce(sum(frequency), 0) "
+                        f"FROM {schema}.photogenic_grind")
+            rows, distinct, freq = cur.fetchone()
+            grind_stores = sum(1 for s in range(writers)
+                               for kind, _ in workload(s) if kind == "grind")
+            total = writers * per_writer
+            print(f"{label:>8} {total / elapsed:>9.0f} {elapsed:>8.2f} {ok:>6}/{total:<6} "
+                  f"{rows - distinct:>10} {grind_stores - freq:>6}")
+            db.close()
+        finally:
+            os.environ["DATABASE_URL"] = base_url
+            admin.cursor().execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+            admin.close()
+
+    print(f"{writers} writers x {per_writer} stores, {patterns} grind patterns")
+    print(f"{'path':>8} {'rows/s':>9} {'secs':>8} {'ok':>13} {'dup grind':>10} {'lost':>6}")
+    run("legacy", "photogenic_bench_legacy",
+        lambda db, url, kind, entry: _legacy_store(url, kind, entry))
+    run("batched", "photogenic_bench_batched",
+        lambda db, url, kind, entry: getattr(db, f"store_{'conversation' if kind == 'conversations' else kind}")(entry))
+
+
+def _synthetic_words(n_vocab: int = 5000):
+    """Zipf-ish vocabulary and a sampler over it."""
+    import itertools
+    import random
+    rng = random.Random(46)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocab = sorted({"".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+                    for _ in range(n_vocab * 2)})[:n_vocab]
+    rng.shuffle(vocab)
+    cum = list(itertools.accumulate(1.0 / (i + 1) for i in range(len(vocab))))
+
+    def text(k: int) -> str:
+        return " ".join(rng.choices(vocab, cum_weights=cum, k=k))
+    return rng, vocab, text
+
+
+_DOMAINS = ("life", "music", "physics", "culture", "psychology", "finance",
+            "education", "cosmology")
+_TAGS = ("truth", "love", "beauty_grief", "beauty_joy", "return_to_source")
+
+
+def _bench_search(sizes=(10_000, 100_000, 1_000_000)) -> None:
+    """In-memory conversations: old filter-and-sort vs _MemoryIndex."""
+    import gc
+    rng, vocab, text = _synthetic_words()
+    mid, rare = vocab[40], vocab[2500]
+    shapes = {
+        "no filter": dict(),
+        "rare word": dict(keyword=rare),
+        "common word": dict(keyword=vocab[2]),
+        "substring": dict(keyword=mid[1:4]),
+        "domain+min": dict(domain="music", min_resonance=0.8),
+        "word+compass": dict(keyword=mid, compass="love"),
+        "no match": dict(keyword="zzzzzz"),
+    }
+
+    def legacy(entries, compass=None, domain=None, keyword=None,
+               min_resonance=0.0, limit=5):
+        results = entries[:]
+        if compass:
+            results = [m for m in results if m.compass == compass]
+        if domain:
+            results = [m for m in results if m.domain == domain]
+        if keyword:
+            kw = keyword.lower()
+            results = [m for m in results
+                       if kw in m.user_words.lower() or kw in m.context.lower()]
+        if min_resonance > 0:
+            results = [m for m in results if m.resonance >= min_resonance]
+        results.sort(key=lambda m: m.resonance, reverse=True)
+        return results[:limit]
+
+    entries: List[ConversationMoment] = []
+    print(f"{'rows':>9} {'query':>13} {'legacy ms':>10} {'index us':>9} {'same':>5}")
+    for n in sizes:
+        while len(entries) < n:
+            tag = rng.choice(_TAGS)
+            entries.append(ConversationMoment(
+                user_words=text(12), tag=tag, resonance=round(rng.random(), 3),
+                domain=rng.choice(_DOMAINS), user_name="bench", context=text(8),
+                compass=classify_compass(tag), turn=0, conversation_id="bench"))
+        index = _MemoryIndex(("user_words", "context"), ("compass", "domain"), "resonance")
+        gc.collect()
+        t0 = time.perf_counter()
+        index.load(entries[:n])
+        build = time.perf_counter() - t0
+        print(f"{n:>9} {'(build)':>13} {'':>10} {build * 1e6:>9.0f}")
+        for name, kwargs in shapes.items():
+            kw = dict(kwargs)
+            min_res = kw.pop("min_resonance", 0.0)
+            t0 = time.perf_counter()
+            old = legacy(index.entries, min_resonance=min_res, **kw)
+            legacy_ms = (time.perf_counter() - t0) * 1e3
+            reps = 200
+            t0 = time.perf_counter()
+            for _ in range(reps):
+                new = index.query(kwargs.get("keyword"),
+                                  min_res, 5, compass=kwargs.get("compass"),
+                                  domain=kwargs.get("domain"))
+            index_us = (time.perf_counter() - t0) / reps * 1e6
+            print(f"{n:>9} {name:>13} {legacy_ms:>10.1f} {index_us:>9.1f} {str(old == new):>5}")
+        del index
+        gc.collect()
+
+
+def _bench_pg_search(sizes=(10_000, 100_000, 1_000_000)) -> None:
+    """Postgres: per-row to_tsvector vs stored column; search_all 3 trips vs 1."""
+    from urllib.parse import quote
+    import psycopg2
+
+    base_url = os.getenv("DATABASE_URL", "")
+    if not base_url:
+        print("DATABASE_URL is not set — skipping the Postgres search benchmark.")
+        return
+    _, vocab, _ = _synthetic_words()
+    schema = "photogenic_bench_search"
+    sep = "&" if "?" in base_url else "?"
+    url = f"{base_url}{sep}options={quote(f'-csearch_path={schema}')}"
+    admin = psycopg2.connect(base_url)
+    admin.autocommit = True
+    cur = admin.cursor()
+    cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE; CREATE SCHEMA {schema}")
+    os.environ["DATABASE_URL"] = url
+    words_sql = "ARRAY[" + ",".join(f"'{w}'" for w in vocab) + "]"
+
+    def fill(table: str, columns: str, values: str, rows: int) -> None:
+        cur.execute(f"""
+            INSERT INTO {schema}.{table} ({columns})
+            SELECT {values}
+            FROM generate_series(1, {rows}) g,
+                 LATERAL (SELECT {words_sql} AS w) v
+        """)
+
+    def phrase(k: int) -> str:
+        # Zipf-ish pick per word. Using s keeps the aggregate in the
+        # subquery; the g filter makes it run again for every row.
+        return (f"(SELECT string_agg(w[1 + s * 0 + floor(power(random(), 4) * "
+                f"{len(vocab)})::int], ' ') FROM generate_series(1, {k}) s "
+                f"WHERE g > 0)")
+
+    legacy_where = {
+        "conversations": "to_tsvector('english', coalesce(user_words,'') || ' ' || coalesce(context,''))",
+        "wonder": "to_tsvector('english', coalesce(query,'') || ' ' || coalesce(finding,'') || ' ' || coalesce(opinion,''))",
+        "grind": "to_tsvector('english', coalesce(pattern,'') || ' ' || coalesce(insight,'') || ' ' || coalesce(shorthand,''))",
+    }
+
+    def timed(fn, reps: int = 20) -> float:
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            fn()
+        return (time.perf_counter() - t0) / reps * 1e3
+
+    try:
+        db = PhotogenicDB(use_postgres=True)
+        loaded = 0
+        print(f"{'rows':>9} {'query':>12} {'expr ms':>8} {'stored ms':>10} "
+              f"{'all x3 ms':>10} {'all x1 ms':>10}")
+        for n in sizes:
+            fill("photogenic_conversations",
+                 "user_words, tag, resonance, domain, context, compass",
+                 f"{phrase(12)}, 'truth', random(), "
+                 f"(ARRAY{list(_DOMAINS)})[1 + (g % {len(_DOMAINS)})], "
+                 f"{phrase(8)}, (ARRAY['truth','love','beauty','return'])[1 + g % 4]",
+                 n - loaded)
+            for table, cols in (("photogenic_wonder", "query, finding, opinion, domain, resonance"),
+                                ("photogenic_grind", "pattern, insight, shorthand, domain, confidence")):
+                fill(table, cols,
+                     f"{phrase(4)} || ' ' || g, {phrase(10)}, {phrase(6)}, "
+                     f"(ARRAY{list(_DOMAINS)})[1 + (g % {len(_DOMAINS)})], random()",
+                     (n - loaded) // 10)
+            loaded = n
+            # The old expression indexes, so "expr" is the old plan, not a seq scan.
+            for kind, expr in legacy_where.items():
+                cur.execute(f"CREATE INDEX IF NOT EXISTS bench_{kind}_expr "
+                            f"ON {schema}.photogenic_{kind} USING gin(({expr}))")
+            # VACUUM flushes the GIN pending lists, as autovacuum would
+            # in steady state; the legacy indexes were just bulk-built.
+            cur.execute(f"VACUUM ANALYZE {schema}.photogenic_conversations, "
+                        f"{schema}.photogenic_wonder, {schema}.photogenic_grind")
+
+            for name, word in (("rare word", vocab[2500]), ("mid word", vocab[40]),
+                               ("common word", vocab[2])):
+                def one(column: str):
+                    cur.execute(
+                        f"SELECT * FROM {schema}.photogenic_conversations "
+                        f"WHERE {column} @@ plainto_tsquery('english', %s) "
+                        f"ORDER BY resonance DESC LIMIT 5", (word,))
+                    cur.fetchall()
+
+                def old_all():
+                    for kind, order in (("conversations", "resonance"),
+                                        ("wonder", "resonance"),
+                                        ("grind", "confidence")):
+                        conn = psycopg2.connect(url)
+                        c = conn.cursor()
+                        c.execute(f"SELECT * FROM photogenic_{kind} WHERE {legacy_where[kind]} "
+                                  f"@@ plainto_tsquery('english', %s) "
+                                  f"ORDER BY {order} DESC LIMIT 3", (word,))
+                        c.fetchall()
+                        conn.close()
+
+                print(f"{n:>9} {name:>12} {timed(lambda: one(legacy_where['conversations'])):>8.2f} "
+                      f"{timed(lambda: one('search_tsv')):>10.2f} "
+                      f"{timed(old_all):>10.2f} {timed(lambda: db.search_all(word)):>10.2f}")
+        db.close()
+    finally:
+        os.environ["DATABASE_URL"] = base_url
+        cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        admin.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["search"]:
+        _bench_search()
+        _bench_pg_search()
+    else:
+        _bench_pg()
@@ -17,12 +17,15 @@ PERSON MODEL INTEGRATION (v4.1):
   When absent, behavior is identical to before — zero breakage.
 """
 
-import re
 import random
-from typing import List, Dict, Any, Optional
+from collections import deque
+from typing import Deque, List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
+from rilie_neardup import NearDupIndex
+from rilie_tokens import tokenize, jaccard
+
 
 class DisclosureLevel(Enum):
     TASTE = "taste"   # Turn 1-2: invitation only (currently bypassed)
@@ -34,40 +37,63 @@ class DisclosureLevel(Enum):
 # SIMILARITY UTIL — used by deja vu detection
 # ============================================================================
 
-def _normalize_words(text: str) -> set:
+def _normalize_words(text: str) -> frozenset:
     """Strip punctuation, lowercase, return word set."""
-    cleaned = re.sub(r"[^a-zA-Z0-9\s]", "", text.lower())
-    return set(cleaned.split())
+    return tokenize(text).word_set
 
 
 def _stimulus_similarity(a: str, b: str) -> float:
     """Jaccard similarity between two stimuli, 0.0-1.0."""
-    wa = _normalize_words(a)
-    wb = _normalize_words(b)
-    if not wa or not wb:
-        return 0.0
-    union = wa | wb
-    if not union:
-        return 0.0
-    return len(wa & wb) / len(union)
+    return jaccard(a, b)
 
 
 # ============================================================================
 # CONVERSATION STATE
 # ============================================================================
 
+# How many past stimuli / responses the deja vu checks look back over.
+# Also how many the histories keep: nothing reads further back.
+DEJAVU_WINDOW = 5
+
+# Session-row budget per stored text. Deja vu similarity on a 2 KB
+# prefix is as good as on a whole file upload.
+STATE_TEXT_CAP = 2000
+
+# The envelope fields get_dejavu_self_diagnosis() actually reads.
+_ENVELOPE_FIELDS = ("status", "baseline_used_as_result", "quality_score", "priorities_met")
+
+
+def _ring() -> Deque[str]:
+    return deque(maxlen=DEJAVU_WINDOW)
+
+
 @dataclass
 class ConversationState:
-    """Track where we are in the sequence."""
+    """Track where we are in the sequence.
+
+    One per session. Histories are ring buffers of the last DEJAVU_WINDOW
+    turns, and to_state()/from_state() carry the whole thing through the
+    session row, so nothing accumulates in the worker between requests.
+    """
     exchange_count: int = 0
-    stimuli_history: List[str] = field(default_factory=list)
-    response_history: List[str] = field(default_factory=list)
+    stimuli_history: Deque[str] = field(default_factory=_ring)
+    response_history: Deque[str] = field(default_factory=_ring)
 
     # Deja vu tracking
     dejavu_count: int = 0
     dejavu_cluster_stimulus: str = ""
     dejavu_last_envelopes: List[Dict[str, Any]] = field(default_factory=list)
 
+    # Near-duplicate signatures of recent stimuli / responses (rilie_neardup)
+    stimulus_index: NearDupIndex = field(
+        default_factory=lambda: NearDupIndex(window=DEJAVU_WINDOW),
+        repr=False, compare=False,
+    )
+    response_index: NearDupIndex = field(
+        default_factory=lambda: NearDupIndex(window=DEJAVU_WINDOW),
+        repr=False, compare=False,
+    )
+
     @property
     def disclosure_level(self) -> DisclosureLevel:
         """Simple sequence: turns 1-3 = TASTE, turn 4+ = OPEN.
@@ -95,6 +121,7 @@ class ConversationState:
         """Record and move to next."""
         self.stimuli_history.append(stimulus)
         self.response_history.append(response)
+        self._index_exchange(stimulus, response)
         self.exchange_count += 1
 
     def record_dejavu_exchange(
@@ -106,9 +133,58 @@ class ConversationState:
         """Record an exchange handled by the deja vu path."""
         self.stimuli_history.append(stimulus)
         self.response_history.append(response)
+        self._index_exchange(stimulus, response)
         self.exchange_count += 1
         if envelope:
             self.dejavu_last_envelopes.append(envelope)
+            del self.dejavu_last_envelopes[:-DEJAVU_WINDOW]
+
+    def _index_exchange(self, stimulus: str, response: str) -> None:
+        self.stimulus_index.add(stimulus)
+        if response:
+            self.response_index.add(response)
+
+    # --- Session row round trip ---
+
+    def to_state(self) -> Dict[str, Any]:
+        """Compact, JSON-ready form for the session row."""
+        return {
+            "n": self.exchange_count,
+            "s": [t[:STATE_TEXT_CAP] for t in self.stimuli_history],
+            "r": [t[:STATE_TEXT_CAP] for t in self.response_history],
+            "dv": self.dejavu_count,
+            "dc": self.dejavu_cluster_stimulus[:STATE_TEXT_CAP],
+            "env": [
+                {k: env[k] for k in _ENVELOPE_FIELDS if k in env}
+                for env in self.dejavu_last_envelopes
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, Any]]) -> "ConversationState":
+        """Rebuild from to_state() output. Missing or junk → fresh state."""
+        conv = cls()
+        if not isinstance(state, dict):
+            return conv
+        try:
+            conv.exchange_count = int(state.get("n", 0))
+            conv.dejavu_count = int(state.get("dv", 0))
+        except (TypeError, ValueError):
+            return cls()
+        conv.dejavu_cluster_stimulus = str(state.get("dc", "") or "")
+        conv.dejavu_last_envelopes = [
+            dict(env) for env in state.get("env", []) if isinstance(env, dict)
+        ][-DEJAVU_WINDOW:]
+        stimuli = [t for t in state.get("s", []) if isinstance(t, str)]
+        responses = [t for t in state.get("r", []) if isinstance(t, str)]
+        conv.stimuli_history.extend(stimuli)
+        conv.response_history.extend(responses)
+        for text in conv.stimuli_history:
+            conv.stimulus_index.add(text)
+        for text in conv.response_history:
+            if text:
+                conv.response_index.add(text)
+        return conv
 
     # --- Deja vu detection ---
 
@@ -128,15 +204,13 @@ class ConversationState:
                 self.dejavu_count += 1
                 return self.dejavu_count
 
-        # Check against recent stimuli (last 5)
-        recent = self.stimuli_history[-5:] if self.stimuli_history else []
-        for prev in reversed(recent):
-            sim = _stimulus_similarity(s, prev)
-            if sim >= threshold:
-                self.dejavu_cluster_stimulus = prev
-                self.dejavu_count = 1
-                self.dejavu_last_envelopes = []
-                return self.dejavu_count
+        # Check against recent stimuli (near-dup index, newest match first)
+        hits = self.stimulus_index.query(s, threshold)
+        if hits:
+            self.dejavu_cluster_stimulus = hits[0][1]
+            self.dejavu_count = 1
+            self.dejavu_last_envelopes = []
+            return self.dejavu_count
 
         # Fresh stimulus — reset
         self.dejavu_count = 0
@@ -1104,51 +1104,18 @@ def _store_measurestick_signal(
     Low originality = she borrowed too much from baseline. Worth knowing.
     High originality + low relevance = she drifted. Worth knowing.
     This is learning data, not punishment data.
+
+    One row, written now. The request path goes through
+    rilie_measurestick instead, which samples and writes in batches.
     """
     try:
-        from banks import get_db_connection
-        conn = get_db_connection()
-        if not conn:
-            return
-        cur = conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS banks_measurestick (
-                id SERIAL PRIMARY KEY,
-                stimulus TEXT NOT NULL,
-                rilie_response TEXT NOT NULL,
-                baseline_response TEXT NOT NULL,
-                relevance FLOAT DEFAULT 0,
-                originality FLOAT DEFAULT 0,
-                coherence FLOAT DEFAULT 0,
-                google_hits INTEGER DEFAULT -1,
-                recommendation TEXT,
-                reason TEXT,
-                created_at TIMESTAMP DEFAULT NOW()
-            )
-            """
-        )
-        cur.execute(
-            """INSERT INTO banks_measurestick
-               (stimulus, rilie_response, baseline_response,
-                relevance, originality, coherence, google_hits,
-                recommendation, reason)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
-            (
-                stimulus[:500],
-                rilie_response[:500],
-                baseline_response[:500],
-                measure.get("relevance", 0),
-                measure.get("originality", 0),
-                measure.get("coherence", 0),
-                measure.get("google_hits", -1),
-                measure.get("recommendation", ""),
-                measure.get("reason", ""),
-            ),
-        )
-        conn.commit()
-        cur.close()
-        conn.close()
+        from banks import store_measurestick_signals
+        store_measurestick_signals([{
+            "stimulus": stimulus,
+            "rilie_response": rilie_response,
+            "baseline_response": baseline_response,
+            "measure": measure,
+        }])
         logger.info(
             "MEASURESTICK: signal stored — %s (relevance=%.2f originality=%.2f)",
             measure.get("recommendation", "?"),
@@ -18,16 +18,19 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import List, Dict, Optional
 
-# --- The Pantry ---
-from rilie_outercore import (
-    CONSCIOUSNESS_TRACKS,
-    PRIORITY_HIERARCHY,
-    DOMAIN_KNOWLEDGE,
-    DOMAIN_KEYWORDS,
-    WORD_DEFINITIONS,
-    WORD_SYNONYMS,
-    WORD_HOMONYMS,
-)
+from rilie_tokens import tokenize
+
+# --- The Pantry (compiled snapshot of rilie_outercore.py) ---
+from rilie_pantry_snapshot import load_pantry
+
+_PANTRY = load_pantry()
+CONSCIOUSNESS_TRACKS = _PANTRY.consciousness_tracks
+PRIORITY_HIERARCHY = _PANTRY.priority_hierarchy
+DOMAIN_KNOWLEDGE = _PANTRY.domain_knowledge
+DOMAIN_KEYWORDS = _PANTRY.domain_keywords
+WORD_DEFINITIONS = _PANTRY.word_definitions
+WORD_SYNONYMS = _PANTRY.word_synonyms
+WORD_HOMONYMS = _PANTRY.word_homonyms
 
 # --- Chompky — grammar brain for constructing responses from thought ---
 # Graceful fallback if spaCy model not available
@@ -119,9 +122,9 @@ def compute_trite_score(baseline_results: Optional[List[Dict[str, str]]] = None)
     count_factor = min(1.0, count / 5.0)
     snippets = []
     for r in baseline_results:
-        s = (r.get("snippet") or r.get("title") or "").lower().strip()
+        s = (r.get("snippet") or r.get("title") or "").strip()
         if s:
-            snippets.append(set(s.split()))
+            snippets.append(tokenize(s).word_set)
     if len(snippets) < 2:
         overlap_factor = 0.0
     else:
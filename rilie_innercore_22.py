@@ -2,6 +2,9 @@ from typing import List, Dict, Optional  # and any others you use
 import re
 import random
 
+from rilie_neardup import NearDupIndex
+from rilie_tokens import tokenize
+
 from rilie_innercore_12 import (
     QuestionType,
     Interpretation,
@@ -25,14 +28,15 @@ from rilie_innercore_12 import (
     reset_clarification_counter,
 )
 
-# --- The Pantry (rilie_outercore.py) ---
-from rilie_outercore import (
-    DOMAIN_KNOWLEDGE,
-    DOMAIN_KEYWORDS,
-    WORD_DEFINITIONS,
-    WORD_SYNONYMS,
-    WORD_HOMONYMS,
-)
+# --- The Pantry (compiled snapshot of rilie_outercore.py) ---
+from rilie_pantry_snapshot import load_pantry
+
+_PANTRY = load_pantry()
+DOMAIN_KNOWLEDGE = _PANTRY.domain_knowledge
+DOMAIN_KEYWORDS = _PANTRY.domain_keywords
+WORD_DEFINITIONS = _PANTRY.word_definitions
+WORD_SYNONYMS = _PANTRY.word_synonyms
+WORD_HOMONYMS = _PANTRY.word_homonyms
 
 # --- Chompky — grammar brain ---
 try:
@@ -65,77 +69,40 @@ except ImportError:
 # DOMAIN DETECTION & EXCAVATION
 # ============================================================================
 
+# Prebuilt in the pantry snapshot — see rilie_pantry_index.py.
+_KEYWORD_AUTOMATON = _PANTRY.keyword_automaton
+
+
 def detect_domains(stimulus: str) -> List[str]:
     sl = (stimulus or "").lower()
-    scores = {
-        d: sum(1 for kw in kws if kw in sl)
-        for d, kws in DOMAIN_KEYWORDS.items()
-    }
+    # One pass over the stimulus — same counts as the domains × keywords loop
+    scores = _KEYWORD_AUTOMATON.scores(sl)
     # Chompky boost: use holy_trinity to find domains the keywords missed
     if CHOMSKY_AVAILABLE:
         try:
             trinity = extract_holy_trinity_for_roux(stimulus)
             for word in trinity:
-                wl = word.lower()
-                for d, kws in DOMAIN_KEYWORDS.items():
-                    if any(wl in kw or kw in wl for kw in kws):
-                        scores[d] = scores.get(d, 0) + 2
+                for d in _KEYWORD_AUTOMATON.related_domains(word.lower()):
+                    scores[d] = scores.get(d, 0) + 2
         except Exception:
             pass
     ordered = sorted(scores.items(), key=lambda x: x[1], reverse=True)
     return [d for d, _ in ordered[:4] if d in DOMAIN_KNOWLEDGE]
 
 
+# BM25 shelves over DOMAIN_KNOWLEDGE, enrichment baked in — prebuilt.
+_PANTRY_INDEX = _PANTRY.pantry_index
+
+
 def excavate_domains(stimulus: str, domains: List[str]) -> Dict[str, List[str]]:
     """
     For each domain, sample a small subset of its internal statements.
-    Prefers sub-domains that keyword-match the stimulus.
+    Prefers sub-domains named in the stimulus, then BM25 word relevance
+    (synonyms included). Items come back already word-enriched.
     """
-    sl = (stimulus or "").lower()
     excavated: Dict[str, List[str]] = {}
     for domain in domains:
-        if domain not in DOMAIN_KNOWLEDGE:
-            excavated[domain] = []
-            continue
-        sub_items: List[tuple] = []
-        for sub_key, items in DOMAIN_KNOWLEDGE[domain].items():
-            sub_relevance = 1 if sub_key.lower() in sl else 0
-            for item in items:
-                item_words = set(item.lower().split())
-                stim_words = set(sl.split())
-                word_overlap = len(item_words & stim_words)
-                score = sub_relevance * 2 + word_overlap
-                sub_items.append((score, item))
-        if sub_items:
-            sub_items.sort(key=lambda x: x[0], reverse=True)
-            top = [item for _, item in sub_items[:4]]
-            remaining = [item for _, item in sub_items[4:]]
-            if remaining:
-                top.append(random.choice(remaining))
-            excavated[domain] = top
-        else:
-            excavated[domain] = []
-
-    # --- WORD ENRICHMENT ---
-    for domain, items in excavated.items():
-        enriched = []
-        for item in items:
-            if len(item.split()) < 5:
-                word = item.strip().lower()
-                definition = WORD_DEFINITIONS.get(word, "")
-                synonyms = WORD_SYNONYMS.get(word, [])
-                homonyms = WORD_HOMONYMS.get(word, [])
-                parts = [item]
-                if definition:
-                    parts.append(definition)
-                if synonyms:
-                    parts.append("also: " + ", ".join(synonyms[:4]))
-                if homonyms:
-                    parts.append("other meanings: " + "; ".join(homonyms[:3]))
-                enriched.append(" — ".join(parts))
-            else:
-                enriched.append(item)
-        excavated[domain] = enriched
+        excavated[domain] = _PANTRY_INDEX.top_k(domain, stimulus or "", k=4)
     return excavated
 
 
@@ -402,6 +369,7 @@ def run_pass_pipeline(
     baseline_text: str = "",
     precision_override: bool = False,
     baseline_score_boost: float = 0.03,
+    prior_index: Optional[NearDupIndex] = None,
 ) -> dict:
     """
     Run interpretation passes. Called only at OPEN or FULL disclosure.
@@ -415,6 +383,9 @@ def run_pass_pipeline(
     6. Step 8: superiority comparison — Kitchen vs parsed baseline
     7. Step 10: if Kitchen empty, clarify_or_freestyle instead of silence
 
+    prior_index: the session's NearDupIndex of recent responses. When
+    absent, one is built from the last 5 prior_responses.
+
     STATUS CODES:
     - COMPRESSED, GUESS, DIRECT_ANSWER, CLARIFICATION,
     - FREESTYLE, BASELINE_WIN, BASELINE_FALLBACK, MISE_EN_PLACE
@@ -489,26 +460,18 @@ def run_pass_pipeline(
             logger.debug("STEP 9 error: %s", e)
 
     # --- Anti-deja-vu ---
-    _prior_word_sets = []
-    if prior_responses:
-        for pr in prior_responses[-5:]:
-            words = set(re.sub(r"[^a-zA-Z0-9\s]", "", pr.lower()).split())
-            _prior_word_sets.append(words)
-
-    def _is_dejavu(candidate_text):
-        if not _prior_word_sets or not candidate_text:
-            return False
-        cand_words = set(re.sub(r"[^a-zA-Z0-9\s]", "", candidate_text.lower()).split())
-        if len(cand_words) < 3:
-            return False
-        for prior_words in _prior_word_sets:
-            if not prior_words:
-                continue
-            overlap = cand_words & prior_words
-            smaller = min(len(cand_words), len(prior_words))
-            if smaller > 0 and len(overlap) / smaller > 0.6:
-                return True
-        return False
+    if prior_index is None and prior_responses:
+        prior_index = NearDupIndex(window=5)
+        for pr in list(prior_responses)[-5:]:
+            prior_index.add(pr)
+
+    def _dejavu_score(candidate_text):
+        """Highest overlap coefficient against recent responses."""
+        if prior_index is None or not len(prior_index) or not candidate_text:
+            return 0.0
+        if len(tokenize(candidate_text).word_set) < 3:
+            return 0.0
+        return prior_index.max_overlap(candidate_text)
 
     excavated = excavate_domains(clean_stimulus, domains)
 
@@ -560,9 +523,12 @@ def run_pass_pipeline(
             _debug_passes.append({"pass": current_pass, "candidates": 0, "note": "empty"})
             continue
 
+        # One dejavu score per candidate — reused by the filter and fallback.
+        dejavu_scores = {i.id: _dejavu_score(i.text) for i in nine}
+
         pass_candidates = []
         for i in nine:
-            dejavu = _is_dejavu(i.text)
+            dejavu = dejavu_scores[i.id] > 0.6
             entry = {
                 "id": i.id, "domain": i.domain, "text": i.text[:120],
                 "overall_score": round(i.overall_score, 4),
@@ -581,26 +547,11 @@ def run_pass_pipeline(
                 0.04 if any(d in domains for d in ["music", "culinary", "science", "mathematics"])
                 else (0.06 if current_pass == 1 else 0.09)
             ) or i.count_met >= 1)
-            and not _is_dejavu(i.text)
+            and not dejavu_scores[i.id] > 0.6
         ]
 
         if not filtered and nine:
-            def _dejavu_score(text):
-                if not _prior_word_sets or not text:
-                    return 0.0
-                cand_words = set(re.sub(r"[^a-zA-Z0-9\s]", "", text.lower()).split())
-                if len(cand_words) < 3:
-                    return 0.0
-                best_ov = 0.0
-                for pw in _prior_word_sets:
-                    if not pw:
-                        continue
-                    ov = cand_words & pw
-                    smaller = min(len(cand_words), len(pw))
-                    if smaller > 0:
-                        best_ov = max(best_ov, len(ov) / smaller)
-                return best_ov
-            ranked = sorted(nine, key=lambda x: _dejavu_score(x.text))
+            ranked = sorted(nine, key=lambda x: dejavu_scores[x.id])
             filtered = [ranked[0]]
 
         _debug_passes.append({
@@ -618,12 +569,18 @@ def run_pass_pipeline(
             QuestionType.UNKNOWN, QuestionType.CHOICE, QuestionType.DEFINITION,
         }:
             # Facts-first / precisionoverride: do NOT compress, serve full sentence.
-            if precision_override and question_type == QuestionType.DEFINITION:
+            serve_raw = precision_override and question_type == QuestionType.DEFINITION
+            if serve_raw:
                 compressed_text = best.text
             else:
                 compressed_text = _apply_limo(best.text, precision_override=precision_override)
+            # The other survivors, raw. TALK re-ranks them, tries them
+            # before sending the order back, and compresses only the ones
+            # it tries (limo_applied says whether to).
+            alternates = [i.text for i in filtered if i is not best]
             return {
                 "stimulus": clean_stimulus, "result": compressed_text,
+                "alternates": alternates,
                 "quality_score": best.overall_score,
                 "priorities_met": best.count_met,
                 "anti_beige_score": best.anti_beige_score,
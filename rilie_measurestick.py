@@ -0,0 +1,354 @@
+"""
+rilie_measurestick.py — THE MEASURESTICK, AFTER HOURS
+======================================================
+
+MEASURESTICK is a signal, never a gate: the plate is already decided by
+the time it runs. It used to run anyway, on every turn, inside the
+request. That meant a quoted-phrase Brave search and a fresh Postgres
+connection for an INSERT, all charged to the customer's wait.
+
+Now the request path only calls offer(), which costs a coin flip and a
+deque append:
+
+    offer(stimulus, response, baseline, search_fn)  # -> sampled?
+
+- SAMPLING — only RILIE_MEASURESTICK_SAMPLE of turns (default 10%) are
+  measured. The metric is an average, and a fair sample estimates it
+  just as well for a tenth of the searches.
+- BACKGROUND — one daemon thread runs _measurestick on sampled turns.
+  A single thread also keeps Brave calls from measurestick serialized.
+- PHRASE CACHE — search results are cached by the quoted phrase, with
+  LRU and a TTL. RILIE says some things more than once; Brave only
+  needs to hear each one once a day.
+- BATCHED WRITES — signals go to banks_measurestick RILIE_MEASURESTICK_BATCH
+  at a time, or every RILIE_MEASURESTICK_FLUSH_MS, in one INSERT.
+
+When the backlog is full (RILIE_MEASURESTICK_MAX_PENDING), new samples
+are dropped and counted, never waited on. Losing a sample costs a little
+precision; blocking a turn costs the customer.
+
+banks.get_measurestick_stats() reads the metric back out, offline.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MEASURESTICK_SAMPLE_RATE = float(os.getenv("RILIE_MEASURESTICK_SAMPLE", "0.1"))
+MEASURESTICK_CACHE_SIZE = int(os.getenv("RILIE_MEASURESTICK_CACHE", "4096"))
+MEASURESTICK_CACHE_TTL = float(os.getenv("RILIE_MEASURESTICK_CACHE_TTL_S", "86400"))
+MEASURESTICK_BATCH_SIZE = int(os.getenv("RILIE_MEASURESTICK_BATCH", "50"))
+MEASURESTICK_FLUSH_SECONDS = float(os.getenv("RILIE_MEASURESTICK_FLUSH_MS", "5000")) / 1000.0
+MEASURESTICK_MAX_PENDING = int(os.getenv("RILIE_MEASURESTICK_MAX_PENDING", "500"))
+
+
+class PhraseCache:
+    """LRU + TTL cache of search results, keyed by the query phrase."""
+
+    def __init__(self, size: int = MEASURESTICK_CACHE_SIZE,
+                 ttl: float = MEASURESTICK_CACHE_TTL):
+        self.size = max(1, size)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def search(self, search_fn: Callable[[str], Any], query: str) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(query)
+            if entry is not None and now - entry[0] < self.ttl:
+                self._entries.move_to_end(query)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        result = search_fn(query)           # outside the lock: it's a network call
+        with self._lock:
+            self._entries[query] = (now, result)
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _store_batch(signals: List[Dict[str, Any]]) -> int:
+    from banks import store_measurestick_signals
+    return store_measurestick_signals(signals)
+
+
+def _ensure_table() -> None:
+    from banks import ensure_measurestick_table
+    ensure_measurestick_table()
+
+
+class MeasurestickSampler:
+    """
+    Sample turns, measure them in the background, write signals in batches.
+
+    offer() never blocks and never raises. The worker thread starts on
+    the first sampled turn. Searches go through the phrase cache; a
+    failed search leaves originality at its default, like before. A
+    failed batch write is logged and dropped: this is learning data.
+    """
+
+    def __init__(self,
+                 sample_rate: float = MEASURESTICK_SAMPLE_RATE,
+                 cache: Optional[PhraseCache] = None,
+                 store_fn: Callable[[List[Dict[str, Any]]], int] = _store_batch,
+                 ensure_fn: Optional[Callable[[], None]] = _ensure_table,
+                 batch_size: int = MEASURESTICK_BATCH_SIZE,
+                 flush_seconds: float = MEASURESTICK_FLUSH_SECONDS,
+                 max_pending: int = MEASURESTICK_MAX_PENDING,
+                 rng: Optional[random.Random] = None):
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.cache = cache or PhraseCache()
+        self.store_fn = store_fn
+        self.ensure_fn = ensure_fn
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.max_pending = max(1, max_pending)
+        self._rng = rng or random.Random()
+        self._pending: Deque[Tuple] = deque()
+        self._signals: List[Dict[str, Any]] = []
+        self._busy = False
+        self._flush_waiters = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = True
+        self.stats = {"offered": 0, "sampled": 0, "dropped": 0, "measured": 0,
+                      "stored": 0, "store_failed": 0, "batches": 0}
+
+    # --- request path -----------------------------------------------------
+
+    def offer(self, stimulus: str, response: str, baseline: str,
+              search_fn: Callable[[str], Any]) -> bool:
+        """Maybe queue this turn for measuring. True if it was sampled."""
+        self.stats["offered"] += 1
+        if self._rng.random() >= self.sample_rate:
+            return False
+        with self._cond:
+            if not self._running:
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.stats["dropped"] += 1
+                return False
+            self._pending.append((stimulus, response, baseline, search_fn, time.time()))
+            self.stats["sampled"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True,
+                                                name="measurestick")
+                self._thread.start()
+            self._cond.notify_all()
+        return True
+
+    # --- lifecycle --------------------------------------------------------
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Block until every sampled turn so far is measured and written."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flush_waiters += 1
+            try:
+                while self._pending or self._signals or self._busy:
+                    self._cond.notify_all()
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        return False
+                    self._cond.wait(left)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self, timeout: float = 30.0) -> None:
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "sample_rate": self.sample_rate,
+            "pending": len(self._pending),
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        }
+
+    # --- worker -----------------------------------------------------------
+
+    def _loop(self) -> None:
+        first_write_at = None
+        while True:
+            with self._cond:
+                while (self._running and not self._pending
+                       and not self._write_due(first_write_at)):
+                    timeout = None
+                    if self._signals:
+                        timeout = max(0.0, first_write_at - time.monotonic())
+                    self._cond.wait(timeout)
+                if not self._running and not self._pending and not self._signals:
+                    return
+                job = self._pending.popleft() if self._pending else None
+                self._busy = True
+            try:
+                if job is not None:
+                    signal = self._measure(*job)
+                    if signal is not None:
+                        self._signals.append(signal)
+                        if first_write_at is None:
+                            first_write_at = time.monotonic() + self.flush_seconds
+                if self._write_due(first_write_at) or not self._running:
+                    self._write()
+                    first_write_at = None
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write_due(self, first_write_at: Optional[float]) -> bool:
+        if not self._signals:
+            return False
+        return (len(self._signals) >= self.batch_size
+                or (not self._pending and self._flush_waiters > 0)
+                or time.monotonic() >= first_write_at)
+
+    def _measure(self, stimulus: str, response: str, baseline: str,
+                 search_fn, offered_at: float) -> Optional[Dict[str, Any]]:
+        from rilie_foundation import _measurestick
+        try:
+            measure = _measurestick(
+                response, stimulus, lambda q: self.cache.search(search_fn, q))
+        except Exception as e:
+            logger.debug("MEASURESTICK: measure failed: %s", e)
+            return None
+        self.stats["measured"] += 1
+        logger.info(
+            "MEASURESTICK (sampled): recommendation=%s relevance=%.2f "
+            "originality=%.2f coherence=%.2f hits=%d",
+            measure.get("recommendation", "?"), measure.get("relevance", 0),
+            measure.get("originality", 0), measure.get("coherence", 0),
+            measure.get("google_hits", -1),
+        )
+        return {
+            "stimulus": stimulus,
+            "rilie_response": response,
+            "baseline_response": baseline,
+            "measure": measure,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(offered_at)),
+        }
+
+    def _write(self) -> None:
+        signals, self._signals = self._signals, []
+        try:
+            if self.ensure_fn is not None:
+                self.ensure_fn()
+                self.ensure_fn = None       # once per process
+            self.store_fn(signals)
+            self.stats["stored"] += len(signals)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["store_failed"] += len(signals)
+            logger.warning("MEASURESTICK: dropped a batch of %d signals: %s",
+                           len(signals), e)
+
+
+_sampler: Optional[MeasurestickSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> MeasurestickSampler:
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = MeasurestickSampler()
+            atexit.register(_sampler.close, 5.0)
+        return _sampler
+
+
+def offer(stimulus: str, response: str, baseline: str,
+          search_fn: Callable[[str], Any]) -> bool:
+    """Request-path entry point: maybe measure this turn, later."""
+    try:
+        return get_sampler().offer(stimulus, response, baseline, search_fn)
+    except Exception as e:
+        logger.debug("MEASURESTICK: offer failed: %s", e)
+        return False
+
+
+# ============================================================================
+# BENCHMARK — python rilie_measurestick.py
+# ============================================================================
+
+def _bench(turns: int = 400, search_ms: float = 250.0, insert_ms: float = 15.0,
+           sample_rate: float = 0.1) -> None:
+    """Request-path cost per turn: inline measurestick vs offer()."""
+    import statistics
+
+    from rilie_foundation import _measurestick
+
+    rng = random.Random(50)
+    lines = [f"the rhythm of line {i} is how the city keeps its time" for i in range(60)]
+    corpus = [(f"what about rhythm {i}?", rng.choice(lines), "baseline text") for i in range(turns)]
+    searches = []
+
+    def brave(query):
+        searches.append(query)
+        time.sleep(search_ms / 1000.0)
+        return [{"title": "t"}] * rng.randint(0, 12)
+
+    def store(signals):
+        time.sleep(insert_ms / 1000.0)
+        return len(signals)
+
+    # Inline: the old request path, one search and one INSERT per turn.
+    sample = corpus[:20]
+    t0 = time.perf_counter()
+    for stimulus, response, baseline in sample:
+        _measurestick(response, stimulus, brave)
+        store([{}])
+    inline = (time.perf_counter() - t0) / len(sample)
+    inline_searches = len(searches)
+
+    searches.clear()
+    sampler = MeasurestickSampler(sample_rate=sample_rate, store_fn=store, ensure_fn=None,
+                                  batch_size=50, flush_seconds=1.0,
+                                  rng=random.Random(1))
+    costs = []
+    for stimulus, response, baseline in corpus:
+        t0 = time.perf_counter()
+        sampler.offer(stimulus, response, baseline, brave)
+        costs.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    sampler.flush(timeout=120)
+    drain = time.perf_counter() - t0
+    sampler.close()
+    snap = sampler.snapshot()
+
+    print(f"search {search_ms:.0f} ms, insert {insert_ms:.0f} ms, sample rate {sample_rate}")
+    print(f"inline:  {inline * 1e3:8.1f} ms/turn on the request path, "
+          f"{inline_searches / len(sample):.2f} searches/turn")
+    print(f"offer(): {statistics.median(costs) * 1e6:8.1f} us/turn median "
+          f"(p99 {sorted(costs)[int(len(costs) * 0.99)] * 1e6:.1f} us)")
+    print(f"         {snap['sampled']} of {turns} sampled, {len(searches)} searches "
+          f"({snap['cache_hits']} cache hits), {snap['batches']} batch writes, "
+          f"background drain {drain:.1f} s")
+
+
+if __name__ == "__main__":
+    _bench()
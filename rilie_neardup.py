@@ -0,0 +1,208 @@
+"""
+rilie_neardup.py — HAVE WE SERVED THIS BEFORE?
+===============================================
+
+Déjà vu used to be exact set math, rebuilt every call: chop the new
+text, chop every past text in the window, intersect them all. Cost grew
+with the window, so the window stayed at five.
+
+NearDupIndex keeps a compact MinHash signature per past text and buckets
+the signatures with LSH banding. "Similar to anything recent?" only
+looks at the bucket-mates of the new text, so cost stays flat as the
+window grows.
+
+    idx = NearDupIndex(window=64)
+    idx.add("explain rilie 3 6 9")
+    idx.query("explain rilie 3, 6, 9!", threshold=0.55)   # → [(seq, text, score)]
+    idx.max_overlap("...")                                  # best overlap coeff.
+
+Scores are exact set math on the stored word sets. The signatures only
+pick which entries query() scores once the index holds SCAN_BELOW
+entries or more: 64 bands of 2 rows miss a pair at Jaccard 0.55 about
+once in 10^10. Smaller windows are cheaper to score outright. max_overlap() scans every entry:
+LSH buckets follow Jaccard, and a short text contained in a long one
+has high overlap but low Jaccard, so it rarely shares a bucket. The
+windows that call it are small (5 and 20), where the scan is cheaper
+than the index anyway. test_neardup.py holds both to brute force.
+
+Words come from rilie_tokens, same cut the old exact checks used.
+Hashes are crc32-based and seeded, so signatures are stable across
+processes and restarts.
+"""
+
+from __future__ import annotations
+
+import random
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from rilie_tokens import tokenize
+
+NUM_PERM = 128
+BAND_ROWS = 2                      # 64 bands of 2 rows → catches J ≳ 0.15
+SCAN_BELOW = 32                    # fewer entries than this: score them all
+_PRIME = np.uint64((1 << 31) - 1)
+_SEED = 369
+
+_rng = random.Random(_SEED)
+_A = np.array([_rng.randrange(1, (1 << 31) - 1) for _ in range(NUM_PERM)],
+              dtype=np.uint64)
+_B = np.array([_rng.randrange(0, (1 << 31) - 1) for _ in range(NUM_PERM)],
+              dtype=np.uint64)
+
+
+@lru_cache(maxsize=4096)
+def signature(text: str) -> Tuple[FrozenSet[str], Optional[np.ndarray]]:
+    """(word set, MinHash signature) — (empty set, None) for wordless text."""
+    words = tokenize(text or "").word_set
+    if not words:
+        return words, None
+    h = np.fromiter((zlib.crc32(w.encode()) for w in words),
+                    dtype=np.uint64, count=len(words))
+    sig = ((_A[:, None] * h[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+    sig.flags.writeable = False
+    return words, sig
+
+
+def _bands(sig: np.ndarray) -> List[bytes]:
+    return [sig[i:i + BAND_ROWS].tobytes() for i in range(0, NUM_PERM, BAND_ROWS)]
+
+
+class NearDupIndex:
+    """Bounded, LSH-bucketed MinHash index over the last `window` texts."""
+
+    __slots__ = ("window", "_entries", "_buckets", "_seq")
+
+    def __init__(self, window: int = 5):
+        self.window = max(1, int(window))
+        # seq → (text, word set, signature); insertion order = age
+        self._entries: "OrderedDict[int, Tuple[str, FrozenSet[str], Optional[np.ndarray]]]" = OrderedDict()
+        self._buckets: List[Dict[bytes, Set[int]]] = [
+            {} for _ in range(NUM_PERM // BAND_ROWS)
+        ]
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def texts(self) -> List[str]:
+        """Indexed texts, oldest first."""
+        return [text for text, _, _ in self._entries.values()]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        for bucket in self._buckets:
+            bucket.clear()
+
+    def add(self, text: str) -> int:
+        """Index a text (evicting the oldest past `window`). Returns its seq."""
+        words, sig = signature(text or "")
+        seq = self._seq
+        self._seq += 1
+        self._entries[seq] = (text, words, sig)
+        if sig is not None:
+            for bucket, key in zip(self._buckets, _bands(sig)):
+                bucket.setdefault(key, set()).add(seq)
+        while len(self._entries) > self.window:
+            self._evict()
+        return seq
+
+    def _evict(self) -> None:
+        seq, (_, _, sig) = self._entries.popitem(last=False)
+        if sig is None:
+            return
+        for bucket, key in zip(self._buckets, _bands(sig)):
+            members = bucket.get(key)
+            if members is not None:
+                members.discard(seq)
+                if not members:
+                    del bucket[key]
+
+    def query(self, text: str, threshold: float) -> List[Tuple[int, str, float]]:
+        """Recent texts with Jaccard ≥ threshold, newest first.
+
+        Candidates are every entry in a small index, LSH bucket-mates in
+        a big one. Each candidate is scored exactly.
+        """
+        if len(self._entries) < SCAN_BELOW:
+            words = tokenize(text or "").word_set
+            if not words:
+                return []
+            candidates = self._entries
+        else:
+            words, sig = signature(text or "")
+            if sig is None:
+                return []
+            candidates = set()
+            for bucket, key in zip(self._buckets, _bands(sig)):
+                candidates.update(bucket.get(key, ()))
+        hits = []
+        for seq in candidates:
+            stored, other, _ = self._entries[seq]
+            if other:
+                j = len(words & other) / len(words | other)
+                if j >= threshold:
+                    hits.append((seq, stored, j))
+        hits.sort(key=lambda x: x[0], reverse=True)
+        return hits
+
+    def max_overlap(self, text: str) -> float:
+        """Highest exact |A∩B| / min(|A|,|B|) against anything indexed."""
+        words = tokenize(text or "").word_set
+        if not words:
+            return 0.0
+        best = 0.0
+        for _, other, _ in self._entries.values():
+            if other:
+                best = max(best, len(words & other) / min(len(words), len(other)))
+        return best
+
+
+# ============================================================================
+# BENCHMARK — python rilie_neardup.py
+# ============================================================================
+
+def _bench(windows=(5, 50, 500, 5000), queries: int = 500) -> None:
+    import time
+
+    rng = random.Random(3)
+    vocab = [f"w{i}" for i in range(3000)]
+
+    def sentence():
+        return " ".join(rng.choice(vocab) for _ in range(rng.randint(8, 25)))
+
+    print(f"{'window':>7} {'exact us':>9} {'index us':>9} {'overlap us':>11}")
+    for window in windows:
+        history = [sentence() for _ in range(window)]
+        probes = [sentence() for _ in range(queries)]
+        idx = NearDupIndex(window=window)
+        for h in history:
+            idx.add(h)
+        signature.cache_clear()
+        tokenize.cache_clear()
+
+        t0 = time.perf_counter()
+        for p in probes:
+            pw = set(p.split())
+            any(len(pw & set(h.split())) / len(pw | set(h.split())) >= 0.55
+                for h in history)
+        exact = (time.perf_counter() - t0) / queries * 1e6
+
+        t0 = time.perf_counter()
+        for p in probes:
+            idx.query(p, 0.55)
+        indexed = (time.perf_counter() - t0) / queries * 1e6
+
+        t0 = time.perf_counter()
+        for p in probes:
+            idx.max_overlap(p)
+        overlap = (time.perf_counter() - t0) / queries * 1e6
+        print(f"{window:>7} {exact:>9.1f} {indexed:>9.1f} {overlap:>11.1f}")
+
+
+if __name__ == "__main__":
+    _bench()
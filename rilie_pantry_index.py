@@ -0,0 +1,446 @@
+"""
+rilie_pantry_index.py — THE PANTRY'S CARD CATALOG
+==================================================
+
+The Pantry (rilie_outercore.py) is just data. The Kitchen used to walk
+every shelf on every order. This file builds the indexes once, at import,
+so the Kitchen can go straight to the right shelf.
+
+KEYWORD AUTOMATON (detect_domains)
+    DOMAIN_KEYWORDS matching has always been *substring* matching —
+    "rap" fires inside "therapy", "tone" inside "stone". A token map
+    would change who wins, so the index is an Aho-Corasick automaton over
+    every keyword (single words and phrases alike). One left-to-right
+    pass over the stimulus yields every keyword present; each keyword
+    carries its per-domain multiplicity, so domain scores come out
+    identical to the old domains × keywords double loop.
+
+PANTRY INDEX (excavate_domains)
+    A BM25 index per domain over DOMAIN_KNOWLEDGE. Every item is chopped
+    once, its synonyms folded into its terms, and its per-term BM25
+    weight precomputed. The pocket-dictionary enrichment (definition,
+    synonyms, homonyms) is baked into the served text at build time.
+    A query only touches the postings of the words it actually contains,
+    so top-k cost follows the query, not the size of the pantry.
+
+Run this file directly for the benchmarks.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from rilie_tokens import tokenize
+
+
+# ============================================================================
+# KEYWORD AUTOMATON — Aho-Corasick over DOMAIN_KEYWORDS
+# ============================================================================
+
+class KeywordAutomaton:
+    """
+    Multi-pattern substring matcher.
+
+    Built once from {domain: [keyword, ...]}. `scores(text)` returns
+    {domain: hits} where hits counts every keyword of that domain that
+    occurs anywhere in `text` (once per keyword, duplicates in the list
+    counted as often as they appear) — the same number
+    `sum(1 for kw in kws if kw in text)` produces.
+    """
+
+    __slots__ = ("domains", "_goto", "_fail", "_out", "_haystacks")
+
+    def __init__(self, domain_keywords: Mapping[str, Sequence[str]]):
+        self.domains: Tuple[str, ...] = tuple(domain_keywords)
+        # keyword -> {domain: multiplicity}
+        weights: Dict[str, Dict[str, int]] = {}
+        for domain, kws in domain_keywords.items():
+            for kw in kws:
+                per = weights.setdefault(kw, {})
+                per[domain] = per.get(domain, 0) + 1
+
+        # Trie
+        goto: List[Dict[str, int]] = [{}]
+        terminal: List[List[str]] = [[]]
+        for kw in weights:
+            node = 0
+            for ch in kw:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    terminal.append([])
+                node = nxt
+            terminal[node].append(kw)
+
+        # Failure links (BFS) + merged outputs
+        fail = [0] * len(goto)
+        out: List[Tuple[str, ...]] = [()] * len(goto)
+        out[0] = tuple(terminal[0])
+        queue = deque()
+        for ch, nxt in goto[0].items():
+            fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            out[node] = tuple(terminal[node]) + out[fail[node]]
+            for ch, nxt in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                cand = goto[f].get(ch, 0)
+                fail[nxt] = cand if cand != nxt else 0
+                queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        # Outputs resolved to (domain, multiplicity) pairs per keyword
+        self._out = [
+            tuple((kw, tuple(weights[kw].items())) for kw in kws) for kws in out
+        ]
+        # One haystack per domain for the reverse check (word inside keyword).
+        # \x00 never appears in a lowercased word, so `w in haystack` is
+        # exactly `any(w in kw for kw in kws)`.
+        self._haystacks = {
+            d: "\x00".join(kws) for d, kws in domain_keywords.items() if kws
+        }
+
+    def _walk(self, text: str):
+        """Yield the (keyword, per-domain) output tuple at every position."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        yield out[0]
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield out[node]
+
+    def matches(self, text: str) -> Set[str]:
+        """Every keyword that occurs as a substring of `text`."""
+        return {kw for hits in self._walk(text) for kw, _ in hits}
+
+    def scores(self, text: str) -> Dict[str, int]:
+        """{domain: keyword hits} for every domain, in build order."""
+        scores = dict.fromkeys(self.domains, 0)
+        seen: Set[str] = set()
+        for hits in self._walk(text):
+            for kw, per in hits:
+                if kw in seen:
+                    continue
+                seen.add(kw)
+                for d, n in per:
+                    scores[d] += n
+        return scores
+
+    def related_domains(self, word: str) -> Tuple[str, ...]:
+        """
+        Domains with a keyword that contains `word` or is contained in it.
+        The holy-trinity boost check, without the domains × keywords loop.
+        Memoized — trinity words repeat across the passes of a turn.
+        """
+        return _related_domains(self, word)
+
+
+@lru_cache(maxsize=2048)
+def _related_domains(automaton: KeywordAutomaton, word: str) -> Tuple[str, ...]:
+    inside = {d for hits in automaton._walk(word) for _, per in hits for d, _ in per}
+    return tuple(
+        d for d, hay in automaton._haystacks.items()
+        if d in inside or word in hay
+    )
+
+
+# ============================================================================
+# PANTRY INDEX — BM25 over DOMAIN_KNOWLEDGE
+# ============================================================================
+
+# Sub-domain name appearing in the stimulus — same +2 the old loop gave.
+SUB_RELEVANCE_BOOST = 2.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def enrich_item(
+    item: str,
+    definitions: Mapping[str, str],
+    synonyms: Mapping[str, Sequence[str]],
+    homonyms: Mapping[str, Sequence[str]],
+) -> str:
+    """Pocket-dictionary enrichment for short items (under 5 words)."""
+    if len(item.split()) >= 5:
+        return item
+    word = item.strip().lower()
+    definition = definitions.get(word, "")
+    syns = synonyms.get(word, [])
+    homs = homonyms.get(word, [])
+    parts = [item]
+    if definition:
+        parts.append(definition)
+    if syns:
+        parts.append("also: " + ", ".join(syns[:4]))
+    if homs:
+        parts.append("other meanings: " + "; ".join(homs[:3]))
+    return " — ".join(parts)
+
+
+class _Shelf:
+    """One domain's slice of the pantry, fully precomputed."""
+
+    __slots__ = ("enriched", "postings", "sub_docs", "sub_automaton")
+
+    def __init__(
+        self,
+        subdomains: Mapping[str, Sequence[str]],
+        definitions: Mapping[str, str],
+        synonyms: Mapping[str, Sequence[str]],
+        homonyms: Mapping[str, Sequence[str]],
+        k1: float,
+        b: float,
+    ):
+        enriched: List[str] = []
+        doc_terms: List[Dict[str, int]] = []
+        sub_docs: Dict[str, List[int]] = {}
+        for sub_key, items in subdomains.items():
+            ids = sub_docs.setdefault(sub_key.lower(), [])
+            for item in items:
+                ids.append(len(enriched))
+                enriched.append(
+                    enrich_item(item, definitions, synonyms, homonyms))
+                # Item words + their synonyms, folded in at index time
+                terms: Dict[str, int] = {}
+                words = list(tokenize(item).words)
+                for key in [item.strip().lower()] + words:
+                    for syn in synonyms.get(key, ()):
+                        words.extend(tokenize(syn).words)
+                for w in words:
+                    terms[w] = terms.get(w, 0) + 1
+                doc_terms.append(terms)
+
+        n = len(doc_terms)
+        lengths = [sum(t.values()) for t in doc_terms]
+        avgdl = (sum(lengths) / n) if n else 1.0
+        df: Dict[str, int] = {}
+        for terms in doc_terms:
+            for w in terms:
+                df[w] = df.get(w, 0) + 1
+
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc, terms in enumerate(doc_terms):
+            norm = k1 * (1 - b + b * lengths[doc] / max(avgdl, 1e-9))
+            for w, tf in terms.items():
+                idf = math.log(1 + (n - df[w] + 0.5) / (df[w] + 0.5))
+                postings.setdefault(w, []).append(
+                    (doc, idf * tf * (k1 + 1) / (tf + norm)))
+
+        self.enriched: Tuple[str, ...] = tuple(enriched)
+        self.postings = {w: tuple(p) for w, p in postings.items()}
+        self.sub_docs = {k: tuple(v) for k, v in sub_docs.items()}
+        self.sub_automaton = KeywordAutomaton({k: [k] for k in sub_docs})
+
+
+class PantryIndex:
+    """
+    BM25 retrieval over DOMAIN_KNOWLEDGE, one shelf per domain.
+
+    top_k(domain, stimulus) returns enriched items: the k best by
+    sub-domain boost + BM25, padded in pantry order when fewer than k
+    score, plus one random pick from the rest for flavor — the same
+    shape excavate_domains has always served.
+    """
+
+    __slots__ = ("_shelves",)
+
+    def __init__(
+        self,
+        knowledge: Mapping[str, Mapping[str, Sequence[str]]],
+        definitions: Mapping[str, str],
+        synonyms: Mapping[str, Sequence[str]],
+        homonyms: Mapping[str, Sequence[str]],
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+    ):
+        self._shelves: Dict[str, _Shelf] = {
+            domain: _Shelf(subs, definitions, synonyms, homonyms, k1, b)
+            for domain, subs in knowledge.items()
+        }
+
+    def __contains__(self, domain: str) -> bool:
+        return domain in self._shelves
+
+    def top_k(
+        self,
+        domain: str,
+        stimulus: str,
+        k: int = 4,
+        rng: Optional[random.Random] = None,
+    ) -> List[str]:
+        shelf = self._shelves.get(domain)
+        if shelf is None or not shelf.enriched:
+            return []
+        tok = tokenize(stimulus or "")
+
+        scores: Dict[int, float] = {}
+        for w in tok.word_set:
+            for doc, weight in shelf.postings.get(w, ()):
+                scores[doc] = scores.get(doc, 0.0) + weight
+        for sub_key in shelf.sub_automaton.matches(tok.lower):
+            for doc in shelf.sub_docs[sub_key]:
+                scores[doc] = scores.get(doc, 0.0) + SUB_RELEVANCE_BOOST
+
+        top = [doc for doc, _ in heapq.nsmallest(
+            k, scores.items(), key=lambda x: (-x[1], x[0]))]
+        # Nothing (or not enough) scored — pad in pantry order
+        if len(top) < k:
+            chosen = set(top)
+            for doc in range(len(shelf.enriched)):
+                if len(top) >= k:
+                    break
+                if doc not in chosen:
+                    top.append(doc)
+
+        n = len(shelf.enriched)
+        if n > len(top):
+            rng = rng or random
+            chosen = set(top)
+            while True:
+                doc = rng.randrange(n)
+                if doc not in chosen:
+                    top.append(doc)
+                    break
+        return [shelf.enriched[doc] for doc in top]
+
+
+# ============================================================================
+# BENCHMARK — python rilie_pantry_index.py
+# ============================================================================
+
+def _bench_detect(scales: Iterable[int] = (1, 10, 100), reps: int = 2000) -> None:
+    import random
+    import time
+
+    from rilie_outercore import DOMAIN_KEYWORDS
+
+    rng = random.Random(11)
+    stimuli = [
+        "why does the rhythm of hip hop feel like entropy in a quantum field?",
+        "tell me about trust, cooperation and the prisoner dilemma in politics",
+        "how does cancer evolve when the immune system loses the signal",
+        "what's the best way to cook a roux without burning it",
+    ]
+
+    def grow(factor: int) -> Dict[str, List[str]]:
+        if factor == 1:
+            return {d: list(k) for d, k in DOMAIN_KEYWORDS.items()}
+        alphabet = "abcdefghijklmnopqrstuvwxyz"
+        grown = {}
+        for d, kws in DOMAIN_KEYWORDS.items():
+            extra = [
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(5, 10)))
+                for _ in range(len(kws) * (factor - 1))
+            ]
+            grown[d] = list(kws) + extra
+        return grown
+
+    print(f"{'vocab':>8} {'linear us':>10} {'automaton us':>13} {'build ms':>9}")
+    for factor in scales:
+        kw = grow(factor)
+        vocab = sum(len(v) for v in kw.values())
+        t0 = time.perf_counter()
+        automaton = KeywordAutomaton(kw)
+        build_ms = (time.perf_counter() - t0) * 1e3
+
+        t0 = time.perf_counter()
+        for i in range(reps):
+            sl = stimuli[i % len(stimuli)]
+            {d: sum(1 for k in ks if k in sl) for d, ks in kw.items()}
+        linear = (time.perf_counter() - t0) / reps * 1e6
+
+        t0 = time.perf_counter()
+        for i in range(reps):
+            automaton.scores(stimuli[i % len(stimuli)])
+        indexed = (time.perf_counter() - t0) / reps * 1e6
+
+        for sl in stimuli:
+            assert automaton.scores(sl) == {
+                d: sum(1 for k in ks if k in sl) for d, ks in kw.items()
+            }
+        print(f"{vocab:>8} {linear:>10.1f} {indexed:>13.1f} {build_ms:>9.1f}")
+
+
+def _bench_excavate(scales: Iterable[int] = (1, 10, 100), reps: int = 500) -> None:
+    import time
+
+    from rilie_outercore import (
+        DOMAIN_KNOWLEDGE, WORD_DEFINITIONS, WORD_SYNONYMS, WORD_HOMONYMS,
+    )
+
+    rng = random.Random(13)
+    stimulus = "why does the rhythm and tension of satire feel like truth"
+    domains = list(DOMAIN_KNOWLEDGE)[:4]
+    vocab = sorted({w for subs in DOMAIN_KNOWLEDGE.values()
+                    for items in subs.values() for i in items
+                    for w in i.lower().split()})
+
+    def grow(factor: int):
+        grown = {}
+        for d, subs in DOMAIN_KNOWLEDGE.items():
+            grown[d] = {}
+            for sub, items in subs.items():
+                extra = [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 6)))
+                         for _ in range(len(items) * (factor - 1))]
+                grown[d][sub] = list(items) + extra
+        return grown
+
+    def legacy(knowledge):
+        # The pre-index excavate_domains loop (scan + per-call enrichment)
+        sl = stimulus.lower()
+        out = {}
+        for domain in domains:
+            sub_items = []
+            for sub_key, items in knowledge[domain].items():
+                sub_relevance = 1 if sub_key.lower() in sl else 0
+                for item in items:
+                    overlap = len(set(item.lower().split()) & set(sl.split()))
+                    sub_items.append((sub_relevance * 2 + overlap, item))
+            sub_items.sort(key=lambda x: x[0], reverse=True)
+            top = [item for _, item in sub_items[:4]]
+            if sub_items[4:]:
+                top.append(rng.choice(sub_items[4:])[1])
+            out[domain] = [enrich_item(i, WORD_DEFINITIONS, WORD_SYNONYMS,
+                                       WORD_HOMONYMS) for i in top]
+        return out
+
+    print(f"{'items':>8} {'linear us':>10} {'bm25 us':>9} {'build ms':>9}")
+    for factor in scales:
+        knowledge = grow(factor)
+        items = sum(len(v) for subs in knowledge.values() for v in subs.values())
+        t0 = time.perf_counter()
+        index = PantryIndex(knowledge, WORD_DEFINITIONS, WORD_SYNONYMS,
+                            WORD_HOMONYMS)
+        build_ms = (time.perf_counter() - t0) * 1e3
+
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            legacy(knowledge)
+        linear = (time.perf_counter() - t0) / reps * 1e6
+
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            for d in domains:
+                index.top_k(d, stimulus, rng=rng)
+        indexed = (time.perf_counter() - t0) / reps * 1e6
+        print(f"{items:>8} {linear:>10.1f} {indexed:>9.1f} {build_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    _bench_detect()
+    print()
+    _bench_excavate()
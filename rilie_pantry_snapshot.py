@@ -0,0 +1,219 @@
+"""
+rilie_pantry_snapshot.py — THE PANTRY, VACUUM-SEALED
+=====================================================
+
+rilie_outercore.py is the source of truth: plain dict literals, easy to
+edit. But every gunicorn worker used to evaluate all of it at import and
+then rebuild every derived table (keyword automaton, BM25 shelves,
+enrichment) on top of it.
+
+This file compiles the pantry ONCE into a frozen snapshot:
+
+    python rilie_pantry_snapshot.py build     # at deploy, before workers
+    python rilie_pantry_snapshot.py report    # startup time + RSS per worker
+
+The snapshot holds the raw tables (lists frozen to tuples, strings
+interned so every repeat is one shared object) plus the prebuilt
+KeywordAutomaton and PantryIndex. It is stamped with a fingerprint of
+the bytes of rilie_outercore.py and of the code that builds the indexes;
+edit either and the old snapshot is ignored until rebuilt.
+
+Workers call load_pantry(). Fresh snapshot → unpickle, never touch
+rilie_outercore. Missing or stale → compile in-process, same result,
+just slower. Nothing breaks without the file.
+
+Env:
+    RILIE_PANTRY_SNAPSHOT — snapshot path (default: next to this file)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from rilie_pantry_index import KeywordAutomaton, PantryIndex
+
+logger = logging.getLogger("rilie_pantry_snapshot")
+
+SNAPSHOT_VERSION = 1
+
+_HERE = Path(__file__).resolve().parent
+# Anything whose edit changes what the snapshot should contain.
+PANTRY_SOURCES = tuple(
+    _HERE / name
+    for name in ("rilie_outercore.py", "rilie_pantry_index.py", "rilie_tokens.py")
+)
+SNAPSHOT_PATH = Path(
+    os.getenv("RILIE_PANTRY_SNAPSHOT", str(_HERE / "rilie_pantry.snapshot"))
+)
+
+
+@dataclass(frozen=True)
+class CompiledPantry:
+    """Everything the Kitchen reads from the Pantry, precomputed."""
+    fingerprint: str
+    consciousness_tracks: Dict[str, Dict[str, str]]
+    priority_hierarchy: Dict[str, Dict[str, Any]]
+    domain_knowledge: Dict[str, Dict[str, Tuple[str, ...]]]
+    domain_keywords: Dict[str, Tuple[str, ...]]
+    word_definitions: Dict[str, str]
+    word_synonyms: Dict[str, Tuple[str, ...]]
+    word_homonyms: Dict[str, Tuple[str, ...]]
+    keyword_automaton: KeywordAutomaton
+    pantry_index: PantryIndex
+
+
+def pantry_fingerprint(sources: Tuple[Path, ...] = PANTRY_SOURCES) -> str:
+    """Snapshot version + hash of the pantry and index source bytes."""
+    h = hashlib.sha256()
+    for source in sources:
+        h.update(source.read_bytes())
+    return f"v{SNAPSHOT_VERSION}:{h.hexdigest()[:16]}"
+
+
+def _freeze(value: Any) -> Any:
+    """Lists → tuples, strings interned, dicts rebuilt with interned keys."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: _freeze(v)
+                for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def compile_pantry(fingerprint: Optional[str] = None) -> CompiledPantry:
+    """Evaluate rilie_outercore and build every derived table from it."""
+    import rilie_outercore as oc
+
+    knowledge = _freeze(oc.DOMAIN_KNOWLEDGE)
+    keywords = _freeze(oc.DOMAIN_KEYWORDS)
+    definitions = _freeze(oc.WORD_DEFINITIONS)
+    synonyms = _freeze(oc.WORD_SYNONYMS)
+    homonyms = _freeze(oc.WORD_HOMONYMS)
+    return CompiledPantry(
+        fingerprint=fingerprint or pantry_fingerprint(),
+        consciousness_tracks=_freeze(oc.CONSCIOUSNESS_TRACKS),
+        priority_hierarchy=_freeze(oc.PRIORITY_HIERARCHY),
+        domain_knowledge=knowledge,
+        domain_keywords=keywords,
+        word_definitions=definitions,
+        word_synonyms=synonyms,
+        word_homonyms=homonyms,
+        keyword_automaton=KeywordAutomaton(keywords),
+        pantry_index=PantryIndex(knowledge, definitions, synonyms, homonyms),
+    )
+
+
+def build_snapshot(path: Path = SNAPSHOT_PATH) -> CompiledPantry:
+    """Compile and publish the snapshot (write tmp, then atomic rename)."""
+    pantry = compile_pantry()
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        pickle.dump(pantry, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    logger.info("Pantry snapshot written: %s (%s)", path, pantry.fingerprint)
+    return pantry
+
+
+def _read_snapshot(path: Path, fingerprint: str) -> Optional[CompiledPantry]:
+    try:
+        with open(path, "rb") as fh:
+            pantry = pickle.load(fh)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Pantry snapshot unreadable (%s) — compiling: %s", path, e)
+        return None
+    if not isinstance(pantry, CompiledPantry) or pantry.fingerprint != fingerprint:
+        logger.info("Pantry snapshot stale (%s) — compiling in-process", path)
+        return None
+    return pantry
+
+
+_loaded: Optional[CompiledPantry] = None
+
+
+def load_pantry(path: Optional[Path] = None) -> CompiledPantry:
+    """The Kitchen's one way in. Snapshot if fresh, else compile. Memoized."""
+    global _loaded
+    if _loaded is not None and path is None:
+        return _loaded
+    fingerprint = pantry_fingerprint()
+    pantry = _read_snapshot(Path(path or SNAPSHOT_PATH), fingerprint)
+    if pantry is None:
+        pantry = compile_pantry(fingerprint)
+    if path is None:
+        _loaded = pantry
+    return pantry
+
+
+# ============================================================================
+# CLI — build / report
+# ============================================================================
+
+_PROBE = """
+import os, time
+import rilie_pantry_snapshot as s
+def rss_kib():
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+before = rss_kib()
+t0 = time.perf_counter()
+{body}
+ms = (time.perf_counter() - t0) * 1e3
+print(ms, rss_kib() - before)
+"""
+
+
+def _probe(body: str) -> Tuple[float, int]:
+    import subprocess
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(body=body)],
+        cwd=str(_HERE), capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(out[-2]), int(out[-1])
+
+
+def report(runs: int = 7) -> None:
+    """Per-worker cost of getting the pantry: snapshot vs in-process compile.
+
+    Each case runs in a fresh interpreter (a cold worker). Linux only —
+    RSS growth is read from /proc/self/statm around the load.
+    """
+    if not SNAPSHOT_PATH.exists():
+        build_snapshot()
+
+    cases = {
+        "compile": "s.load_pantry(s.Path('/nonexistent'))",
+        "snapshot": "s.load_pantry()",
+    }
+    print(f"{'':>10} {'load ms':>8} {'RSS +KiB':>9}")
+    for label, body in cases.items():
+        samples = sorted(_probe(body) for _ in range(runs))
+        ms, rss = samples[len(samples) // 2]
+        print(f"{label:>10} {ms:>8.2f} {rss:>9}")
+    print(f"snapshot file: {SNAPSHOT_PATH.stat().st_size / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    # Re-import by name so pickled classes resolve to rilie_pantry_snapshot,
+    # not __main__.
+    import rilie_pantry_snapshot as _snap
+
+    logging.basicConfig(level=logging.INFO)
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if cmd == "build":
+        _snap.build_snapshot()
+    elif cmd == "report":
+        _snap.report()
+    else:
+        sys.exit(f"usage: {sys.argv[0]} [build|report]")
@@ -24,14 +24,15 @@ from rilie_foundation import (
     _extract_original_question,
     _fix_mojibake,
     _maybe_lookup_unknown_reference,
-    _measurestick,
     _scrub_repetition,
     _search_banks_if_available,
-    _store_measurestick_signal,
     extract_tangents,
     hash_stimulus,
 )
 
+# Measurestick: sampled, off the request path
+from rilie_measurestick import offer as measurestick_offer
+
 # Triangle: Gate 0 safety checks
 from rilie_triangle import (
     triangle_check,
@@ -46,6 +47,8 @@ from rilie_ddd import (
 )
 
 # InnerCore: Kitchen & pipeline (through shim)
+from rilie_tokens import tokenize, jaccard
+
 from rilie_innercore import (
     CHOMSKY_AVAILABLE,
     LIMO_AVAILABLE,
@@ -108,21 +111,22 @@ class RILIE:
         self.version = "4.2.0"
         self.tracks_experienced = 0
 
-        # Conversation state lives across turns per RILIE instance.
+        # Conversation state for the session being served. Swapped in
+        # and out of the session row by session.restore_guvna_state /
+        # snapshot_guvna_state; bounded either way.
         self.conversation = ConversationState()
 
         # Person model — what she learns about the user.
         self.person = PersonModel()
 
+        # Whose turn this is — keys per-session state like BJJ health.
+        # Set per request by session.restore_guvna_state.
+        self.session_id: Optional[str] = None
+
         # NOTE: Tier-3 Person snapshot lives in ConversationMemory.
         # Guvna is responsible for calling conversation_memory.summarize_person_model()
         # and can pass that snapshot down to DDD / shape_for_disclosure as needed.
 
-        # Déjà vu tracking — lightweight, no escalation.
-        self._dejavu_cluster: str = ""
-        self._dejavu_count: int = 0
-        self._dejavu_responses: List[str] = []
-
         # Offline 9-track Roux (RInitials / ROUX.json) would be wired here if used.
         self.rouxseeds: Dict[str, Dict[str, Any]] = rouxseeds or {}
 
@@ -257,7 +261,8 @@ class RILIE:
         # Gate 0: Triangle (Bouncer)
         # ------------------------------------------------------------------
         triggered, reason, trigger_type = triangle_check(
-            original_question, self.conversation.stimuli_history
+            original_question, self.conversation.stimuli_history,
+            session_id=self.session_id,
         )
 
         # File uploads can discuss "root access", "admin mode" etc.
@@ -373,8 +378,10 @@ class RILIE:
         if dejavu_hit >= 3:
             context = self._classify_dejavu_context(original_question)
             response = self._dejavu_one_swing(original_question, context)
-            self.conversation.record_exchange(original_question, response)
-            self._dejavu_responses.append(response)
+            self.conversation.record_dejavu_exchange(
+                original_question, response,
+                {"status": "DEJAVU", "quality_score": 0.5, "priorities_met": 1},
+            )
             return {
                 "stimulus": stimulus,
                 "result": response,
@@ -475,6 +482,7 @@ class RILIE:
             disclosure_level=disclosure.value,
             max_pass=maxpass_int,
             prior_responses=self.conversation.response_history,
+            prior_index=self.conversation.response_index,
             baseline_text=baseline_text,
             precision_override=precision_override or facts_first,
             baseline_score_boost=baseline_score_boost,
@@ -584,7 +592,6 @@ class RILIE:
         # QUALITY SIGNAL: MEASURESTICK (informer, not gate)
         # RILIE's voice is ALWAYS served first.
         # MEASURESTICK annotates. Guvna governs.
-        measure: Dict[str, Any] = {}
         if (
             disclosure.value != "taste"
             and shaped
@@ -606,37 +613,14 @@ class RILIE:
                 logger.debug("Chomsky annotation error: %s", e)
 
             # --- MEASURESTICK — 3-dimension quality signal ---
+            # Sampled and measured off the request path; the metric is
+            # read back offline (banks.get_measurestick_stats).
             if active_search and baseline_text.strip():
-                try:
-                    measure = _measurestick(shaped, original_question, active_search)
-                    logger.info(
-                        "MEASURESTICK: recommendation=%s relevance=%.2f originality=%.2f coherence=%.2f hits=%d",
-                        measure.get("recommendation", "?"),
-                        measure.get("relevance", 0),
-                        measure.get("originality", 0),
-                        measure.get("coherence", 0),
-                        measure.get("google_hits", -1),
-                    )
-
-                    # Store signal for learning (not punishment)
-                    _store_measurestick_signal(
-                        stimulus=original_question,
-                        rilie_response=shaped,
-                        baseline_response=baseline_text,
-                        measure=measure,
-                    )
-
-                    # MEASURESTICK observes but does NOT override.
-                    # Kitchen's answer stands. Baseline is emergency parachute only (when Kitchen empty).
-                    # If Kitchen produced something, serve it. Quality gates are Inside the Kitchen, not after.
-                    raw["measurestick"] = measure
-                    logger.info(
-                        "MEASURESTICK: signal logged — recommendation=%s (Kitchen response preserved)",
-                        measure.get("recommendation", "?"),
-                    )
-
-                except Exception as e:
-                    logger.debug("Measurestick error: %s", e)
+                raw["measurestick"] = {
+                    "sampled": measurestick_offer(
+                        original_question, shaped, baseline_text, active_search
+                    ),
+                }
 
         # Record what she actually said
         self.conversation.record_exchange(original_question, shaped)
@@ -667,51 +651,31 @@ class RILIE:
         Is this stimulus ~identical to recent ones?
         Returns the count (0 = fresh, 1+ = repeat).
         Uses simple word overlap — not fancy, just honest.
+        Recent stimuli come from the conversation's near-dup index, and
+        the cluster lives on the conversation, so it is per session.
         """
-        s_words = set(
-            re.sub(r"[^a-zA-Z0-9\s]", "", stimulus.lower()).split()
-        )
-        if not s_words:
+        if not tokenize(stimulus).word_set:
             return 0
+        conv = self.conversation
 
         # Check against current cluster
-        if self._dejavu_cluster:
-            c_words = set(
-                re.sub(
-                    r"[^a-zA-Z0-9\s]",
-                    "",
-                    self._dejavu_cluster.lower(),
-                ).split()
-            )
-            if c_words:
-                overlap = len(s_words & c_words) / max(
-                    len(s_words | c_words), 1
-                )
-                if overlap >= threshold:
-                    self._dejavu_count += 1
-                    return self._dejavu_count
-
-        # Check against last 5 stimuli
-        recent = self.conversation.stimuli_history[-5:]
-        for prev in reversed(recent):
-            p_words = set(
-                re.sub(r"[^a-zA-Z0-9\s]", "", prev.lower()).split()
-            )
-            if not p_words:
-                continue
-            overlap = len(s_words & p_words) / max(
-                len(s_words | p_words), 1
-            )
-            if overlap >= threshold:
-                self._dejavu_cluster = prev
-                self._dejavu_count = 1
-                self._dejavu_responses = []
-                return self._dejavu_count
+        if conv.dejavu_cluster_stimulus:
+            if jaccard(stimulus, conv.dejavu_cluster_stimulus) >= threshold:
+                conv.dejavu_count += 1
+                return conv.dejavu_count
+
+        # Check against recent stimuli
+        hits = conv.stimulus_index.query(stimulus, threshold)
+        if hits:
+            conv.dejavu_cluster_stimulus = hits[0][1]
+            conv.dejavu_count = 1
+            conv.dejavu_last_envelopes = []
+            return conv.dejavu_count
 
         # Fresh — reset
-        self._dejavu_cluster = ""
-        self._dejavu_count = 0
-        self._dejavu_responses = []
+        conv.dejavu_cluster_stimulus = ""
+        conv.dejavu_count = 0
+        conv.dejavu_last_envelopes = []
         return 0
 
     def _classify_dejavu_context(self, stimulus: str) -> str:
@@ -719,7 +683,7 @@ class RILIE:
         WHY is this repeating? Look at what she said before.
         Returns: "explain" | "wrong" | "loop"
         """
-        prev_responses = self._dejavu_responses
+        prev_responses = self.conversation.dejavu_last_envelopes
         s_lower = stimulus.lower()
 
         # Context 2: Wrong output — stimulus contains correction signals
@@ -820,9 +784,6 @@ class RILIE:
         """Start a new conversation. New customer at the restaurant."""
         self.conversation = ConversationState()
         self.person = PersonModel()
-        self._dejavu_cluster = ""
-        self._dejavu_count = 0
-        self._dejavu_responses = []
 
     def get_person_summary(self) -> Dict[str, Any]:
         """What does RILIE know about this user? For API/debug exposure."""
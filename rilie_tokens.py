@@ -0,0 +1,222 @@
+"""
+rilie_tokens.py — MISE EN PLACE FOR WORDS
+==========================================
+
+Chop once. Cook many times.
+
+Every gate, every dejavu check, every overlap score used to re-chop the
+same string with its own knife. This file is the one cutting board:
+
+    tokenize(text) -> TokenizedText
+
+TokenizedText keeps the lowercased string, the word list, the word set
+and stopword-filtered sets. Each view is built lazily the first time
+somebody asks for it, then reused. tokenize() itself is memoized on the
+string, so the stimulus and each candidate plate get chopped once per
+turn no matter how many gates look at them.
+
+Views:
+    lower      — text.lower()
+    words      — punctuation stripped, lowercased words (the dejavu/talk cut)
+    word_set   — frozenset(words)
+    split      — plain whitespace split of `lower` (word counts)
+    lexemes    — case-preserving words + sentence punctuation (meaning.py cut)
+    content_set(stopwords) — word_set minus a stopword set, cached per set
+
+Run this file directly for the before/after measurement.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Tuple
+
+_STRIP_RE = re.compile(r"[^a-zA-Z0-9\s]")
+_LEXEME_RE = re.compile(r"[\w']+|[?!.,;:]")
+
+# Noise words that don't indicate relevance (TALK's original list).
+NOISE_WORDS: FrozenSet[str] = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "i", "you", "it",
+    "to", "in", "on", "of", "and", "or", "but", "that", "this",
+    "what", "how", "why", "who", "when", "where", "do", "does",
+    "can", "my", "your", "me", "we", "they", "he", "she", "its",
+    "not", "no", "yes", "so", "if", "for", "with", "at", "from",
+    "be", "have", "has", "had", "will", "would", "could", "should",
+})
+
+# How many distinct strings stay chopped. A turn touches maybe a few
+# dozen (stimulus, nine candidates x passes, history, baseline snippets).
+TOKEN_CACHE_SIZE = 4096
+
+
+class TokenizedText:
+    """One string, chopped once. All views are lazy and cached."""
+
+    __slots__ = ("text", "_lower", "_words", "_word_set", "_split",
+                 "_lexemes", "_content")
+
+    def __init__(self, text: str):
+        self.text = text or ""
+        self._lower: Optional[str] = None
+        self._words: Optional[Tuple[str, ...]] = None
+        self._word_set: Optional[FrozenSet[str]] = None
+        self._split: Optional[Tuple[str, ...]] = None
+        self._lexemes: Optional[Tuple[str, ...]] = None
+        self._content: Optional[Dict[FrozenSet[str], FrozenSet[str]]] = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        if self._words is None:
+            self._words = tuple(_STRIP_RE.sub("", self.lower).split())
+        return self._words
+
+    @property
+    def word_set(self) -> FrozenSet[str]:
+        if self._word_set is None:
+            self._word_set = frozenset(self.words)
+        return self._word_set
+
+    @property
+    def split(self) -> Tuple[str, ...]:
+        if self._split is None:
+            self._split = tuple(self.lower.split())
+        return self._split
+
+    @property
+    def lexemes(self) -> Tuple[str, ...]:
+        if self._lexemes is None:
+            self._lexemes = tuple(_LEXEME_RE.findall(self.text.strip()))
+        return self._lexemes
+
+    def content_set(self, stopwords: FrozenSet[str] = NOISE_WORDS) -> FrozenSet[str]:
+        """word_set minus stopwords. Cached per stopword set."""
+        if self._content is None:
+            self._content = {}
+        cached = self._content.get(stopwords)
+        if cached is None:
+            cached = self.word_set - stopwords
+            self._content[stopwords] = cached
+        return cached
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __repr__(self) -> str:
+        return f"TokenizedText({self.text[:40]!r})"
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def tokenize(text: str) -> TokenizedText:
+    """The one cutting board. Same string in → same TokenizedText out."""
+    return TokenizedText(text)
+
+
+def word_overlap(a: str, b: str) -> float:
+    """Overlap coefficient |A∩B| / min(|A|,|B|) on word sets, 0.0-1.0."""
+    wa = tokenize(a).word_set
+    wb = tokenize(b).word_set
+    smaller = min(len(wa), len(wb))
+    if not smaller:
+        return 0.0
+    return len(wa & wb) / smaller
+
+
+def jaccard(a: str, b: str) -> float:
+    """Jaccard similarity on word sets, 0.0-1.0."""
+    wa = tokenize(a).word_set
+    wb = tokenize(b).word_set
+    if not wa or not wb:
+        return 0.0
+    return len(wa & wb) / len(wa | wb)
+
+
+# ============================================================================
+# MEASUREMENT — python rilie_tokens.py
+# ============================================================================
+
+def _legacy_turn(stimulus: str, candidates, history) -> int:
+    """One turn the old way: every site re-chops its own copy."""
+    def _w(t):
+        return set(re.sub(r"[^a-zA-Z0-9\s]", "", t.lower()).split())
+    hits = 0
+    prior = [_w(h) for h in history]
+    for c in candidates:
+        for _ in range(2):  # run_pass_pipeline checked dejavu twice
+            cw = _w(c)
+            hits += sum(1 for p in prior if cw & p)
+    for c in candidates[:3]:  # talk gates: relevance + originality
+        hits += len(_w(stimulus) & _w(c))
+        hits += len(_w(c))
+    for h in history:  # hostess dejavu
+        hits += len(_w(stimulus) & _w(h))
+    return hits
+
+
+def _shared_turn(stimulus: str, candidates, history) -> int:
+    """Same turn through the shared cutting board."""
+    hits = 0
+    prior = [tokenize(h).word_set for h in history]
+    for c in candidates:
+        cw = tokenize(c).word_set
+        hits += sum(1 for p in prior if cw & p)
+        hits += sum(1 for p in prior if cw & p)
+    st = tokenize(stimulus).word_set
+    for c in candidates[:3]:
+        hits += len(st & tokenize(c).word_set)
+        hits += len(tokenize(c).word_set)
+    for h in history:
+        hits += len(st & tokenize(h).word_set)
+    return hits
+
+
+def _measure(turns: int = 2000) -> None:
+    import random as _random
+    import time as _time
+    import tracemalloc
+
+    vocab = ("jazz harmony rhythm improvisation structure signal noise "
+             "meaning pattern emergence groove chord scale tempo swing "
+             "question answer kitchen flavor sauce roux spice heat").split()
+    rng = _random.Random(7)
+
+    def sentence(n):
+        return " ".join(rng.choice(vocab) for _ in range(n)) + "."
+
+    # Fresh strings every turn — savings come from within-turn reuse only.
+    corpus = [
+        (sentence(12), [sentence(30) for _ in range(9)],
+         [sentence(25) for _ in range(5)])
+        for _ in range(turns)
+    ]
+
+    for label, fn in (("legacy", _legacy_turn), ("shared", _shared_turn)):
+        # CPU: steady state, cache bounded as in production.
+        tokenize.cache_clear()
+        t0 = _time.perf_counter()
+        for stimulus, candidates, history in corpus:
+            fn(stimulus, candidates, history)
+        per_turn_us = (_time.perf_counter() - t0) / turns * 1e6
+
+        # Memory: peak live bytes inside one turn, cache emptied
+        # between turns so retained entries don't count against either side.
+        allocated = 0
+        for stimulus, candidates, history in corpus[:200]:
+            tokenize.cache_clear()
+            tracemalloc.start()
+            fn(stimulus, candidates, history)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            allocated += peak
+        print(f"{label:>6}: {per_turn_us:8.1f} us/turn   "
+              f"peak live {allocated / 200 / 1024:6.1f} KiB/turn")
+
+
+if __name__ == "__main__":
+    _measure()
@@ -0,0 +1,266 @@
+"""
+rilie_wilden.py — WILDEN-SWIFT, BY THE TRAY
+============================================
+
+guvna_tools.wilden_swift_score grades one plate: lowercase it, split it,
+then walk 18 modes' worth of substring checks. That is fine for the one
+plate TALK serves, and too slow to grade every candidate the Kitchen
+cooked, so nobody did.
+
+This file grades a whole tray in one go:
+
+    matrix = mode_matrix(texts)     # (n, 18) float64, WILDEN_SWIFT_MODES order
+    totals = total_scores(matrix)   # what wilden_swift_score calls total_score
+    order = rank(texts)             # best-first indices
+
+The tray is lowercased once and joined into one string. Each signal
+phrase is searched over the whole tray in C, hopping to the next
+candidate after every hit, so Python only runs per (phrase, candidate)
+hit. The tray as a fixed-width numpy string array, viewed as a
+codepoint matrix, gives word starts, word counts, commas and
+alliteration with no per-word Python. Distinct words are one C-level
+set per candidate.
+
+The rules and phrase tables are guvna_tools', so score_batch(texts)[i]
+equals wilden_swift_score(texts[i]) exactly. The benchmark checks that
+on every run.
+
+Run this file directly for the throughput numbers.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from guvna_tools import WILDEN_SWIFT_MODES, WILDEN_SWIFT_SIGNALS
+
+# str.split() whitespace, as a lookup table. Nothing above U+3000 counts.
+_WS_TOP = 0x3000
+_IS_SPACE = np.array([chr(c).isspace() for c in range(_WS_TOP + 1)], dtype=bool)
+_COMMA = ord(",")
+
+# Every distinct phrase gets one column in the presence matrix.
+_PHRASES: List[str] = list(dict.fromkeys(
+    phrase
+    for group, phrases in WILDEN_SWIFT_SIGNALS.items()
+    if group != "template_starts"
+    for phrase in phrases
+))
+_COLUMN = {phrase: j for j, phrase in enumerate(_PHRASES)}
+_GROUP_NAMES = [g for g in WILDEN_SWIFT_SIGNALS if g != "template_starts"]
+_GROUP = {g: k for k, g in enumerate(_GROUP_NAMES)}
+
+# Phrase -> signal group membership. presence @ _MEMBERSHIP counts, per
+# candidate, how many distinct phrases of each group it contains.
+_MEMBERSHIP = np.zeros((len(_PHRASES), len(_GROUP_NAMES)), dtype=np.int32)
+for _g in _GROUP_NAMES:
+    for _p in WILDEN_SWIFT_SIGNALS[_g]:
+        _MEMBERSHIP[_COLUMN[_p], _GROUP[_g]] = 1
+
+# Modes that are one score or another: (score if the condition holds, else).
+# fun and soulful scale with hit counts instead.
+_BINARY = {
+    "literal": (0.8, 0.2), "analogous": (0.9, 0.1), "metaphorical": (0.9, 0.1),
+    "simile": (0.9, 0.1), "alliteration": (0.8, 0.1), "wit": (0.8, 0.2),
+    "clever": (0.7, 0.2), "wordplay": (0.6, 0.2), "pun": (0.1, 0.1),
+    "absurd": (0.7, 0.1), "paradoxical": (0.8, 0.1), "funny": (0.7, 0.1),
+    "original": (0.8, 0.2), "allegory": (0.7, 0.1), "story": (0.7, 0.1),
+    "poetic": (0.7, 0.2),
+}
+_BINARY_COLUMNS = [WILDEN_SWIFT_MODES.index(m) for m in _BINARY]
+_BINARY_YES = np.array([yes for yes, _ in _BINARY.values()])
+_BINARY_NO = np.array([no for _, no in _BINARY.values()])
+_FUN = WILDEN_SWIFT_MODES.index("fun")
+_SOULFUL = WILDEN_SWIFT_MODES.index("soulful")
+
+
+def _tray(texts: Sequence[str]):
+    """Lowercased, stripped texts as a numpy string array, plus an empty mask."""
+    lowered = [t.lower().strip() if t and t.strip() else "" for t in texts]
+    empty = np.array([not t for t in lowered], dtype=bool)
+    return lowered, np.array(lowered, dtype=np.str_), empty
+
+
+def _presence(lowered: List[str]) -> np.ndarray:
+    """(n, len(_PHRASES)) bool: does candidate i contain phrase j?"""
+    present = np.zeros((len(lowered), len(_PHRASES)), dtype=bool)
+    # "\n" can't be part of any phrase, so no hit straddles two candidates.
+    joined = "\n".join(lowered)
+    starts = [0]
+    for text in lowered:
+        starts.append(starts[-1] + len(text) + 1)
+    find = joined.find
+    for j, phrase in enumerate(_PHRASES):
+        pos = find(phrase)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            present[i, j] = True
+            pos = find(phrase, starts[i + 1])
+    return present
+
+
+def mode_matrix(texts: Sequence[str]) -> np.ndarray:
+    """(len(texts), 18) mode scores. Blank texts get an all-zero row."""
+    n = len(texts)
+    if n == 0:
+        return np.zeros((0, len(WILDEN_SWIFT_MODES)))
+    lowered, tray, empty = _tray(texts)
+
+    group_hits = _presence(lowered).astype(np.int32) @ _MEMBERSHIP
+
+    def hits(group: str) -> np.ndarray:
+        return group_hits[:, _GROUP[group]]
+
+    def any_of(group: str) -> np.ndarray:
+        return group_hits[:, _GROUP[group]] > 0
+
+    is_template = np.zeros(n, dtype=bool)
+    for start in WILDEN_SWIFT_SIGNALS["template_starts"]:
+        is_template |= np.char.startswith(tray, start)
+
+    # Codepoint matrix: rows are candidates, padded with zeros.
+    width = tray.dtype.itemsize // 4
+    codes = tray.view(np.uint32).reshape(n, width) if width else np.zeros((n, 1), np.uint32)
+    lengths = np.char.str_len(tray)
+    inside = np.arange(codes.shape[1]) < lengths[:, None]
+    space = (codes <= _WS_TOP) & _IS_SPACE[np.minimum(codes, _WS_TOP)]
+    word_char = inside & ~space
+    starts = word_char.copy()
+    starts[:, 1:] &= ~word_char[:, :-1]
+    word_count = starts.sum(axis=1)
+    commas = (codes == _COMMA).sum(axis=1)
+
+    # Alliteration: three consecutive words of one candidate, same first char.
+    rows, cols = np.nonzero(starts)
+    first = codes[rows, cols]
+    alliterates = np.zeros(n, dtype=bool)
+    if len(first) >= 3:
+        run = ((first[:-2] == first[1:-1]) & (first[1:-1] == first[2:])
+               & (rows[:-2] == rows[2:]))
+        alliterates[rows[:-2][run]] = True
+
+    # Distinct words: a C-level set per candidate beats any per-word
+    # vocabulary bookkeeping in Python.
+    distinct = np.fromiter((len(set(text.split())) for text in lowered),
+                           dtype=np.int64, count=n)
+    unique_ratio = distinct / np.maximum(word_count, 1)
+
+    conditions = {
+        "literal": ~any_of("figurative") & (word_count < 30),
+        "analogous": any_of("analogous"),
+        "metaphorical": any_of("metaphorical"),
+        "simile": any_of("simile"),
+        "alliteration": alliterates,
+        "wit": any_of("turn") & (word_count < 25),
+        "clever": (word_count < 20) & ~any_of("explaining"),
+        "wordplay": unique_ratio > 0.85,
+        "pun": np.zeros(n, dtype=bool),
+        "absurd": any_of("absurd"),
+        "paradoxical": any_of("paradoxical"),
+        "funny": any_of("funny"),
+        "original": (unique_ratio > 0.8) & ~is_template,
+        "allegory": any_of("story"),
+        "story": any_of("arc") & (word_count > 15),
+        "poetic": ((commas >= 2) | any_of("poetic")) & (word_count < 30),
+    }
+    matrix = np.empty((n, len(WILDEN_SWIFT_MODES)))
+    matrix[:, _BINARY_COLUMNS] = np.where(
+        np.column_stack([conditions[m] for m in _BINARY]), _BINARY_YES, _BINARY_NO)
+    matrix[:, _FUN] = np.minimum(1.0, hits("fun") * 0.25)
+    matrix[:, _SOULFUL] = np.minimum(1.0, hits("soulful") * 0.3)
+    matrix[empty] = 0.0
+    return matrix
+
+
+def total_scores(matrix: np.ndarray) -> np.ndarray:
+    """Unrounded total_score per row. Summed left to right like sum()."""
+    total = np.zeros(matrix.shape[0])
+    for j in range(matrix.shape[1]):
+        total += matrix[:, j]
+    return total / 18.0
+
+
+def totals(texts: Sequence[str]) -> List[float]:
+    """total_score for each text, rounded the way wilden_swift_score rounds."""
+    return [round(t, 3) for t in total_scores(mode_matrix(texts)).tolist()]
+
+
+def rank(texts: Sequence[str]) -> List[int]:
+    """Indices of `texts`, best total first. Ties keep tray order."""
+    return np.argsort(-total_scores(mode_matrix(texts)), kind="stable").tolist()
+
+
+def score_batch(texts: Sequence[str]) -> List[Dict[str, Any]]:
+    """wilden_swift_score(text) for every text, computed as one tray."""
+    matrix = mode_matrix(texts)
+    out = []
+    for text, row, total in zip(texts, matrix.tolist(), total_scores(matrix).tolist()):
+        if not text or not text.strip():
+            out.append({"modes_lit": 0, "total_score": 0.0, "top_modes": [], "scores": {}})
+            continue
+        scores = dict(zip(WILDEN_SWIFT_MODES, row))
+        out.append({
+            "modes_lit": sum(1 for v in row if v > 0.5),
+            "total_score": round(total, 3),
+            "top_modes": sorted(scores.items(), key=lambda x: x[1], reverse=True)[:3],
+            "scores": {k: round(v, 2) for k, v in scores.items()},
+        })
+    return out
+
+
+# ============================================================================
+# BENCHMARK — python rilie_wilden.py
+# ============================================================================
+
+def _synthetic_candidates(n: int, seed: int = 49) -> List[str]:
+    import random
+
+    rng = random.Random(seed)
+    phrases = [p for group in WILDEN_SWIFT_SIGNALS.values() for p in group]
+    words = ("music brain rhythm bass beat truth love grief river city memory "
+             "teacher student question answer feel heart the a is of and to in "
+             "that it was for on with as Big Bright Bold").split()
+    out = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(6, 45)):
+            roll = rng.random()
+            parts.append(rng.choice(phrases).strip() if roll < 0.08
+                         else rng.choice(words) + ("," if roll > 0.95 else ""))
+        text = " ".join(parts)
+        out.append(text.capitalize() + rng.choice((".", "!", "...", "?")))
+    out[::97] = ["   "] * len(out[::97])
+    return out
+
+
+def _bench(sizes=(9, 27, 100, 1000, 10_000), repeats: int = 5) -> None:
+    import time
+
+    from guvna_tools import wilden_swift_score
+
+    print(f"{'tray':>6} {'scalar us/text':>15} {'batch us/text':>14} "
+          f"{'speedup':>8} {'texts/s batch':>14} {'same':>5}")
+    for n in sizes:
+        texts = _synthetic_candidates(n)
+        same = score_batch(texts) == [wilden_swift_score(t) for t in texts]
+
+        def best(fn) -> float:
+            times = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - t0)
+            return min(times)
+
+        # Ranking is the job: totals for every candidate.
+        scalar = best(lambda: [wilden_swift_score(t)["total_score"] for t in texts])
+        batch = best(lambda: totals(texts))
+        print(f"{n:>6} {scalar / n * 1e6:>15.1f} {batch / n * 1e6:>14.1f} "
+              f"{scalar / batch:>7.1f}x {n / batch:>14,.0f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    _bench()
@@ -27,6 +27,8 @@ import re
 from typing import Dict, Any, Optional, List, Tuple
 
 from banks import get_db_conn
+from rilie_ddd import ConversationState
+from rilie_tokens import tokenize
 
 logger = logging.getLogger("session")
 
@@ -59,10 +61,17 @@ def ensure_session_table() -> None:
         talk_served JSONB DEFAULT '[]'::jsonb,
         social_state JSONB DEFAULT '{}'::jsonb,
         topics JSONB DEFAULT '{}'::jsonb,
+        conversation_state JSONB DEFAULT '{}'::jsonb,
+        memory_state JSONB DEFAULT '{}'::jsonb,
         created_at TIMESTAMPTZ DEFAULT now(),
         updated_at TIMESTAMPTZ DEFAULT now()
     );
 
+    -- Rows created before per-session Kitchen / memory state moved here.
+    ALTER TABLE banks_sessions
+        ADD COLUMN IF NOT EXISTS conversation_state JSONB DEFAULT '{}'::jsonb,
+        ADD COLUMN IF NOT EXISTS memory_state JSONB DEFAULT '{}'::jsonb;
+
     CREATE INDEX IF NOT EXISTS idx_sessions_client_ip
         ON banks_sessions (client_ip);
 
@@ -129,7 +138,7 @@ def load_session(client_ip: str) -> Dict[str, Any]:
                 cur.execute(
                     "SELECT session_id, user_name, client_ip, name_source, "
                     "turn_count, whosonfirst, response_history, talk_served, social_state, "
-                    "topics, created_at, updated_at "
+                    "topics, conversation_state, memory_state, created_at, updated_at "
                     "FROM banks_sessions WHERE session_id = %s",
                     (sid,),
                 )
@@ -146,7 +155,8 @@ def _row_to_dict(row, description) -> Dict[str, Any]:
     """Convert a DB row to a dict."""
     cols = [col.name for col in description]
     d = dict(zip(cols, row))
-    for key in ("response_history", "talk_served", "social_state", "topics"):
+    for key in ("response_history", "talk_served", "social_state", "topics",
+                "conversation_state", "memory_state"):
         if isinstance(d.get(key), str):
             d[key] = json.loads(d[key])
     return d
@@ -165,6 +175,8 @@ def _fresh_session(client_ip: str) -> Dict[str, Any]:
         "talk_served": [],
         "social_state": {"user_status": 0.5, "self_status": 0.4},
         "topics": {},
+        "conversation_state": {},
+        "memory_state": {},
         "created_at": None,
         "updated_at": None,
     }
@@ -186,10 +198,10 @@ def save_session(session: Dict[str, Any]) -> None:
     INSERT INTO banks_sessions
         (session_id, user_name, client_ip, name_source, turn_count, whosonfirst,
          response_history, talk_served, social_state, topics,
-         created_at, updated_at)
+         conversation_state, memory_state, created_at, updated_at)
     VALUES
         (%s, %s, %s, %s, %s, %s, %s::jsonb, %s::jsonb, %s::jsonb, %s::jsonb,
-         now(), now())
+         %s::jsonb, %s::jsonb, now(), now())
     ON CONFLICT (session_id) DO UPDATE SET
         user_name      = EXCLUDED.user_name,
         name_source    = EXCLUDED.name_source,
@@ -199,6 +211,8 @@ def save_session(session: Dict[str, Any]) -> None:
         talk_served      = EXCLUDED.talk_served,
         social_state     = EXCLUDED.social_state,
         topics           = EXCLUDED.topics,
+        conversation_state = EXCLUDED.conversation_state,
+        memory_state     = EXCLUDED.memory_state,
         updated_at       = now();
     """
     try:
@@ -217,6 +231,8 @@ def save_session(session: Dict[str, Any]) -> None:
                         json.dumps(session.get("talk_served", [])),
                         json.dumps(session.get("social_state", {})),
                         json.dumps(session.get("topics", {})),
+                        json.dumps(session.get("conversation_state", {})),
+                        json.dumps(session.get("memory_state", {})),
                     ),
                 )
             conn.commit()
@@ -358,26 +374,25 @@ def _extract_reference_keyword(user_text: str) -> Optional[str]:
     return None
 
 
+_MATCH_STOPWORDS = frozenset({"you", "i", "the", "and", "a", "to"})
+
+
 def _score_match(candidate: str, keyword: Optional[str], user_text: str) -> float:
     """
     Very cheap relevance score: keyword hit + lexical overlap.
 
     We don't need perfection; we just need the right beat most of the time.
     """
-    c_low = candidate.lower()
-    u_low = user_text.lower()
+    c_tok = tokenize(candidate)
 
     score = 0.0
 
-    if keyword and keyword in c_low:
+    if keyword and keyword in c_tok.lower:
         score += 1.0
 
     # tiny Jaccard-ish overlap on non-stopwords
-    def tokens(s: str) -> List[str]:
-        return [w for w in re.findall(r"[a-z0-9]+", s.lower()) if w not in {"you", "i", "the", "and", "a", "to"}]
-
-    c_toks = set(tokens(candidate))
-    u_toks = set(tokens(u_low))
+    c_toks = c_tok.content_set(_MATCH_STOPWORDS)
+    u_toks = tokenize(user_text).content_set(_MATCH_STOPWORDS)
     if c_toks and u_toks:
         overlap = len(c_toks & u_toks) / max(len(c_toks), 1)
         score += overlap
@@ -450,10 +465,21 @@ def restore_guvna_state(guvna, session: Dict[str, Any]) -> None:
         guvna.social_state.user_status = social.get("user_status", 0.5)
         guvna.social_state.self_status = social.get("self_status", 0.4)
 
+    # ConversationMemory is shared; its per-session half comes from the row.
     # Keep memory turn count in sync
+    guvna.memory.load_state(session.get("memory_state"))
     guvna.memory.turn_count = session.get("turn_count", 0)
     guvna.memory.user_name = session.get("user_name", DEFAULT_NAME)
 
+    # Per-session Kitchen state: BJJ health is keyed by session id, and
+    # the ConversationState (disclosure level, deja vu) rides in the row.
+    rilie = getattr(guvna, "rilie", None)
+    if rilie is not None:
+        rilie.session_id = session.get("session_id")
+        rilie.conversation = ConversationState.from_state(
+            session.get("conversation_state")
+        )
+
 
 def snapshot_guvna_state(guvna, session: Dict[str, Any]) -> Dict[str, Any]:
     """Capture current Guvna state back into the session dict."""
@@ -465,6 +491,10 @@ def snapshot_guvna_state(guvna, session: Dict[str, Any]) -> Dict[str, Any]:
         "user_status": guvna.social_state.user_status,
         "self_status": guvna.social_state.self_status,
     }
+    session["memory_state"] = guvna.memory.to_state()
+    rilie = getattr(guvna, "rilie", None)
+    if rilie is not None:
+        session["conversation_state"] = rilie.conversation.to_state()
 
     # If guvna captured a name and it's not Mate, update session
     if (
@@ -14,13 +14,18 @@ Architecture:
 - The Guvna (guvna) orchestrates the pipeline
 - TALK checks the plate before it leaves the building
 
-Gates (in order):
+Gates:
 1. EMPTY CHECK — is there even food on the plate?
 2. ANTI-DÉJÀ-VU — did we already serve this dish? (signal, not rejection)
 3. RELEVANCE — did she answer what was asked?
 4. RESONANCE — does the depth match the question?
 5. ORIGINALITY — is this cooked fresh or reheated?
 
+They run lazily, cheapest first, and stop at the first hard "no"
+(see GatePipeline). ORIGINALITY is a soft "no": a hard gate that fails
+after it still wins. DÉJÀ-VU never rejects and costs the most, so it
+only runs on plates that are about to be served.
+
 If a plate fails, it goes back to the kitchen.
 If all plates fail, TALK says so honestly.
 The customer never sees the mess.
@@ -29,10 +34,16 @@ One file. One function. One return.
 
 """
 
-import re
 import logging
+import os
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+
+from rilie_neardup import NearDupIndex
+from rilie_tokens import tokenize, NOISE_WORDS
 
 logger = logging.getLogger(__name__)
 
@@ -141,8 +152,10 @@ class TalkMemory:
     In-memory list now, DB-ready interface for Tier 2 (banks_sessions).
     """
 
-    def __init__(self):
+    def __init__(self, dejavu_window: int = 20):
         self._served: List[Dict[str, Any]] = []
+        # Near-dup signatures of the last served plates (for the dejavu gate)
+        self._served_index = NearDupIndex(window=dejavu_window)
 
     def record(self, text: str, plate: Optional[Dict[str, Any]] = None) -> None:
         """Record a served plate with metadata."""
@@ -155,6 +168,8 @@ class TalkMemory:
             "status": (plate or {}).get("status", ""),
         }
         self._served.append(entry)
+        if entry["text"]:
+            self._served_index.add(entry["text"])
 
     def recent(self, n: int = 5) -> List[Dict[str, Any]]:
         """Last N served plates with metadata."""
@@ -164,29 +179,34 @@ class TalkMemory:
         """Last N served texts (for backwards compat and comparison)."""
         return [e["text"] for e in self._served[-n:] if e["text"]]
 
+    def snapshot(self) -> "TalkMemory":
+        """
+        A copy to check gates against off the request thread.
+
+        record() keeps running on the request thread, and the index it
+        feeds isn't safe to read while it changes.
+        """
+        view = TalkMemory(dejavu_window=self._served_index.window)
+        view._served = list(self._served)
+        for text in self._served_index.texts():
+            view._served_index.add(text)
+        return view
+
+    def served_overlap(self, text: str) -> float:
+        """Best word overlap (0.0-1.0) of `text` with a recently served plate."""
+        return self._served_index.max_overlap(text) if text else 0.0
+
     @property
     def served_count(self) -> int:
         return len(self._served)
 
 
 # ============================================================================
-# WORD EXTRACTION — shared utility
+# WORD EXTRACTION — shared utility (rilie_tokens)
 # ============================================================================
 
-def _words(text: str) -> set:
-    """Extract word set for comparison."""
-    return set(re.sub(r"[^a-zA-Z0-9\s]", "", text.lower()).split())
-
-
 # Noise words that don't indicate relevance
-_NOISE = {
-    "the", "a", "an", "is", "are", "was", "were", "i", "you", "it",
-    "to", "in", "on", "of", "and", "or", "but", "that", "this",
-    "what", "how", "why", "who", "when", "where", "do", "does",
-    "can", "my", "your", "me", "we", "they", "he", "she", "its",
-    "not", "no", "yes", "so", "if", "for", "with", "at", "from",
-    "be", "have", "has", "had", "will", "would", "could", "should",
-}
+_NOISE = NOISE_WORDS
 
 
 # ============================================================================
@@ -198,7 +218,7 @@ def gate_empty(plate: Dict[str, Any]) -> tuple:
     text = plate.get("result", "").strip()
     if not text:
         return False, "EMPTY_PLATE"
-    word_count = len(text.split())
+    word_count = len(tokenize(text).split)
     if word_count < 3:
         return False, f"UNDERWEIGHT_{word_count}"
     return True, "OK"
@@ -210,8 +230,16 @@ def gate_dejavu(plate: Dict[str, Any], memory: TalkMemory) -> tuple:
     Guvna tracks it in metadata. TALK passes it through.
     The signal tells us about rhythm and theme—whether she's riffing or stuck.
     Downstream can decide what to do with it.
+
+    If upstream sent no signal, TALK fills it in from what she's served.
     """
-    dejavu_info = plate.get("dejavu", {})
+    dejavu_info = plate.get("dejavu") or {}
+    if not dejavu_info.get("frequency", 0):
+        overlap = memory.served_overlap(plate.get("result", "").strip())
+        if overlap > 0.6:
+            dejavu_info = dict(dejavu_info, frequency=1,
+                               similarity="high" if overlap > 0.8 else "partial")
+            plate["dejavu"] = dejavu_info
     if dejavu_info.get("frequency", 0) > 0:
         similarity = dejavu_info.get("similarity", "none")
         logger.debug("TALK: Déjà-vu signal detected (freq=%d, similarity=%s) - PASS",
@@ -244,15 +272,14 @@ def gate_relevance(plate: Dict[str, Any], stimulus: str) -> tuple:
     if any(s.startswith(g) or s == g for g in _SOCIAL_SIGNALS):
         return True, "OK"
 
-    stim_words = _words(stimulus)
-    resp_words = _words(text)
+    stim_tok = tokenize(stimulus)
+    resp_tok = tokenize(text)
 
-    if not stim_words or not resp_words:
+    if not stim_tok.word_set or not resp_tok.word_set:
         return True, "OK"
 
     # Check meaningful overlap
-    overlap = stim_words & resp_words
-    meaningful_overlap = overlap - _NOISE
+    meaningful_overlap = stim_tok.content_set(_NOISE) & resp_tok.content_set(_NOISE)
 
     # Domain coverage counts as relevance
     domains_used = plate.get("domains_used", [])
@@ -280,8 +307,8 @@ def gate_resonance(plate: Dict[str, Any], stimulus: str) -> tuple:
     if not text:
         return True, "OK"
 
-    stim_len = len(stimulus.split())
-    resp_len = len(text.split())
+    stim_len = len(tokenize(stimulus).split)
+    resp_len = len(tokenize(text).split)
     direct = _is_direct(stimulus)
     domains_used = plate.get("domains_used", [])
 
@@ -322,9 +349,7 @@ def gate_originality(plate: Dict[str, Any], memory: TalkMemory) -> tuple:
     if not text:
         return True, "OK"
 
-    text_lower = text.lower()
-    resp_words = text.split()
-    resp_len = len(resp_words)
+    text_lower = tokenize(text).lower
 
     # --- FILLER CHECK ---
     filler_count = sum(1 for f in _FILLER_FRAGMENTS if f in text_lower)
@@ -342,24 +367,423 @@ def gate_originality(plate: Dict[str, Any], memory: TalkMemory) -> tuple:
         baseline_text = baseline
 
     if baseline_text and len(baseline_text.strip()) > 20:
-        baseline_words = _words(baseline_text)
-        response_words = _words(text)
-        if baseline_words and response_words:
-            overlap = baseline_words & response_words
-            meaningful_overlap = overlap - _NOISE
+        baseline_tok = tokenize(baseline_text)
+        response_tok = tokenize(text)
+        if baseline_tok.word_set and response_tok.word_set:
+            response_content = response_tok.content_set(_NOISE)
+            meaningful_overlap = baseline_tok.content_set(_NOISE) & response_content
             # If more than 70% of the response words come from baseline = echo
-            if len(response_words) > 0:
-                echo_ratio = len(meaningful_overlap) / max(len(response_words - _NOISE), 1)
+            if response_tok.word_set:
+                echo_ratio = len(meaningful_overlap) / max(len(response_content), 1)
                 if echo_ratio > 0.7:
                     return False, "BASELINE_ECHO"
 
     return True, "OK"
 
 
+# ============================================================================
+# GATE PIPELINE — cheapest check first, stop at the first hard no
+# ============================================================================
+
+# Every gate takes (plate, stimulus, memory), whatever it actually reads.
+GATES: Dict[str, Callable[[Dict[str, Any], str, TalkMemory], tuple]] = {
+    "EMPTY": lambda plate, stimulus, memory: gate_empty(plate),
+    "DEJAVU": lambda plate, stimulus, memory: gate_dejavu(plate, memory),
+    "RELEVANCE": lambda plate, stimulus, memory: gate_relevance(plate, stimulus),
+    "RESONANCE": lambda plate, stimulus, memory: gate_resonance(plate, stimulus),
+    "ORIGINALITY": lambda plate, stimulus, memory: gate_originality(plate, memory),
+}
+
+# A soft failure is held while the remaining gates run; any hard failure
+# replaces it. That keeps the originality send-back-once rule honest no
+# matter where ORIGINALITY sits in the order.
+SOFT_GATES = frozenset({"ORIGINALITY"})
+
+# Gates that only annotate the plate. They can't short-circuit anything,
+# so they run after every rejecting gate, and only if the plate is served.
+SIGNAL_GATES = frozenset({"DEJAVU"})
+
+# Measured on cold plates (python talk.py): EMPTY ~7 us, RESONANCE ~14,
+# RELEVANCE ~28, ORIGINALITY ~29, DEJAVU ~180 and never rejects.
+DEFAULT_GATE_ORDER = ("EMPTY", "RESONANCE", "RELEVANCE", "ORIGINALITY", "DEJAVU")
+
+# Comma-separated gate names, or "auto" to re-rank from live stats.
+TALK_GATE_ORDER = os.getenv("RILIE_TALK_GATE_ORDER", "")
+
+# With "auto": re-rank after this many plates.
+TALK_GATE_RERANK_EVERY = int(os.getenv("RILIE_TALK_GATE_RERANK", "256"))
+
+
+@dataclass
+class GateStats:
+    """Counters for one gate. Unlocked: good enough for a dashboard."""
+    calls: int = 0
+    passes: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "passes": self.passes,
+            "pass_rate": round(self.passes / self.calls, 4) if self.calls else None,
+            "mean_us": round(self.seconds / self.calls * 1e6, 2) if self.calls else None,
+        }
+
+
+class GatePipeline:
+    """
+    The five gates as one lazy checklist.
+
+    run() walks the gates in order and returns the first hard failure as
+    (gate, reason), or None when the plate may be served. Gates after a
+    hard failure never run. Signal gates wait until the plate is known to
+    be served: no failure, or only a soft one with soft_final=True (the
+    caller will serve it anyway). Each gate that does run is timed.
+
+    The order is any permutation of GATES. Names left out are appended
+    in DEFAULT_GATE_ORDER, so no gate can be configured away. With
+    adaptive=True the pipeline re-ranks itself every `rerank_every`
+    plates by mean cost divided by rejection rate, the order that
+    minimizes expected cost for a short-circuit AND. Soft gates and
+    gates that never reject go to the back.
+    """
+
+    def __init__(self, order: Sequence[str] = DEFAULT_GATE_ORDER,
+                 adaptive: bool = False,
+                 rerank_every: int = TALK_GATE_RERANK_EVERY):
+        unknown = [name for name in order if name not in GATES]
+        if unknown:
+            raise ValueError(f"unknown talk gates: {unknown}")
+        self.order: Tuple[str, ...] = tuple(dict.fromkeys(
+            list(order) + [g for g in DEFAULT_GATE_ORDER if g not in order]))
+        self.adaptive = adaptive
+        self.rerank_every = max(1, rerank_every)
+        self.stats: Dict[str, GateStats] = {name: GateStats() for name in GATES}
+        self.runs = 0
+
+    @classmethod
+    def from_env(cls, spec: str = TALK_GATE_ORDER) -> "GatePipeline":
+        spec = spec.strip()
+        if spec.lower() == "auto":
+            return cls(adaptive=True)
+        if not spec:
+            return cls()
+        order = [name.strip().upper() for name in spec.split(",") if name.strip()]
+        try:
+            return cls(order)
+        except ValueError as e:
+            logger.warning("TALK: ignoring RILIE_TALK_GATE_ORDER (%s)", e)
+            return cls()
+
+    def run(self, plate: Dict[str, Any], stimulus: str, memory: TalkMemory,
+            soft_final: bool = False) -> Optional[Tuple[str, str]]:
+        failure = None
+        hard = False
+        for name in self.order:
+            if name in SIGNAL_GATES:
+                continue
+            passed, reason = self._check(name, plate, stimulus, memory)
+            if passed:
+                continue
+            if name not in SOFT_GATES:
+                failure, hard = (name, reason), True
+                break
+            failure = failure or (name, reason)
+        if not hard and (failure is None or soft_final):
+            for name in self.order:
+                if name in SIGNAL_GATES:
+                    self._check(name, plate, stimulus, memory)
+        self.runs += 1
+        if self.adaptive and self.runs % self.rerank_every == 0:
+            self.rerank()
+        return failure
+
+    def _check(self, name: str, plate: Dict[str, Any], stimulus: str,
+               memory: TalkMemory) -> tuple:
+        stats = self.stats[name]
+        t0 = time.perf_counter()
+        passed, reason = GATES[name](plate, stimulus, memory)
+        stats.seconds += time.perf_counter() - t0
+        stats.calls += 1
+        if passed:
+            stats.passes += 1
+        return passed, reason
+
+    def cost_order(self) -> Tuple[str, ...]:
+        """Order the stats so far suggest. Unseen gates keep their place."""
+        def rank(name: str) -> float:
+            stats = self.stats[name]
+            if not stats.calls:
+                return 0.0
+            rejections = stats.calls - stats.passes
+            if not rejections or name in SOFT_GATES:
+                return float("inf")     # can't cut the walk short
+            return (stats.seconds / stats.calls) / (rejections / stats.calls)
+        return tuple(sorted(self.order, key=rank))
+
+    def rerank(self) -> None:
+        order = self.cost_order()
+        if order != self.order:
+            logger.info("TALK: gate order %s -> %s", self.order, order)
+            self.order = order
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "order": list(self.order),
+            "adaptive": self.adaptive,
+            "runs": self.runs,
+            "gates": {name: self.stats[name].as_dict() for name in self.order},
+        }
+
+
+TALK_GATES = GatePipeline.from_env()
+
+
+def gate_stats() -> Dict[str, Any]:
+    """Per-gate timing and pass rates for the process-wide pipeline."""
+    return TALK_GATES.snapshot()
+
+
+# ============================================================================
+# SPECULATIVE RETRIES — fire several orders, serve the first good plate
+# ============================================================================
+
+# How many retry plates to cook at once after a rejection. 0 or 1 keeps
+# the one-at-a-time loop.
+TALK_SPECULATIVE = int(os.getenv("RILIE_TALK_SPECULATIVE", "0"))
+
+# Wall-clock budget for all speculative rounds of one turn, in milliseconds.
+TALK_RETRY_BUDGET = float(os.getenv("RILIE_TALK_RETRY_BUDGET_MS", "8000")) / 1000.0
+
+# Threads shared by every speculative round in the process.
+TALK_SPECULATIVE_WORKERS = int(os.getenv("RILIE_TALK_SPECULATIVE_WORKERS", "4"))
+
+_retry_pool = None
+_retry_pool_lock = threading.Lock()
+
+
+def _get_retry_pool() -> ThreadPoolExecutor:
+    global _retry_pool
+    with _retry_pool_lock:
+        if _retry_pool is None:
+            _retry_pool = ThreadPoolExecutor(
+                max_workers=max(1, TALK_SPECULATIVE_WORKERS),
+                thread_name_prefix="talk-retry",
+            )
+        return _retry_pool
+
+
+def _wilden_rank(texts: List[str]) -> List[float]:
+    """Default ranking for a tray of plates: wilden_swift totals, one batch."""
+    try:
+        from rilie_wilden import totals
+    except ImportError:
+        return [0.0] * len(texts)
+    return totals(texts)
+
+
+def _alternate_plates(plate: Dict[str, Any],
+                      rank_fn: Callable[[List[str]], List[float]]) -> List[Dict[str, Any]]:
+    """
+    The kitchen's runners-up as plates, best wilden_swift first.
+
+    They are already cooked, so trying one costs a gate check instead of
+    another trip to the kitchen. They arrive raw; _plate_alternate
+    compresses each one only when it is tried.
+    """
+    texts = [t for t in plate.get("alternates") or [] if t and t.strip()]
+    if not texts:
+        return []
+    scores = rank_fn(texts)
+    order = sorted(range(len(texts)), key=lambda i: -scores[i])
+    base = {k: v for k, v in plate.items()
+            if k not in ("alternates", "result", "dejavu")}
+    return [dict(base, result=texts[i], talk_alternate=rank + 1)
+            for rank, i in enumerate(order)]
+
+
+def _plate_alternate(plate: Dict[str, Any]) -> Dict[str, Any]:
+    """Compress a runner-up the way the kitchen compressed the winner."""
+    if not plate.get("limo_applied"):
+        return plate
+    try:
+        from rilie_innercore_22 import _apply_limo
+    except ImportError:
+        return plate
+    plate["result"] = _apply_limo(plate.get("result", ""))
+    return plate
+
+
+def _cook_and_check(retry_fn, stimulus: str, memory: TalkMemory,
+                    gates: GatePipeline, round_over: threading.Event):
+    """One speculative order: cook a plate, run it through the gates."""
+    plate = retry_fn(stimulus)
+    if round_over.is_set():
+        # Nobody is waiting for this plate any more.
+        return plate, ("ABANDONED", "ROUND_OVER")
+    # soft_final: if this plate ends up served despite originality, it
+    # already carries its dejavu signal.
+    return plate, gates.run(plate, stimulus, memory, soft_final=True)
+
+
+def _speculate(
+    stimulus: str,
+    memory: TalkMemory,
+    gates: GatePipeline,
+    retry_fn,
+    count: int,
+    first_attempt: int,
+    rejection_log: List[Dict[str, str]],
+    originality_retried: bool,
+    budget: float,
+    rank_fn: Callable[[List[str]], List[float]],
+):
+    """
+    Cook `count` retry plates at once and check them as they land.
+
+    Returns (plate, talk_status, attempts, originality_retried), with
+    plate and talk_status None when nothing usable came back in time.
+
+    The first plate to pass every gate wins. Any other passing plate that
+    landed in the same moment competes with it on rank_fn. Orders still
+    queued are cancelled. Kitchens already cooking can't be interrupted
+    from here, so their plates are dropped unchecked when they land.
+    Gates check against a snapshot of `memory`, since the request thread
+    goes on recording into it. Plates that fail only ORIGINALITY follow
+    the sequential rule: the first one is sent back, and later ones can
+    be served if nothing clean arrives.
+    """
+    pool = _get_retry_pool()
+    deadline = time.monotonic() + budget
+    view = memory.snapshot()
+    round_over = threading.Event()
+    pending = {
+        pool.submit(_cook_and_check, retry_fn, stimulus, view, gates, round_over): i
+        for i in range(count)
+    }
+    attempts = first_attempt
+    winners: List[Dict[str, Any]] = []
+    fallback = None
+
+    try:
+        while pending and not winners:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("TALK: speculative retries out of budget (%.0f ms)",
+                               budget * 1000)
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                attempts += 1
+                try:
+                    plate, failed = future.result()
+                except Exception as e:
+                    logger.error("TALK: retry_fn failed: %s", e)
+                    continue
+                if failed is None:
+                    winners.append(plate)
+                    continue
+                gate_name, reason = failed
+                rejection_log.append({
+                    "attempt": attempts,
+                    "gate": gate_name,
+                    "reason": reason,
+                    "rejected_text": plate.get("result", "")[:80],
+                })
+                logger.warning("TALK: Gate %s rejected speculative plate — %s "
+                               "(attempt %d)", gate_name, reason, attempts)
+                if gate_name == "ORIGINALITY":
+                    if originality_retried and fallback is None:
+                        fallback = plate
+                    originality_retried = True
+    finally:
+        round_over.set()
+        for future in pending:
+            future.cancel()
+
+    if winners:
+        best = winners[0]
+        if len(winners) > 1:
+            scores = rank_fn([p.get("result", "") for p in winners])
+            best = winners[max(range(len(winners)), key=scores.__getitem__)]
+        return best, "SERVED", attempts, originality_retried
+    if fallback is not None:
+        return fallback, "SERVED_DESPITE_ORIGINALITY", attempts, originality_retried
+    return None, None, attempts, originality_retried
+
+
 # ============================================================================
 # TALK — The only return. The only mouth.
 # ============================================================================
 
+def _serve(
+    plate: Dict[str, Any],
+    stimulus: str,
+    memory: TalkMemory,
+    attempts: int,
+    rejection_log: List[Dict[str, str]],
+    search_fn=None,
+    wilden_swift_fn=None,
+) -> Dict[str, Any]:
+    """Score, self-search, record and receipt a plate that passed."""
+    result_text = plate.get("result", "")
+    status = str(plate.get("status", "")).upper()
+    is_primer = status in ("GREETING", "PRIMER", "GOODBYE")
+
+    # STEP 1: WILDEN_SWIFT — score on 18 rhetorical modes
+    # She writes it, then it's graded. She never sees the formula.
+    if wilden_swift_fn and result_text and not is_primer:
+        try:
+            wilden_swift_fn(result_text)
+            if hasattr(wilden_swift_fn, '_last_scores'):
+                plate["wilden_swift"] = wilden_swift_fn._last_scores
+            elif hasattr(wilden_swift_fn, '__wrapped__') and hasattr(wilden_swift_fn.__wrapped__, '_last_scores'):
+                plate["wilden_swift"] = wilden_swift_fn.__wrapped__._last_scores
+            logger.info("TALK: wilden_swift scored response")
+        except Exception as e:
+            logger.debug("TALK: wilden_swift failed (non-fatal): %s", e)
+
+    # STEP 2: SELF-SEARCH — google her sentence before speaking
+    if search_fn and result_text and not is_primer:
+        try:
+            enrichment = search_fn(result_text)
+            if enrichment and len(enrichment.strip()) > 20:
+                plate["self_search"] = enrichment.strip()
+                logger.info("TALK: Self-search enriched response")
+        except Exception as e:
+            logger.debug("TALK: Self-search failed (non-fatal): %s", e)
+
+    # STEP 3: SERVE
+    memory.record(result_text, plate)
+
+    # Attach the receipt
+    plate["talk_status"] = "SERVED"
+    plate["talk_attempts"] = attempts
+    plate["talk_rejections"] = rejection_log
+    plate["talk_direct"] = _is_direct(stimulus)
+
+    logger.info("TALK: SERVED after %d attempt(s)", attempts)
+    return plate
+
+
+def _serve_despite_originality(
+    plate: Dict[str, Any],
+    stimulus: str,
+    memory: TalkMemory,
+    attempts: int,
+    rejection_log: List[Dict[str, str]],
+) -> Dict[str, Any]:
+    """Already sent back once for originality. Serve it anyway."""
+    memory.record(plate.get("result", ""), plate)
+    plate["talk_status"] = "SERVED_DESPITE_ORIGINALITY"
+    plate["talk_attempts"] = attempts
+    plate["talk_rejections"] = rejection_log
+    plate["talk_direct"] = _is_direct(stimulus)
+    logger.info("TALK: SERVED (originality override) after %d attempt(s)", attempts)
+    return plate
+
+
 def talk(
     plate: Dict[str, Any],
     stimulus: str,
@@ -368,19 +792,23 @@ def talk(
     retry_fn=None,
     search_fn=None,
     wilden_swift_fn=None,
+    gates: Optional[GatePipeline] = None,
+    speculative: Optional[int] = None,
+    retry_budget: Optional[float] = None,
+    rank_fn: Optional[Callable[[List[str]], List[float]]] = None,
 ) -> Dict[str, Any]:
     """
     THE WAITRESS.
 
     Takes the plate from the kitchen. Checks every gate.
     If it passes — serve it. Record it. Return it.
-    If it fails — send it back. Try again.
+    If it fails — try the kitchen's runners-up, best first. Then send it back.
     If all retries fail — be honest about it.
 
     This is the ONLY function that returns to the customer.
 
     Order:
-    1. Gates (empty, dejavu, relevance, resonance, originality)
+    1. Gates (lazy, cost-ordered; see GatePipeline)
     2. wilden_swift scores on 18 rhetorical modes
     3. Self-search googles her sentence
     4. Decide: serve or send back
@@ -393,7 +821,19 @@ def talk(
         retry_fn: Optional callable(stimulus) -> plate for retrying
         search_fn: Optional callable(query) -> str for self-search verification
         wilden_swift_fn: Optional callable(text) -> text for rhetorical scoring
+        gates: GatePipeline to check with (default: the process-wide TALK_GATES)
+        speculative: After a rejection, cook up to this many retries at once
+            (default RILIE_TALK_SPECULATIVE; 0 or 1 = one at a time).
+            retry_fn must be safe to call from several threads.
+        retry_budget: Seconds all speculative rounds of this turn may take
+            (default RILIE_TALK_RETRY_BUDGET_MS)
+        rank_fn: Scores a tray of texts, callable(texts) -> scores. Orders
+            the kitchen's alternates and breaks ties between speculative
+            winners (default: batch wilden_swift totals)
     """
+    gates = gates or TALK_GATES
+    speculative = TALK_SPECULATIVE if speculative is None else speculative
+    rank_fn = rank_fn or _wilden_rank
 
     # APERTURE FAST PATH: greeting and goodbye bypass all gates
     status = str(plate.get("status", "")).upper()
@@ -411,64 +851,19 @@ def talk(
     current_plate = plate
     rejection_log: List[Dict[str, str]] = []
     originality_retried = False
+    alternates: Optional[List[Dict[str, Any]]] = None
 
     while attempts <= max_retries:
 
-        # Run all 5 gates in order
-        gates = [
-            ("EMPTY", gate_empty(current_plate)),
-            ("DEJAVU", gate_dejavu(current_plate, memory)),
-            ("RELEVANCE", gate_relevance(current_plate, stimulus)),
-            ("RESONANCE", gate_resonance(current_plate, stimulus)),
-            ("ORIGINALITY", gate_originality(current_plate, memory)),
-        ]
-
-        failed = None
-        for gate_name, (passed, reason) in gates:
-            if not passed:
-                failed = (gate_name, reason)
-                break
+        # A second originality miss gets served anyway, so it still
+        # needs its dejavu signal.
+        failed = gates.run(current_plate, stimulus, memory,
+                           soft_final=originality_retried)
 
         if failed is None:
             # All gates passed.
-            result_text = current_plate.get("result", "")
-            status = str(current_plate.get("status", "")).upper()
-            is_primer = status in ("GREETING", "PRIMER", "GOODBYE")
-
-            # STEP 1: WILDEN_SWIFT — score on 18 rhetorical modes
-            # She writes it, then it's graded. She never sees the formula.
-            if wilden_swift_fn and result_text and not is_primer:
-                try:
-                    wilden_swift_fn(result_text)
-                    if hasattr(wilden_swift_fn, '_last_scores'):
-                        current_plate["wilden_swift"] = wilden_swift_fn._last_scores
-                    elif hasattr(wilden_swift_fn, '__wrapped__') and hasattr(wilden_swift_fn.__wrapped__, '_last_scores'):
-                        current_plate["wilden_swift"] = wilden_swift_fn.__wrapped__._last_scores
-                    logger.info("TALK: wilden_swift scored response")
-                except Exception as e:
-                    logger.debug("TALK: wilden_swift failed (non-fatal): %s", e)
-
-            # STEP 2: SELF-SEARCH — google her sentence before speaking
-            if search_fn and result_text and not is_primer:
-                try:
-                    enrichment = search_fn(result_text)
-                    if enrichment and len(enrichment.strip()) > 20:
-                        current_plate["self_search"] = enrichment.strip()
-                        logger.info("TALK: Self-search enriched response")
-                except Exception as e:
-                    logger.debug("TALK: Self-search failed (non-fatal): %s", e)
-
-            # STEP 3: SERVE
-            memory.record(result_text, current_plate)
-
-            # Attach the receipt
-            current_plate["talk_status"] = "SERVED"
-            current_plate["talk_attempts"] = attempts + 1
-            current_plate["talk_rejections"] = rejection_log
-            current_plate["talk_direct"] = _is_direct(stimulus)
-
-            logger.info("TALK: SERVED after %d attempt(s)", attempts + 1)
-            return current_plate
+            return _serve(current_plate, stimulus, memory, attempts + 1,
+                          rejection_log, search_fn, wilden_swift_fn)
 
         # Failed a gate
         gate_name, reason = failed
@@ -487,18 +882,44 @@ def talk(
         if gate_name == "ORIGINALITY" and not originality_retried:
             originality_retried = True
         elif gate_name == "ORIGINALITY" and originality_retried:
-            # Already retried once for originality. Serve it anyway.
-            result_text = current_plate.get("result", "")
-            memory.record(result_text, current_plate)
-            current_plate["talk_status"] = "SERVED_DESPITE_ORIGINALITY"
-            current_plate["talk_attempts"] = attempts + 1
-            current_plate["talk_rejections"] = rejection_log
-            current_plate["talk_direct"] = _is_direct(stimulus)
-            logger.info("TALK: SERVED (originality override) after %d attempt(s)", attempts + 1)
-            return current_plate
+            return _serve_despite_originality(current_plate, stimulus, memory,
+                                              attempts + 1, rejection_log)
 
         attempts += 1
 
+        # Runners-up from the same cook come before a new order
+        if alternates is None:
+            alternates = _alternate_plates(plate, rank_fn)
+        if alternates and attempts <= max_retries:
+            current_plate = _plate_alternate(alternates.pop(0))
+            continue
+
+        # Several retries left and speculation on: cook them in rounds of
+        # up to `speculative` at once until retries or budget run out
+        if retry_fn and speculative > 1 and max_retries - attempts >= 1:
+            budget = TALK_RETRY_BUDGET if retry_budget is None else retry_budget
+            deadline = time.monotonic() + budget
+            while attempts <= max_retries:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                winner, verdict, attempts, originality_retried = _speculate(
+                    stimulus, memory, gates, retry_fn,
+                    count=min(speculative, max_retries - attempts + 1),
+                    first_attempt=attempts,
+                    rejection_log=rejection_log,
+                    originality_retried=originality_retried,
+                    budget=remaining,
+                    rank_fn=rank_fn,
+                )
+                if verdict == "SERVED":
+                    return _serve(winner, stimulus, memory, attempts,
+                                  rejection_log, search_fn, wilden_swift_fn)
+                if verdict == "SERVED_DESPITE_ORIGINALITY":
+                    return _serve_despite_originality(winner, stimulus, memory,
+                                                      attempts, rejection_log)
+            break
+
         # Try to get a new plate from the kitchen
         if retry_fn and attempts <= max_retries:
             try:
@@ -524,3 +945,146 @@ def talk(
                    attempts, [r["gate"] for r in rejection_log])
 
     return honest_response
+
+
+# ============================================================================
+# BENCHMARK — python talk.py
+# ============================================================================
+
+def _replay_corpus(n: int, seed: int = 47) -> List[Tuple[Dict[str, Any], str]]:
+    """(plate, stimulus) pairs in roughly the mix a busy night sends back."""
+    import random
+
+    rng = random.Random(seed)
+    topic = ("music album brain rhythm physics energy language grief anger "
+             "truth beauty memory teacher student question answer city river").split()
+    glue = "the a is of to and in that it for with as".split()
+
+    def sentence(k: int, pool=topic) -> str:
+        return " ".join(rng.choice(pool) if rng.random() < 0.6 else rng.choice(glue)
+                        for _ in range(k))
+
+    corpus = []
+    for _ in range(n):
+        stimulus = rng.choice(("what is ", "how does ", "tell me about ", "")) + sentence(
+            rng.randint(3, 24))
+        roll = rng.random()
+        if roll < 0.05:
+            text = ""
+        elif roll < 0.10:
+            text = sentence(2)
+        elif roll < 0.20:
+            text = " ".join(f"zz{rng.randint(0, 999)}" for _ in range(rng.randint(6, 30)))
+        elif roll < 0.30:
+            text = sentence(rng.randint(130, 220))
+        elif roll < 0.35:
+            text = "great question, as we know, in conclusion " + sentence(30)
+        else:
+            text = sentence(rng.randint(8, 60))
+        baseline = sentence(40) if rng.random() < 0.2 else ""
+        corpus.append(({"result": text, "baseline": {"text": baseline},
+                        "domains_used": []}, stimulus))
+    return corpus
+
+
+def _bench(n: int = 3000) -> None:
+    import statistics
+
+    from rilie_tokens import tokenize
+
+    corpus = _replay_corpus(n)
+    history = [plate["result"] for plate, _ in _replay_corpus(20, seed=7)]
+
+    def eager(plate, stimulus, memory):
+        # The old loop: every gate evaluated before the first check.
+        checks = [(name, GATES[name](plate, stimulus, memory))
+                  for name in ("EMPTY", "DEJAVU", "RELEVANCE", "RESONANCE", "ORIGINALITY")]
+        return next(((name, reason) for name, (ok, reason) in checks if not ok), None)
+
+    canonical = GatePipeline(("EMPTY", "DEJAVU", "RELEVANCE", "RESONANCE", "ORIGINALITY"))
+    default = GatePipeline()
+    adaptive = GatePipeline(("DEJAVU", "ORIGINALITY", "RELEVANCE", "RESONANCE", "EMPTY"),
+                            adaptive=True)
+    runners = (("eager (old)", eager), ("lazy, old order", canonical.run),
+               ("lazy, cost order", default.run), ("lazy, auto", adaptive.run))
+
+    print(f"{n} plates, cold token cache per plate")
+    print(f"{'pipeline':>18} {'p50 us':>8} {'mean us':>8} {'p95 us':>8} {'served':>7}")
+    for label, run in runners:
+        memory = TalkMemory()
+        for text in history:
+            memory.record(text)
+        samples, served = [], 0
+        for plate, stimulus in corpus:
+            plate = dict(plate)
+            tokenize.cache_clear()
+            t0 = time.perf_counter()
+            failed = run(plate, stimulus, memory)
+            samples.append(time.perf_counter() - t0)
+            served += failed is None
+        samples.sort()
+        print(f"{label:>18} {statistics.median(samples) * 1e6:>8.1f} "
+              f"{statistics.fmean(samples) * 1e6:>8.1f} "
+              f"{samples[int(len(samples) * 0.95)] * 1e6:>8.1f} {served:>7}")
+
+    print("\ncost order, per gate:")
+    for name, row in default.snapshot()["gates"].items():
+        print(f"  {name:<12} calls {row['calls']:>5}  pass {row['pass_rate']:.3f}  "
+              f"{row['mean_us']:>7.1f} us")
+    print(f"auto order settled on: {', '.join(adaptive.order)}")
+
+
+def _bench_speculative(turns: int = 200, kitchen_ms: float = 40.0) -> None:
+    """Turns whose first plate was rejected: sequential vs speculative retries."""
+    import random
+    import statistics
+
+    corpus = _replay_corpus(2000, seed=48)
+    passing = [(p, s) for p, s in corpus if GatePipeline().run(dict(p), s, TalkMemory()) is None]
+    failing = [(p, s) for p, s in corpus
+               if (GatePipeline().run(dict(p), s, TalkMemory()) or ("",))[0] == "RELEVANCE"]
+
+    def kitchen(seed: int):
+        rng = random.Random(seed)
+
+        def retry_fn(stimulus):
+            time.sleep(rng.uniform(0.5, 1.5) * kitchen_ms / 1000.0)
+            # About half the retries come back good.
+            return dict(rng.choice(passing if rng.random() < 0.5 else failing)[0])
+        return retry_fn
+
+    print(f"{turns} rejected first plates, kitchen {kitchen_ms:.0f} ms +-50%, "
+          f"half of retries pass, max_retries=3")
+    print(f"{'mode':>14} {'p50 ms':>7} {'p95 ms':>7} {'served':>7} {'cooked':>7}")
+    for label, speculative in (("sequential", 0), ("speculative 3", 3)):
+        rng = random.Random(1)
+        samples, served, cooked = [], 0, 0
+        for turn in range(turns):
+            plate, stimulus = rng.choice(failing)
+            calls = []
+            retry_fn = kitchen(turn)
+
+            def counted(stim, retry_fn=retry_fn, calls=calls):
+                calls.append(1)
+                return retry_fn(stim)
+
+            t0 = time.perf_counter()
+            out = talk(dict(plate), stimulus, TalkMemory(), max_retries=3,
+                       retry_fn=counted, gates=GatePipeline(),
+                       speculative=speculative, retry_budget=1.0)
+            samples.append(time.perf_counter() - t0)
+            served += out["talk_status"] != "EXHAUSTED"
+            cooked += len(calls)
+        samples.sort()
+        print(f"{label:>14} {statistics.median(samples) * 1e3:>7.1f} "
+              f"{samples[int(len(samples) * 0.95)] * 1e3:>7.1f} {served:>7} {cooked:>7}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.ERROR)
+    if sys.argv[1:] == ["speculative"]:
+        _bench_speculative()
+    else:
+        _bench()
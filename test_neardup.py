@@ -0,0 +1,92 @@
+"""
+test_neardup.py — NEAR-DUP INDEX vs BRUTE FORCE
+================================================
+NearDupIndex answers dejavu questions with an index, but its answers
+must match the exact set math it replaced:
+
+  - query(): Jaccard ≥ threshold against the window, newest first
+  - max_overlap(): |A∩B| / min(|A|,|B|) against the window, including
+    short texts contained in long ones (high overlap, low Jaccard)
+"""
+
+import random
+
+from rilie_neardup import SCAN_BELOW, NearDupIndex
+from rilie_tokens import tokenize
+
+WINDOW = 20
+
+
+def _words(text):
+    return tokenize(text).word_set
+
+
+def _history(rng, vocab, n):
+    texts = []
+    for _ in range(n):
+        if texts and rng.random() < 0.4:
+            # Variation on an earlier text: some words swapped, some dropped.
+            base = rng.choice(texts).split()
+            text = [w if rng.random() < 0.8 else rng.choice(vocab) for w in base]
+            texts.append(" ".join(text[:rng.randint(3, len(text))]))
+        else:
+            texts.append(" ".join(rng.choice(vocab) for _ in range(rng.randint(3, 60))))
+    return texts
+
+
+def _probes(rng, vocab, history):
+    probes = []
+    for text in history:
+        words = text.split()
+        probes.append(text)
+        probes.append(" ".join(rng.sample(words, max(1, len(words) // 4))))   # contained
+        probes.append(" ".join(w if rng.random() < 0.75 else rng.choice(vocab)
+                               for w in words))
+    probes += [" ".join(rng.choice(vocab) for _ in range(8)) for _ in range(50)]
+    return probes
+
+
+def test_query_matches_exact_jaccard():
+    # Below SCAN_BELOW every entry is scored; above it, LSH picks candidates.
+    for window in (WINDOW, 4 * SCAN_BELOW):
+        rng = random.Random(30)
+        vocab = [f"w{i}" for i in range(400)]
+        history = _history(rng, vocab, window + 40)
+        idx = NearDupIndex(window=window)
+        seqs = [idx.add(text) for text in history]
+        recent = list(zip(seqs, history))[-window:]
+
+        for probe in _probes(rng, vocab, history[-WINDOW:]):
+            pw = _words(probe)
+            for threshold in (0.45, 0.55, 0.8):
+                expected = sorted(
+                    ((seq, text, len(pw & _words(text)) / len(pw | _words(text)))
+                     for seq, text in recent
+                     if pw and len(pw & _words(text)) / len(pw | _words(text)) >= threshold),
+                    key=lambda hit: hit[0], reverse=True)
+                assert idx.query(probe, threshold) == expected
+
+
+def test_max_overlap_matches_exact_coefficient():
+    rng = random.Random(39)
+    vocab = [f"w{i}" for i in range(3000)]
+    history = _history(rng, vocab, 40)
+    idx = NearDupIndex(window=WINDOW)
+    for text in history:
+        idx.add(text)
+
+    for probe in _probes(rng, vocab, history[-WINDOW:]):
+        pw = _words(probe)
+        expected = max(
+            (len(pw & _words(text)) / min(len(pw), len(_words(text)))
+             for text in history[-WINDOW:] if pw and _words(text)),
+            default=0.0)
+        assert idx.max_overlap(probe) == expected
+
+
+def test_contained_text_scores_full_overlap():
+    long_text = " ".join(f"w{i}" for i in range(100))
+    idx = NearDupIndex(window=5)
+    idx.add(long_text)
+    assert idx.max_overlap("w3 w17 w42 w58 w61 w77 w80 w99") == 1.0
+    assert idx.query("w3 w17 w42 w58 w61 w77 w80 w99", 0.55) == []
@@ -0,0 +1,153 @@
+"""
+threat_bloom.py — PROBABLY NOT, SO DON'T LOOK
+==============================================
+
+Almost every indicator pulled out of chat is innocent. A Bloom filter in
+front of the big exact stores (URLhaus/OpenPhish URLs, MalwareBazaar
+hashes) answers most of those misses from one 64-bit word, without
+touching the exact store. That matters most when the exact store is on
+disk (compact mode) and a miss would otherwise cost a pread().
+
+The filter is register-blocked: all k bits of a key live in the same
+64-bit word, so a check is one word read and one mask compare. The mask
+comes from a fixed table of 4096 precomputed k-bit patterns, because
+building it bit by bit in Python costs more than the lookup it saves.
+Blocking needs a few more bits per key than a classic Bloom filter for
+the same false-positive rate; BloomFilter.sized() accounts for that.
+
+Keys are the same 64-bit blake2b hash threat_snapshot already computes
+for the slot table, so a prefiltered lookup hashes the string once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+from array import array
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from threat_snapshot import hash64
+
+MAX_K = 10
+MIN_FPR = 0.005
+_PATTERN_BITS = 12
+
+
+@lru_cache(maxsize=None)
+def _patterns(k: int) -> array:
+    """4096 masks with exactly k of 64 bits set. Seeded: stable on disk."""
+    rng = random.Random(0xB100 + k)
+    table = array("Q")
+    for _ in range(1 << _PATTERN_BITS):
+        mask = 0
+        for bit in rng.sample(range(64), k):
+            mask |= 1 << bit
+        table.append(mask)
+    return table
+
+
+class BloomFilter:
+    """Register-blocked Bloom filter over 64-bit key hashes."""
+
+    __slots__ = ("words", "k", "_nwords", "_patterns")
+
+    def __init__(self, words, k: int, patterns=None):
+        self.words = words            # array("Q") or a mapped memoryview
+        self.k = k
+        self._nwords = len(words)
+        # Generating the table costs ~100 ms, so snapshots carry it.
+        self._patterns = _patterns(k) if patterns is None else patterns
+
+    @property
+    def patterns(self):
+        return self._patterns
+
+    @classmethod
+    def sized(cls, n: int, fpr: float) -> "BloomFilter":
+        """Empty filter for n keys at roughly the target false-positive rate.
+
+        Classic sizing is -ln(p) / ln(2)^2 bits per key; blocking into
+        64-bit words costs about a third more at these rates. Below
+        MIN_FPR one word per key stops being enough, so targets clamp.
+        """
+        n = max(1, n)
+        fpr = min(max(fpr, MIN_FPR), 0.5)
+        bits_per_key = -math.log(fpr) / (math.log(2) ** 2) * 1.35
+        k = max(1, min(MAX_K, round(bits_per_key / 1.35 * math.log(2))))
+        nwords = max(1, math.ceil(n * bits_per_key / 64))
+        return cls(array("Q", bytes(8 * nwords)), k)
+
+    @classmethod
+    def build(cls, values: Iterable[str], fpr: float) -> "BloomFilter":
+        hashes = [hash64(v) for v in set(values)]
+        bloom = cls.sized(len(hashes), fpr)
+        for h in hashes:
+            bloom.add_hash(h)
+        return bloom
+
+    # Word from the low bits of h, pattern from the top 12: independent.
+    def add_hash(self, h: int) -> None:
+        self.words[h % self._nwords] |= self._patterns[h >> 52]
+
+    def might_contain_hash(self, h: int) -> bool:
+        mask = self._patterns[h >> 52]
+        return self.words[h % self._nwords] & mask == mask
+
+    def __contains__(self, text: str) -> bool:
+        return self.might_contain_hash(hash64(text))
+
+    def nbytes(self) -> int:
+        return self._nwords * 8
+
+
+class PrefilteredStrings:
+    """
+    Bloom filter in front of an exact string store.
+
+    The exact store may offer contains_hashed(raw, h) to reuse the hash;
+    anything else is asked with plain `in`. Counts how many checks the
+    filter answered alone.
+    """
+
+    __slots__ = ("bloom", "exact", "checks", "filtered")
+
+    def __init__(self, bloom: BloomFilter, exact):
+        self.bloom = bloom
+        self.exact = exact
+        self.checks = 0
+        self.filtered = 0
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def __iter__(self):
+        return iter(self.exact)
+
+    def __contains__(self, text: object) -> bool:
+        if not isinstance(text, str):
+            return False
+        self.checks += 1
+        raw = text.encode("utf-8")
+        h = int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+        if not self.bloom.might_contain_hash(h):
+            self.filtered += 1
+            return False
+        contains_hashed = getattr(self.exact, "contains_hashed", None)
+        if contains_hashed is not None:
+            return contains_hashed(raw, h)
+        return text in self.exact
+
+    def stats(self) -> dict:
+        return {
+            "checks": self.checks,
+            "filtered": self.filtered,
+            "filter_bytes": self.bloom.nbytes(),
+            "k": self.bloom.k,
+        }
+
+
+def prefilter(exact, bloom: Optional[BloomFilter]):
+    """Wrap `exact` when there is a filter, else hand it back unchanged."""
+    return exact if bloom is None else PrefilteredStrings(bloom, exact)
@@ -26,10 +26,18 @@ Usage:
 """
 
 import logging
+import os
+import re
+import threading
 import time
-from typing import Dict, List, Any, Optional, Callable
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 
+import threat_snapshot
+from threat_bloom import BloomFilter, PrefilteredStrings, prefilter
+from threat_netset import Netset
+
 logger = logging.getLogger("threat_intel")
 
 # ============================================================================
@@ -49,6 +57,11 @@ class ThreatFeed:
     last_count: int = 0
     healthy: bool = True
     error: str = ""
+    etag: str = ""               # validators for conditional GETs
+    last_modified: str = ""
+    last_duration: float = 0.0   # seconds, last refresh attempt
+    last_bytes: int = 0          # body bytes transferred, last attempt
+    not_modified: bool = False   # last attempt answered 304
 
 
 # The 9 feeds — all free, all no-auth
@@ -132,6 +145,27 @@ THREAT_FEEDS: List[ThreatFeed] = [
 # THREAT INTEL CACHE
 # ============================================================================
 
+@dataclass(frozen=True)
+class ThreatIndex:
+    """
+    Immutable lookup sets built from the cache lists once per refresh.
+    Checks read one ThreatIndex reference, so a refresh swapping in a new
+    one never leaves a lookup looking at half-updated feeds.
+
+    Built in-process the sets are frozensets; loaded from a snapshot they
+    are MappedStrings over the shared file. Checks only use `in`.
+    """
+    urls: Collection[str] = frozenset()       # lowercased
+    ips: Collection[str] = frozenset()        # single addresses
+    networks: Netset = field(default_factory=lambda: Netset.from_cidrs(()))
+    domains: Collection[str] = frozenset()    # c2 + malicious, lowercased
+    hashes: Collection[str] = frozenset()     # lowercased
+    tor_exits: Collection[str] = frozenset()
+    built_at: float = 0.0
+
+    STRING_SETS = ("urls", "ips", "domains", "hashes", "tor_exits")
+
+
 @dataclass
 class ThreatIntelCache:
     """
@@ -147,30 +181,58 @@ class ThreatIntelCache:
     tor_exits: List[str] = field(default_factory=list)
     last_refresh: float = 0.0
     feed_status: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    index: ThreatIndex = field(default_factory=ThreatIndex)
+    # Counts as published by the refresher, for workers whose lists are
+    # empty because they only map the snapshot.
+    snapshot_counts: Dict[str, int] = field(default_factory=dict)
+    # Each feed's last parsed list. The lists above are merged from these
+    # every poll, so a feed that answers 304 still counts.
+    feed_lists: Dict[str, List[Any]] = field(default_factory=dict)
+
+    LISTS = ("malicious_urls", "malicious_ips", "malicious_domains",
+             "malicious_hashes", "known_cves", "c2_domains", "tor_exits")
+
+    def rebuild_index(self) -> ThreatIndex:
+        """Build fresh lookup sets from the lists, then swap them in."""
+        index = ThreatIndex(
+            urls=frozenset(u.lower() for u in self.malicious_urls),
+            ips=frozenset(ip for ip in self.malicious_ips if "/" not in ip),
+            networks=Netset.from_cidrs(
+                ip for ip in self.malicious_ips if "/" in ip
+            ),
+            domains=frozenset(
+                d.lower() for d in (*self.c2_domains, *self.malicious_domains)
+            ),
+            hashes=frozenset(h.lower() for h in self.malicious_hashes),
+            tor_exits=frozenset(self.tor_exits),
+            built_at=time.time(),
+        )
+        self.index = index  # single reference assignment — atomic swap
+        return index
+
+    def counts(self) -> Dict[str, int]:
+        """Per-list indicator counts (snapshot counts if lists are empty)."""
+        counts = {name: len(getattr(self, name)) for name in self.LISTS}
+        if not any(counts.values()) and self.snapshot_counts:
+            return dict(self.snapshot_counts)
+        return counts
 
     def total_indicators(self) -> int:
         """Total number of threat indicators loaded."""
-        return (
-            len(self.malicious_urls) +
-            len(self.malicious_ips) +
-            len(self.malicious_domains) +
-            len(self.malicious_hashes) +
-            len(self.known_cves) +
-            len(self.c2_domains) +
-            len(self.tor_exits)
-        )
+        return sum(self.counts().values())
 
     def summary(self) -> Dict[str, Any]:
         """Summary for health checks and API exposure."""
+        counts = self.counts()
         return {
-            "total_indicators": self.total_indicators(),
-            "malicious_urls": len(self.malicious_urls),
-            "malicious_ips": len(self.malicious_ips),
-            "malicious_domains": len(self.malicious_domains),
-            "malicious_hashes": len(self.malicious_hashes),
-            "known_cves": len(self.known_cves),
-            "c2_domains": len(self.c2_domains),
-            "tor_exits": len(self.tor_exits),
+            "total_indicators": sum(counts.values()),
+            "malicious_urls": counts["malicious_urls"],
+            "malicious_ips": counts["malicious_ips"],
+            "malicious_domains": counts["malicious_domains"],
+            "malicious_hashes": counts["malicious_hashes"],
+            "known_cves": counts["known_cves"],
+            "c2_domains": counts["c2_domains"],
+            "tor_exits": counts["tor_exits"],
             "last_refresh": self.last_refresh,
             "feed_status": self.feed_status,
         }
@@ -189,9 +251,24 @@ def get_cache() -> ThreatIntelCache:
 # FEED POLLING ENGINE
 # ============================================================================
 
-def _fetch_feed(feed: ThreatFeed, fetch_fn: Optional[Callable] = None) -> List[str]:
+FEED_POLL_CONCURRENCY = int(os.getenv("RILIE_FEED_CONCURRENCY", "4"))
+FEED_TIMEOUT = 15
+
+
+def _keep_line(line: str) -> bool:
+    return bool(line) and not line.startswith("#")
+
+
+def _fetch_feed(
+    feed: ThreatFeed, fetch_fn: Optional[Callable] = None,
+) -> Optional[List[str]]:
     """
-    Fetch a single feed and return raw lines.
+    Fetch a single feed and return its stripped, non-comment lines.
+
+    Without fetch_fn this is a conditional GET: the feed's stored ETag /
+    Last-Modified go out as If-None-Match / If-Modified-Since, and a 304
+    returns None so the caller keeps what it already parsed. The body is
+    read line by line, never buffered whole.
 
     Args:
         feed: The ThreatFeed to poll.
@@ -199,25 +276,47 @@ def _fetch_feed(feed: ThreatFeed, fetch_fn: Optional[Callable] = None) -> List[s
                   Signature: fetch_fn(url: str) -> str (response text)
 
     Returns:
-        List of raw lines from the feed.
+        Lines from the feed, None if unchanged (304), [] on failure.
     """
+    t0 = time.perf_counter()
+    feed.not_modified = False
+    nbytes = 0
     try:
         if fetch_fn:
             text = fetch_fn(feed.url)
+            nbytes = len(text.encode("utf-8", errors="replace"))
+            lines = [line.strip() for line in text.splitlines()]
+            lines = [line for line in lines if _keep_line(line)]
         else:
+            import urllib.error
             import urllib.request
-            req = urllib.request.Request(
-                feed.url,
-                headers={"User-Agent": "RILIE-ThreatIntel/1.0"},
-            )
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                text = resp.read().decode("utf-8", errors="replace")
-
-        lines = [
-            line.strip()
-            for line in text.splitlines()
-            if line.strip() and not line.strip().startswith("#")
-        ]
+            headers = {"User-Agent": "RILIE-ThreatIntel/1.0"}
+            if feed.etag:
+                headers["If-None-Match"] = feed.etag
+            if feed.last_modified:
+                headers["If-Modified-Since"] = feed.last_modified
+            req = urllib.request.Request(feed.url, headers=headers)
+            try:
+                resp = urllib.request.urlopen(req, timeout=FEED_TIMEOUT)
+            except urllib.error.HTTPError as e:
+                if e.code != 304:
+                    raise
+                feed.last_poll = time.time()
+                feed.healthy = True
+                feed.error = ""
+                feed.not_modified = True
+                logger.info("Feed '%s' not modified", feed.name)
+                return None
+            lines = []
+            with resp:
+                for raw in resp:
+                    nbytes += len(raw)
+                    line = raw.decode("utf-8", errors="replace").strip()
+                    if _keep_line(line):
+                        lines.append(line)
+                feed.etag = resp.headers.get("ETag", "") or ""
+                feed.last_modified = resp.headers.get("Last-Modified", "") or ""
+
         feed.last_poll = time.time()
         feed.last_count = len(lines)
         feed.healthy = True
@@ -230,6 +329,9 @@ def _fetch_feed(feed: ThreatFeed, fetch_fn: Optional[Callable] = None) -> List[s
         feed.error = str(e)[:200]
         logger.warning("Feed '%s' failed: %s", feed.name, e)
         return []
+    finally:
+        feed.last_duration = time.perf_counter() - t0
+        feed.last_bytes = nbytes
 
 
 def _parse_abuse_csv(lines: List[str]) -> List[str]:
@@ -254,6 +356,16 @@ def _parse_text_lines(lines: List[str]) -> List[str]:
     ]
 
 
+def _parse_dshield_blocks(lines: List[str]) -> List[str]:
+    """Parse DShield block.txt — "start<TAB>end<TAB>prefixlen..." → CIDRs."""
+    results = []
+    for line in lines:
+        parts = line.split("\t")
+        if len(parts) >= 3 and parts[2].strip().isdigit():
+            results.append(f"{parts[0].strip()}/{parts[2].strip()}")
+    return results
+
+
 def _parse_cisa_json(lines: List[str]) -> List[Dict[str, str]]:
     """Parse CISA KEV JSON feed."""
     import json
@@ -276,122 +388,438 @@ def _parse_cisa_json(lines: List[str]) -> List[Dict[str, str]]:
         return []
 
 
+def _apply_feed(feed: ThreatFeed, lines: List[str]) -> None:
+    """Parse one feed's lines into its own slot in _cache.feed_lists."""
+    if feed.name == "URLhaus":
+        parsed = _parse_abuse_csv(lines)[:10000]  # Cap
+    elif feed.name == "MalwareBazaar Recent":
+        parsed = _parse_text_lines(lines)[:5000]
+    elif feed.name == "SSL Blacklist":
+        parsed = _parse_abuse_csv(lines)
+    elif feed.name == "DShield Top 20":
+        parsed = _parse_dshield_blocks(lines)[:100]
+    elif feed.name == "Tor Exit Nodes":
+        parsed = _parse_text_lines(lines)
+    elif feed.name == "OpenPhish":
+        parsed = _parse_text_lines(lines)
+    elif feed.name == "FireHOL Level 1":
+        parsed = _parse_text_lines(lines)
+    elif feed.name == "CISA KEV":
+        parsed = _parse_cisa_json(lines)
+    elif feed.name == "C2 Intel Domains":
+        parsed = _parse_abuse_csv(lines)[:5000]
+    else:
+        return
+    _cache.feed_lists[feed.name] = parsed
+
+
+# Cache list → (feeds merged into it, in order; cap).
+_MERGES: Dict[str, Tuple[Tuple[str, ...], Optional[int]]] = {
+    "malicious_urls": (("URLhaus", "OpenPhish"), 15000),
+    "malicious_ips": (("SSL Blacklist", "DShield Top 20", "FireHOL Level 1"), 30000),
+    "malicious_hashes": (("MalwareBazaar Recent",), None),
+    "tor_exits": (("Tor Exit Nodes",), None),
+    "known_cves": (("CISA KEV",), None),
+    "c2_domains": (("C2 Intel Domains",), None),
+}
+
+
+def _merge_feeds() -> None:
+    """
+    Rebuild the shared cache lists from every feed's last parsed list.
+
+    URLhaus and OpenPhish share one list, and so do the three IP feeds.
+    Merging from scratch means one feed's fresh data never wipes out
+    another feed's data when that feed answered 304.
+    """
+    lists = _cache.feed_lists
+    for name, (feeds, cap) in _MERGES.items():
+        if len(feeds) == 1:
+            merged = list(lists.get(feeds[0], ()))
+        else:
+            merged = list(dict.fromkeys(
+                value for feed in feeds for value in lists.get(feed, ())))
+        setattr(_cache, name, merged[:cap] if cap else merged)
+
+
+def _feed_timing(feed: ThreatFeed) -> Dict[str, Any]:
+    return {
+        "duration_ms": round(feed.last_duration * 1000, 1),
+        "bytes": feed.last_bytes,
+    }
+
+
 def poll_all_feeds(
     force: bool = False,
     fetch_fn: Optional[Callable] = None,
+    max_workers: int = FEED_POLL_CONCURRENCY,
 ) -> Dict[str, Any]:
     """
     Poll all 9 threat intel feeds that are due for refresh.
 
+    Due feeds are fetched concurrently, at most max_workers at a time.
+    Each feed's parse lands in its own slot, and the shared lists are
+    merged from all slots afterwards. A feed that answers 304 keeps its
+    parsed data, and still counts in the merge.
+
     Args:
         force: If True, poll all feeds regardless of schedule.
         fetch_fn: Optional HTTP fetch function for testing.
+        max_workers: Concurrent fetch bound.
 
     Returns:
         Summary dict with poll results.
     """
+    from concurrent.futures import ThreadPoolExecutor
+
     global _cache
     now = time.time()
     polled = 0
     skipped = 0
     failed = 0
+    unchanged = 0
 
-    for feed in THREAT_FEEDS:
-        # Check if due for refresh
-        elapsed = now - feed.last_poll
-        if not force and elapsed < feed.poll_interval:
-            skipped += 1
+    due = [
+        feed for feed in THREAT_FEEDS
+        if force or now - feed.last_poll >= feed.poll_interval
+    ]
+    skipped = len(THREAT_FEEDS) - len(due)
+
+    if due:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(due))),
+                                thread_name_prefix="threat-feed") as pool:
+            fetched = list(pool.map(lambda f: _fetch_feed(f, fetch_fn), due))
+    else:
+        fetched = []
+
+    for feed, lines in zip(due, fetched):
+        if lines is None:
+            unchanged += 1
+            status = _cache.feed_status.setdefault(feed.name, {})
+            status.update(healthy=True, not_modified=True,
+                          last_poll=feed.last_poll, **_feed_timing(feed))
             continue
-
-        lines = _fetch_feed(feed, fetch_fn)
         if not lines:
             failed += 1
             _cache.feed_status[feed.name] = {
                 "healthy": False, "error": feed.error, "count": 0,
+                **_feed_timing(feed),
             }
             continue
 
-        # Parse and store based on category
-        if feed.name == "URLhaus":
-            parsed = _parse_abuse_csv(lines)
-            _cache.malicious_urls = parsed[:10000]  # Cap
-        elif feed.name == "MalwareBazaar Recent":
-            _cache.malicious_hashes = _parse_text_lines(lines)[:5000]
-        elif feed.name == "SSL Blacklist":
-            parsed = _parse_abuse_csv(lines)
-            # Merge with existing IPs (don't replace)
-            existing = set(_cache.malicious_ips)
-            existing.update(parsed)
-            _cache.malicious_ips = list(existing)[:20000]
-        elif feed.name == "DShield Top 20":
-            _cache.malicious_ips.extend(_parse_text_lines(lines)[:100])
-        elif feed.name == "Tor Exit Nodes":
-            _cache.tor_exits = _parse_text_lines(lines)
-        elif feed.name == "OpenPhish":
-            # Merge with URLhaus URLs
-            existing = set(_cache.malicious_urls)
-            existing.update(_parse_text_lines(lines))
-            _cache.malicious_urls = list(existing)[:15000]
-        elif feed.name == "FireHOL Level 1":
-            existing = set(_cache.malicious_ips)
-            existing.update(_parse_text_lines(lines))
-            _cache.malicious_ips = list(existing)[:30000]
-        elif feed.name == "CISA KEV":
-            _cache.known_cves = _parse_cisa_json(lines)
-        elif feed.name == "C2 Intel Domains":
-            _cache.c2_domains = _parse_abuse_csv(lines)[:5000]
-
+        _apply_feed(feed, lines)
         _cache.feed_status[feed.name] = {
             "healthy": True, "count": feed.last_count,
-            "last_poll": feed.last_poll,
+            "last_poll": feed.last_poll, "not_modified": False,
+            **_feed_timing(feed),
         }
         polled += 1
 
     _cache.last_refresh = now
+    if due:
+        _merge_feeds()
+    if polled:
+        _cache.rebuild_index()
 
     result = {
         "polled": polled,
+        "unchanged": unchanged,
         "skipped": skipped,
         "failed": failed,
+        "bytes": sum(feed.last_bytes for feed in due),
+        "duration_ms": round((time.time() - now) * 1000, 1),
         "total_indicators": _cache.total_indicators(),
         "timestamp": now,
     }
-    logger.info("Threat intel refresh: polled=%d skipped=%d failed=%d total=%d",
-                polled, skipped, failed, _cache.total_indicators())
+    logger.info("Threat intel refresh: polled=%d unchanged=%d skipped=%d "
+                "failed=%d total=%d", polled, unchanged, skipped, failed,
+                _cache.total_indicators())
     return result
 
 
+# ============================================================================
+# SHARED SNAPSHOT — one refresher polls, every worker maps the result
+# ============================================================================
+
+SNAPSHOT_PATH = Path(os.getenv(
+    "RILIE_THREAT_SNAPSHOT",
+    str(Path(__file__).resolve().parent / "threat_intel.snapshot"),
+))
+SNAPSHOT_CHECK_INTERVAL = 5.0   # seconds between stat() calls for a newer file
+
+# Bloom prefilter in front of the largest, mostly-missed stores. Sized at
+# publish time from the feed counts. 0 disables it.
+BLOOM_FPR = float(os.getenv("RILIE_THREAT_BLOOM_FPR", "0.01"))
+PREFILTERED = ("urls", "hashes")
+# Compact mode: prefiltered stores stay on disk (pread) instead of mapped.
+COMPACT = os.getenv("RILIE_THREAT_COMPACT", "") == "1"
+
+_FEED_STATE = ("last_poll", "last_count", "healthy", "error",
+               "etag", "last_modified")
+
+_mapped: Optional[threat_snapshot.MappedSnapshot] = None
+_seen_identity: Optional[Tuple[int, int, int]] = None
+_next_snapshot_check = 0.0
+_refresher_lock = None
+
+
+def publish_snapshot(path: Optional[Path] = None) -> int:
+    """Write the current index + per-feed lists as a snapshot. Returns bytes written."""
+    index = _cache.index
+    meta = {
+        "built_at": index.built_at,
+        "last_refresh": _cache.last_refresh,
+        "counts": _cache.counts(),
+        "feed_status": _cache.feed_status,
+        "feeds": {f.name: {k: getattr(f, k) for k in _FEED_STATE}
+                  for f in THREAT_FEEDS},
+    }
+    size = threat_snapshot.write_snapshot(
+        Path(path or SNAPSHOT_PATH),
+        string_sets={name: getattr(index, name) for name in ThreatIndex.STRING_SETS},
+        netsets={"networks": index.networks},
+        meta=meta,
+        lists=_cache.feed_lists,
+        blooms={
+            name: BloomFilter.build(getattr(index, name), BLOOM_FPR)
+            for name in PREFILTERED
+        } if BLOOM_FPR > 0 else None,
+    )
+    logger.info("Threat snapshot published: %s (%d bytes)", path or SNAPSHOT_PATH, size)
+    return size
+
+
+def _mapped_strings(snap: threat_snapshot.MappedSnapshot, name: str) -> Collection[str]:
+    """Exact store for one set — mapped, or on disk in compact mode — behind
+    its Bloom filter when the snapshot carries one."""
+    if name not in PREFILTERED:
+        return snap.strings(name)
+    exact = snap.disk_strings(name) if COMPACT else snap.strings(name)
+    stored = snap.bloom(name) if BLOOM_FPR > 0 else None
+    return prefilter(exact, BloomFilter(*stored) if stored else None)
+
+
+def load_snapshot(
+    path: Optional[Path] = None,
+    restore_lists: bool = False,
+    only_if_newer: bool = False,
+) -> bool:
+    """
+    Map a published snapshot read-only and swap its index in.
+
+    restore_lists also pulls the per-feed lists and feed validators back
+    into this process. Only a refresher needs them, to keep merging feeds.
+    A feed whose list isn't in the snapshot keeps no validators, so its
+    next poll is a full download.
+    only_if_newer leaves a fresher in-process index alone.
+    """
+    global _mapped
+    try:
+        snap = threat_snapshot.MappedSnapshot(Path(path or SNAPSHOT_PATH))
+    except FileNotFoundError:
+        return False
+    except (threat_snapshot.SnapshotError, OSError, ValueError) as e:
+        logger.warning("Threat snapshot unusable, ignoring: %s", e)
+        return False
+    if only_if_newer and snap.meta.get("built_at", 0.0) <= _cache.index.built_at:
+        return False
+
+    index = ThreatIndex(
+        networks=snap.netset("networks"),
+        built_at=snap.meta.get("built_at", 0.0),
+        **{name: _mapped_strings(snap, name) for name in ThreatIndex.STRING_SETS},
+    )
+    if restore_lists:
+        stored = snap.lists() or {}
+        _cache.feed_lists = {f.name: stored[f.name] for f in THREAT_FEEDS
+                             if isinstance(stored.get(f.name), list)}
+        _merge_feeds()
+        for feed in THREAT_FEEDS:
+            if feed.name not in _cache.feed_lists:
+                continue
+            for key, value in snap.meta.get("feeds", {}).get(feed.name, {}).items():
+                setattr(feed, key, value)
+    _cache.snapshot_counts = snap.meta.get("counts", {})
+    _cache.feed_status = snap.meta.get("feed_status", {})
+    _cache.last_refresh = snap.meta.get("last_refresh", 0.0)
+    _cache.index = index
+    _mapped = snap
+    return True
+
+
+def _maybe_remap() -> None:
+    """Pick up a newer snapshot. At most one stat() per interval."""
+    global _next_snapshot_check, _seen_identity
+    now = time.monotonic()
+    if now < _next_snapshot_check:
+        return
+    _next_snapshot_check = now + SNAPSHOT_CHECK_INTERVAL
+    identity = threat_snapshot.file_identity(SNAPSHOT_PATH)
+    if identity is not None and identity != _seen_identity:
+        _seen_identity = identity
+        load_snapshot(only_if_newer=True)
+
+
+def is_refresher() -> bool:
+    """
+    Try to become this host's designated refresher.
+
+    Holds an exclusive, non-blocking flock on <snapshot>.lock for the
+    life of the process. If the holder dies, the lock goes with it and
+    the next worker to ask takes over.
+    """
+    global _refresher_lock
+    if _refresher_lock is not None:
+        return True
+    try:
+        import fcntl
+    except ImportError:
+        return True  # no flock (Windows): every process refreshes itself
+    fh = open(f"{SNAPSHOT_PATH}.lock", "a")
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fh.close()
+        return False
+    _refresher_lock = fh
+    return True
+
+
+def refresh(force: bool = False, fetch_fn: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    The periodic entry point for every worker.
+
+    The refresher polls feeds that are due and publishes a new snapshot
+    if anything changed. Everyone else just remaps the latest snapshot.
+    """
+    if not is_refresher():
+        _maybe_remap()
+        return {"refresher": False, "total_indicators": _cache.total_indicators()}
+    if not _cache.feed_lists:
+        load_snapshot(restore_lists=True)   # taking over: resume, don't re-poll
+    result = poll_all_feeds(force=force, fetch_fn=fetch_fn)
+    if result["polled"] or _mapped is None:
+        publish_snapshot()
+        load_snapshot()    # drop the private copy, share the mapped pages
+    result["refresher"] = True
+    return result
+
+
+# Seconds between refresh() calls in the background thread. Feeds keep
+# their own poll_interval; this is how often a worker checks. 0 = off.
+REFRESH_INTERVAL = float(os.getenv("RILIE_THREAT_REFRESH_S", "300"))
+
+_refresh_thread: Optional[threading.Thread] = None
+_refresh_stop = threading.Event()
+
+
+def start_background(interval: float = REFRESH_INTERVAL) -> bool:
+    """Run refresh() every `interval` seconds in a daemon thread."""
+    global _refresh_thread
+    if interval <= 0 or _refresh_thread is not None:
+        return False
+    _refresh_stop.clear()
+    _refresh_thread = threading.Thread(
+        target=_background_loop, args=(interval,), daemon=True,
+        name="rilie-threat-intel",
+    )
+    _refresh_thread.start()
+    logger.info("Threat intel background refresh started (interval=%.0fs)", interval)
+    return True
+
+
+def stop_background() -> None:
+    """Stop the background refresh thread."""
+    global _refresh_thread
+    _refresh_stop.set()
+    if _refresh_thread is not None:
+        _refresh_thread.join(timeout=5)
+        _refresh_thread = None
+    logger.info("Threat intel background refresh stopped.")
+
+
+def _background_loop(interval: float) -> None:
+    while not _refresh_stop.is_set():
+        try:
+            refresh()
+        except Exception as e:
+            logger.warning("Threat intel refresh failed: %s", e)
+        _refresh_stop.wait(interval)
+
+
 # ============================================================================
 # THREAT LOOKUP — check specific indicators against the cache
 # ============================================================================
 
+def _index() -> ThreatIndex:
+    _maybe_remap()
+    return _cache.index
+
+
 def check_url(url: str) -> bool:
     """Is this URL in our threat feeds?"""
-    return url.lower().strip() in {u.lower() for u in _cache.malicious_urls}
+    return url.lower().strip() in _index().urls
 
 
 def check_ip(ip: str) -> bool:
-    """Is this IP in our threat feeds?"""
-    return ip.strip() in set(_cache.malicious_ips)
+    """Is this IP in our threat feeds — listed outright or inside a netset?"""
+    index = _index()
+    ip = ip.strip()
+    return ip in index.ips or ip in index.networks
+
+
+def match_network(ip: str) -> Optional[str]:
+    """Most specific listed CIDR containing this IP (FireHOL/DShield), if any."""
+    return _index().networks.lookup(ip)
+
+
+def _listed_parent(domains: Collection[str], domain: str) -> Optional[str]:
+    """
+    Walk the reversed labels: "a.b.c2host.com" tries "c2host.com", then
+    "b.c2host.com", then the full name. That is O(labels) set probes,
+    each probe being one level of a hashed suffix trie. Bare TLDs are
+    never matched as parents.
+    """
+    labels = domain.lower().strip().rstrip(".").split(".")
+    for depth in range(2, len(labels) + 1):
+        candidate = ".".join(labels[-depth:])
+        if candidate in domains:
+            return candidate
+    return None
 
 
 def check_domain(domain: str) -> bool:
-    """Is this domain a known C2 or malicious domain?"""
-    d = domain.lower().strip()
-    return (
-        d in {x.lower() for x in _cache.c2_domains} or
-        d in {x.lower() for x in _cache.malicious_domains}
-    )
+    """Is this domain, or any parent of it, a known C2 or malicious domain?"""
+    return _listed_parent(_index().domains, domain) is not None
+
+
+def check_domains(domains: Iterable[str]) -> Dict[str, str]:
+    """
+    Batch form of check_domain: {domain: listed entry it matched} for the
+    hits only. Reads the index once and checks each distinct name once.
+    """
+    index_domains = _index().domains
+    hits: Dict[str, str] = {}
+    for domain in dict.fromkeys(domains):
+        listed = _listed_parent(index_domains, domain)
+        if listed is not None:
+            hits[domain] = listed
+    return hits
 
 
 def check_hash(hash_str: str) -> bool:
     """Is this hash a known malware sample?"""
-    return hash_str.lower().strip() in {h.lower() for h in _cache.malicious_hashes}
+    return hash_str.lower().strip() in _index().hashes
 
 
 def check_tor_exit(ip: str) -> bool:
     """Is this IP a known Tor exit node?"""
-    return ip.strip() in set(_cache.tor_exits)
+    return ip.strip() in _index().tor_exits
+
+
+_DOMAIN_RE = re.compile(
+    r'\b(?:[a-zA-Z0-9](?:[-a-zA-Z0-9]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,63}\b'
+)
 
 
 def check_stimulus_for_threats(stimulus: str) -> Dict[str, Any]:
@@ -417,7 +845,6 @@ def check_stimulus_for_threats(stimulus: str) -> Dict[str, Any]:
             "tor_exits": [...],
         }
     """
-    import re
 
     result: Dict[str, Any] = {
         "threats_found": 0,
@@ -445,10 +872,11 @@ def check_stimulus_for_threats(stimulus: str) -> Dict[str, Any]:
             result["tor_exits"].append(ip)
             result["threats_found"] += 1
 
-    # Extract potential domains
-    domains = re.findall(r'\b[a-zA-Z0-9][-a-zA-Z0-9]*\.[a-zA-Z]{2,}\b', stimulus)
+    # Extract potential domains (any depth) and check them in one pass
+    domains = _DOMAIN_RE.findall(stimulus)
+    hits = check_domains(domains)
     for domain in domains:
-        if check_domain(domain):
+        if domain in hits:
             result["malicious_domains"].append(domain)
             result["threats_found"] += 1
 
@@ -483,9 +911,357 @@ def get_threat_intel_status() -> Dict[str, Any]:
                 "last_count": f.last_count,
                 "poll_interval": f.poll_interval,
                 "error": f.error,
+                "last_duration_ms": round(f.last_duration * 1000, 1),
+                "last_bytes": f.last_bytes,
+                "not_modified": f.not_modified,
             }
             for f in THREAT_FEEDS
         ],
         "total_feeds": len(THREAT_FEEDS),
         "healthy_feeds": sum(1 for f in THREAT_FEEDS if f.healthy),
+        "compact": COMPACT,
+        "prefilter": {
+            name: getattr(_cache.index, name).stats()
+            for name in PREFILTERED
+            if isinstance(getattr(_cache.index, name), PrefilteredStrings)
+        },
+    }
+
+
+# ============================================================================
+# BENCHMARK — python threat_intel.py
+# ============================================================================
+
+def _bench(checks: int = 2000) -> None:
+    """Per-check latency: set rebuilt per call (old) vs prebuilt index."""
+    import random
+
+    rng = random.Random(9)
+    cache = ThreatIntelCache(
+        malicious_urls=[f"http://bad{i}.example/Payload{i}" for i in range(15000)],
+        malicious_ips=[f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+                       for i in range(30000)],
+        malicious_hashes=[f"{rng.getrandbits(128):032X}" for _ in range(5000)],
+        c2_domains=[f"c2-{i}.example" for i in range(5000)],
+    )
+    probes = [f"http://bad{rng.randrange(30000)}.example/payload1"
+              for _ in range(checks)]
+
+    t0 = time.perf_counter()
+    for p in probes:
+        p.lower().strip() in {u.lower() for u in cache.malicious_urls}
+    per_call = (time.perf_counter() - t0) / checks * 1e6
+
+    t0 = time.perf_counter()
+    cache.rebuild_index()
+    build_ms = (time.perf_counter() - t0) * 1e3
+
+    t0 = time.perf_counter()
+    for p in probes:
+        p.lower().strip() in cache.index.urls
+    indexed = (time.perf_counter() - t0) / checks * 1e6
+
+    print(f"indicators: {cache.total_indicators()}")
+    print(f"check_url, set per call: {per_call:10.2f} us")
+    print(f"check_url, prebuilt:     {indexed:10.2f} us")
+    print(f"index rebuild (once per refresh): {build_ms:.1f} ms")
+
+
+def _standin_check(delay: float = 0.2, lines_per_feed: int = 20000) -> None:
+    """Poll a local stand-in feed server: sequential vs concurrent, then 304s.
+
+    Every feed URL is pointed at a ThreadingHTTPServer on 127.0.0.1. Each
+    response is delayed to stand in for network latency, and ETag /
+    If-None-Match is honoured. A last, mixed round changes URLhaus and
+    SSL Blacklist only. Their list-mates (OpenPhish, FireHOL) answer 304,
+    and their indicators must survive the merge.
+    """
+    import hashlib
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    def body_for(i: int, feed: ThreatFeed) -> bytes:
+        if feed.format == "json":
+            vulns = [{"cveID": f"CVE-2024-{n}"} for n in range(500)]
+            return json.dumps({"vulnerabilities": vulns}, indent=1).encode()
+        return "\n".join(f"10.{i}.{n >> 8 & 255}.{n & 255}"
+                         for n in range(lines_per_feed)).encode()
+
+    bodies = {f"/{i}": body_for(i, feed) for i, feed in enumerate(THREAT_FEEDS)}
+    etags = {path: f'"{hashlib.md5(body).hexdigest()}"'
+             for path, body in bodies.items()}
+    hits = {"200": 0, "304": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            etag = etags[self.path]
+            if self.headers.get("If-None-Match") == etag:
+                hits["304"] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            hits["200"] += 1
+            body = bodies[self.path]
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    saved = [(f.url, f.etag, f.last_modified) for f in THREAT_FEEDS]
+    try:
+        for i, feed in enumerate(THREAT_FEEDS):
+            feed.url = f"{base}/{i}"
+        for label, workers in (("sequential", 1), ("concurrent", FEED_POLL_CONCURRENCY)):
+            for feed in THREAT_FEEDS:
+                feed.etag = feed.last_modified = ""
+            r = poll_all_feeds(force=True, max_workers=workers)
+            print(f"{label:>11}: {r['duration_ms']:8.1f} ms  "
+                  f"{r['bytes'] / 1024:8.1f} KiB  polled={r['polled']}")
+        r = poll_all_feeds(force=True)
+        print(f"{'revalidate':>11}: {r['duration_ms']:8.1f} ms  "
+              f"{r['bytes'] / 1024:8.1f} KiB  unchanged={r['unchanged']}")
+        for feed in THREAT_FEEDS[:3]:
+            print(f"  {feed.name:<22} {feed.last_duration * 1000:6.1f} ms "
+                  f"{feed.last_bytes:>8} B  304={feed.not_modified}")
+
+        names = [feed.name for feed in THREAT_FEEDS]
+        phish_url = f"10.{names.index('OpenPhish')}.0.1"
+        firehol_ip = f"10.{names.index('FireHOL Level 1')}.0.1"
+        for name in ("URLhaus", "SSL Blacklist"):
+            path = f"/{names.index(name)}"
+            bodies[path] += b"\n192.0.2.1"
+            etags[path] = f'"{hashlib.md5(bodies[path]).hexdigest()}"'
+        r = poll_all_feeds(force=True)
+        kept = check_url(phish_url) and check_ip(firehol_ip)
+        print(f"{'mixed':>11}: polled={r['polled']} unchanged={r['unchanged']}  "
+              f"304 list-mates kept={kept}  new={check_ip('192.0.2.1')}")
+        if not kept:
+            raise AssertionError("a 304 feed's indicators were lost in the merge")
+        print(f"server: {hits}")
+    finally:
+        server.shutdown()
+        for feed, (url, etag, modified) in zip(THREAT_FEEDS, saved):
+            feed.url, feed.etag, feed.last_modified = url, etag, modified
+
+
+def _domain_check(sizes=(5_000, 50_000, 500_000), probes: int = 20_000) -> None:
+    """Subdomain-aware domain checks at C2 / phishing-list sizes.
+
+    Compares the suffix walk (in-process frozenset and mapped snapshot)
+    with a linear endswith() scan, which is what parent matching costs
+    without an index.
+    """
+    import random
+    import tempfile
+
+    rng = random.Random(35)
+    tlds = ("com", "net", "org", "ru", "xyz", "top", "info")
+
+    def name(depth: int) -> str:
+        return ".".join(f"{rng.choice('abcdefghij')}{rng.getrandbits(24):x}"
+                        for _ in range(depth)) + "." + rng.choice(tlds)
+
+    print(f"{'listed':>8} {'scan us':>9} {'walk us':>8} {'mapped us':>10} "
+          f"{'batch/stim us':>14} {'hit %':>6}")
+    for n in sizes:
+        listed = [name(rng.choice((1, 1, 2))) for _ in range(n)]
+        queries = [
+            f"{name(rng.randint(0, 2)).rsplit('.', 1)[0]}.{rng.choice(listed)}"
+            if rng.random() < 0.2 else name(rng.randint(1, 4))
+            for _ in range(probes)
+        ]
+        domains = frozenset(listed)
+
+        scan_n = max(1, probes // (n // 500 or 1))
+        t0 = time.perf_counter()
+        for q in queries[:scan_n]:
+            any(q == d or q.endswith("." + d) for d in listed)
+        scan = (time.perf_counter() - t0) / scan_n * 1e6
+
+        t0 = time.perf_counter()
+        hits = sum(1 for q in queries if _listed_parent(domains, q))
+        walk = (time.perf_counter() - t0) / probes * 1e6
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "d.snapshot"
+            threat_snapshot.write_snapshot(path, {"domains": domains}, {}, {})
+            mapped = threat_snapshot.MappedSnapshot(path).strings("domains")
+            t0 = time.perf_counter()
+            for q in queries:
+                _listed_parent(mapped, q)
+            mapped_us = (time.perf_counter() - t0) / probes * 1e6
+            del mapped
+
+        _cache.c2_domains = listed
+        _cache.rebuild_index()
+        stimuli = [" ".join(queries[i:i + 5]) for i in range(0, probes, 5)]
+        t0 = time.perf_counter()
+        for stim in stimuli:
+            check_domains(_DOMAIN_RE.findall(stim))
+        batch = (time.perf_counter() - t0) / len(stimuli) * 1e6
+        print(f"{n:>8} {scan:>9.0f} {walk:>8.2f} {mapped_us:>10.2f} "
+              f"{batch:>14.1f} {hits / probes * 100:>6.1f}")
+
+
+_WARM_PROBE = """
+import os, sys, time
+os.environ["RILIE_THREAT_SNAPSHOT"] = sys.argv[1]
+import threat_intel as t
+def mem_kib(field):
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+before = mem_kib("Rss"), mem_kib("Pss")
+t0 = time.perf_counter()
+{body}
+t.check_ip("10.1.2.3")
+ms = (time.perf_counter() - t0) * 1e3
+t0 = time.perf_counter()
+for i in range(20000):
+    t.check_url(f"http://probe{{i}}.example/")
+us = (time.perf_counter() - t0) / 20000 * 1e6
+print(ms, us, mem_kib("Rss") - before[0], mem_kib("Pss") - before[1],
+      t.get_cache().total_indicators())
+"""
+
+
+def _snapshot_check(workers: int = 4) -> None:
+    """Cold-worker cost: rebuild from lists vs map the shared snapshot.
+
+    A synthetic cache (feed-sized lists, 5k CIDRs) is published once.
+    Then `workers` fresh interpreters each get warm either by rebuilding
+    the index from the lists (the parse cost, without the download) or by
+    mapping the snapshot. Linux only — memory is read from smaps_rollup.
+    """
+    import json
+    import random
+    import subprocess
+    import sys
+    import tempfile
+
+    rng = random.Random(34)
+    lists = {
+        "malicious_urls": [f"http://bad{i}.example/p{i}" for i in range(15000)],
+        "malicious_ips": [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+                          for i in range(25000)]
+                         + [f"172.{i >> 8 & 255}.{i & 255}.0/24" for i in range(5000)],
+        "malicious_hashes": [f"{rng.getrandbits(128):032x}" for _ in range(5000)],
+        "c2_domains": [f"c2-{i}.example" for i in range(5000)],
+        "tor_exits": [f"185.{i >> 8 & 255}.{i & 255}.1" for i in range(2000)],
     }
+    with tempfile.TemporaryDirectory() as tmp:
+        snap = Path(tmp) / "threat_intel.snapshot"
+        lists_file = Path(tmp) / "lists.json"
+        lists_file.write_text(json.dumps(lists))
+        for name, values in lists.items():
+            setattr(_cache, name, values)
+        _cache.rebuild_index()
+        size = publish_snapshot(snap)
+
+        cases = {
+            "rebuild": (f"lists = __import__('json').load(open({str(lists_file)!r}))\n"
+                        "for k, v in lists.items(): setattr(t._cache, k, v)\n"
+                        "t._cache.rebuild_index()"),
+            "mapped": "t.load_snapshot()",
+        }
+        print(f"snapshot: {size / 1024:.0f} KiB, {_cache.total_indicators()} indicators")
+        print(f"{'':>8} {'warm ms':>8} {'check us':>9} {'RSS +KiB':>9} {'PSS +KiB':>9}")
+        for label, body in cases.items():
+            procs = [subprocess.Popen(
+                [sys.executable, "-c", _WARM_PROBE.format(body=body), str(snap)],
+                cwd=str(Path(__file__).resolve().parent),
+                stdout=subprocess.PIPE, text=True) for _ in range(workers)]
+            rows = sorted(tuple(float(x) for x in p.communicate()[0].split()[:4])
+                          for p in procs)
+            ms, us, rss, pss = rows[len(rows) // 2]
+            print(f"{label:>8} {ms:>8.1f} {us:>9.2f} {rss:>9.0f} {pss:>9.0f}")
+
+
+_PREFILTER_PROBE = """
+import os, sys, time
+import threat_intel as t
+def mem_kib(field):
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+before = mem_kib("Rss"), mem_kib("Pss")
+{body}
+probes = [f"{{i:032x}}" if i % 20 == 0 else f"{{i:031x}}z" for i in range(40000)]
+t0 = time.perf_counter()
+hits = sum(t.check_hash(p) for p in probes)
+us = (time.perf_counter() - t0) / len(probes) * 1e6
+print(us, mem_kib("Rss") - before[0], mem_kib("Pss") - before[1], hits)
+"""
+
+
+def _prefilter_check(hashes: int = 300_000, urls: int = 100_000) -> None:
+    """Mostly-miss hash checks (95% innocent) per worker mode.
+
+    Linux only. Each mode runs in a fresh interpreter. Memory is the
+    smaps_rollup growth across load + 40k checks.
+    """
+    import subprocess
+    import sys
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snap = Path(tmp) / "threat_intel.snapshot"
+        _cache.malicious_hashes = [f"{i * 20:032x}" for i in range(hashes)]
+        _cache.malicious_urls = [f"http://bad{i}.example/p" for i in range(urls)]
+        _cache.rebuild_index()
+        size = publish_snapshot(snap)
+        rebuild = (
+            "t._cache.malicious_hashes = [f'{i * 20:032x}' for i in range(%d)]\n"
+            "t._cache.malicious_urls = [f'http://bad{i}.example/p' for i in range(%d)]\n"
+            "t._cache.rebuild_index()" % (hashes, urls))
+        modes = {
+            "in-process": ({}, rebuild),
+            "mapped": ({"RILIE_THREAT_BLOOM_FPR": "0"}, "t.load_snapshot()"),
+            "mapped+bloom": ({}, "t.load_snapshot()"),
+            "disk, no bloom": ({"RILIE_THREAT_COMPACT": "1",
+                                "RILIE_THREAT_BLOOM_FPR": "0"}, "t.load_snapshot()"),
+            "compact": ({"RILIE_THREAT_COMPACT": "1"}, "t.load_snapshot()"),
+        }
+        print(f"snapshot {size / 2**20:.1f} MiB, {hashes} hashes + {urls} urls, "
+              f"fpr target {BLOOM_FPR}")
+        print(f"{'':>14} {'check us':>9} {'RSS +KiB':>9} {'PSS +KiB':>9} {'hits':>6}")
+        for label, (env, body) in modes.items():
+            out = subprocess.run(
+                [sys.executable, "-c", _PREFILTER_PROBE.format(body=body)],
+                env={**os.environ, "RILIE_THREAT_SNAPSHOT": str(snap), **env},
+                cwd=str(Path(__file__).resolve().parent),
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            us, rss, pss, hits = float(out[0]), int(out[1]), int(out[2]), int(out[3])
+            print(f"{label:>14} {us:>9.2f} {rss:>9} {pss:>9} {hits:>6}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["standin"]:
+        _standin_check()
+    elif sys.argv[1:] == ["prefilter"]:
+        _prefilter_check()
+    elif sys.argv[1:] == ["domains"]:
+        _domain_check()
+    elif sys.argv[1:] == ["snapshot"]:
+        _snapshot_check()
+    elif sys.argv[1:] == ["refresh"]:
+        logging.basicConfig(level=logging.INFO)
+        print(refresh())
+    else:
+        _bench(checks=200)
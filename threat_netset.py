@@ -0,0 +1,238 @@
+"""
+threat_netset.py — IS THIS ADDRESS INSIDE A LISTED RANGE?
+==========================================================
+
+FireHOL Level 1 and DShield publish CIDR netsets, not addresses.
+Exact string membership misses everything inside a range, and expanding
+the ranges into single IPs would cost gigabytes (one /8 alone is 16M).
+
+Netset flattens the prefixes once, at refresh time, into sorted,
+non-overlapping intervals. Each interval is labelled with the most
+specific prefix that covers it. A lookup is then one bisect on a packed
+array, and longest-prefix match comes for free:
+
+    ns = Netset.from_cidrs(["10.0.0.0/8", "10.1.0.0/16", "2001:db8::/32"])
+    ns.lookup("10.1.2.3")        # → "10.1.0.0/16"
+    ns.lookup("10.9.9.9")        # → "10.0.0.0/8"
+    "192.0.2.1" in ns            # → False
+
+IPv4 lives in 32-bit arrays. IPv6 uses two 64-bit halves, which is
+enough because no feed we pull lists anything longer than a /64.
+Unparseable lines are skipped, never fatal.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import socket
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+
+def _parse_addr(text: str) -> Optional[Tuple[int, int]]:
+    """(version, int) for a bare address, or None. inet_pton is ~10x
+    cheaper than ipaddress here, and refresh parses every line."""
+    try:
+        if ":" in text:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, text), "big")
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+    except (OSError, ValueError):
+        return None
+
+
+def _parse_cidr(text: str) -> Optional[Tuple[int, int, int]]:
+    """(version, network int, prefix length) — host bits masked off."""
+    addr, _, plen_text = text.strip().partition("/")
+    parsed = _parse_addr(addr)
+    if parsed is None:
+        return None
+    version, value = parsed
+    bits = 32 if version == 4 else 128
+    if not plen_text:
+        return version, value, bits
+    if not plen_text.isdigit() or int(plen_text) > bits:
+        return None
+    plen = int(plen_text)
+    return version, value & ~((1 << (bits - plen)) - 1), plen
+
+
+class _Family:
+    """Flattened interval table for one address family."""
+
+    __slots__ = ("starts", "ends", "labels", "nets", "plens", "version")
+
+    def __init__(self, version: int, prefixes: List[Tuple[int, int]]):
+        self.version = version
+        bits = 32 if version == 4 else 128
+        code = "I" if version == 4 else "Q"
+        shift = 0 if version == 4 else 64      # v6: keep the top 64 bits
+
+        # Parents sort before children: same start, shorter prefix first.
+        prefixes = sorted(set(prefixes))
+        self.nets = array(code, (net >> shift for net, _ in prefixes))
+        self.plens = array("B", (plen for _, plen in prefixes))
+        self.starts = array(code)
+        self.ends = array(code)
+        self.labels = array("I")
+
+        def emit(lo: int, hi: int, label: int) -> None:
+            if lo > hi:
+                return
+            if self.labels and self.labels[-1] == label and self.ends[-1] + 1 == lo:
+                self.ends[-1] = hi                # coalesce split segments
+                return
+            self.starts.append(lo)
+            self.ends.append(hi)
+            self.labels.append(label)
+
+        stack: List[Tuple[int, int]] = []         # (end, label) of open prefixes
+        cursor = 0
+        for label, (net, plen) in enumerate(prefixes):
+            start = net >> shift
+            end = (net | ((1 << (bits - plen)) - 1)) >> shift
+            while stack and stack[-1][0] < start:
+                top_end, top_label = stack.pop()
+                emit(cursor, top_end, top_label)
+                cursor = top_end + 1
+            if stack:
+                emit(cursor, start - 1, stack[-1][1])
+            cursor = start
+            stack.append((end, label))
+        while stack:
+            top_end, top_label = stack.pop()
+            emit(cursor, top_end, top_label)
+            cursor = top_end + 1
+
+    ARRAYS = ("starts", "ends", "labels", "nets", "plens")
+
+    @classmethod
+    def from_arrays(cls, version: int, **arrays) -> "_Family":
+        """Rebuild from saved arrays (or memoryviews over a mapped file)."""
+        fam = cls.__new__(cls)
+        fam.version = version
+        for name in cls.ARRAYS:
+            setattr(fam, name, arrays[name])
+        return fam
+
+    def lookup(self, value: int) -> Optional[int]:
+        i = bisect_right(self.starts, value) - 1
+        if i >= 0 and value <= self.ends[i]:
+            return self.labels[i]
+        return None
+
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a)
+                   for a in (self.starts, self.ends, self.labels, self.nets, self.plens))
+
+
+class Netset:
+    """Immutable longest-prefix-match index over IPv4 + IPv6 CIDRs."""
+
+    __slots__ = ("_v4", "_v6", "skipped")
+
+    def __init__(self, v4: _Family, v6: _Family, skipped: int = 0):
+        self._v4 = v4
+        self._v6 = v6
+        self.skipped = skipped
+
+    @classmethod
+    def from_cidrs(cls, cidrs: Iterable[str]) -> "Netset":
+        v4: List[Tuple[int, int]] = []
+        v6: List[Tuple[int, int]] = []
+        skipped = 0
+        for cidr in cidrs:
+            parsed = _parse_cidr(cidr)
+            if parsed is None:
+                skipped += 1
+            elif parsed[0] == 4:
+                v4.append(parsed[1:])
+            elif parsed[2] <= 64:
+                v6.append(parsed[1:])
+            else:
+                skipped += 1
+        return cls(_Family(4, v4), _Family(6, v6), skipped)
+
+    def __len__(self) -> int:
+        return len(self._v4.plens) + len(self._v6.plens)
+
+    @property
+    def families(self) -> Tuple[_Family, _Family]:
+        return self._v4, self._v6
+
+    def __contains__(self, ip: str) -> bool:
+        return self._find(ip) is not None
+
+    def _find(self, ip: str) -> Optional[Tuple[_Family, int]]:
+        parsed = _parse_addr(ip.strip())
+        if parsed is None:
+            return None
+        if parsed[0] == 4:
+            fam, value = self._v4, parsed[1]
+        else:
+            fam, value = self._v6, parsed[1] >> 64
+        label = fam.lookup(value)
+        return None if label is None else (fam, label)
+
+    def lookup(self, ip: str) -> Optional[str]:
+        """Most specific listed prefix containing `ip`, or None."""
+        found = self._find(ip)
+        if found is None:
+            return None
+        fam, label = found
+        shift = 0 if fam.version == 4 else 64
+        net = ipaddress.ip_network((fam.nets[label] << shift, fam.plens[label]))
+        return str(net)
+
+    def nbytes(self) -> int:
+        """Bytes held in the packed arrays."""
+        return self._v4.nbytes() + self._v6.nbytes()
+
+
+# ============================================================================
+# BENCHMARK — python threat_netset.py
+# ============================================================================
+
+def _bench(sizes=(10_000, 100_000, 400_000), probes: int = 20_000) -> None:
+    import random
+    import time
+    import tracemalloc
+
+    rng = random.Random(32)
+
+    def synthetic(n: int) -> List[str]:
+        out = []
+        for _ in range(n):
+            if rng.random() < 0.9:
+                plen = rng.choice((16, 20, 22, 24, 24, 24, 28, 32))
+                addr = rng.getrandbits(32) & ~((1 << (32 - plen)) - 1)
+                out.append(f"{ipaddress.IPv4Address(addr)}/{plen}")
+            else:
+                plen = rng.choice((32, 40, 48, 56, 64))
+                addr = (0x2001 << 112 | rng.getrandbits(96)) & ~((1 << (128 - plen)) - 1)
+                out.append(f"{ipaddress.IPv6Address(addr)}/{plen}")
+        return out
+
+    print(f"{'prefixes':>9} {'build s':>8} {'arrays MiB':>11} {'peak MiB':>9} "
+          f"{'lookup us':>10} {'hit %':>6}")
+    for n in sizes:
+        cidrs = synthetic(n)
+        t0 = time.perf_counter()
+        ns = Netset.from_cidrs(cidrs)
+        build = time.perf_counter() - t0
+        del ns
+        tracemalloc.start()
+        ns = Netset.from_cidrs(cidrs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        ips = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(probes)]
+        t0 = time.perf_counter()
+        hits = sum(1 for ip in ips if ip in ns)
+        per = (time.perf_counter() - t0) / probes * 1e6
+        print(f"{n:>9} {build:>8.2f} {ns.nbytes() / 2**20:>11.2f} "
+              f"{peak / 2**20:>9.1f} {per:>10.2f} {hits / probes * 100:>6.1f}")
+
+
+if __name__ == "__main__":
+    _bench()
@@ -0,0 +1,311 @@
+"""
+threat_snapshot.py — THE RADAR, ON DISK
+========================================
+
+Every gunicorn worker used to poll and parse all nine feeds on its own,
+and its checks ran blind until it finished. Now one refresher polls,
+then writes the parsed indexes into a flat binary snapshot. Every
+worker memory-maps that file read-only. The kernel keeps ONE copy of
+the pages per host, and a worker that boots after the first publish is
+warm immediately.
+
+Layout (little-endian, sections 8-byte aligned):
+
+    b"RILIETI\\0" | u32 version | u32 meta length | meta JSON | sections...
+
+The meta JSON carries the section directory, counts, feed status, and
+feed validators. A string set is four sections: 64-bit blake2b hashes,
+offsets, a UTF-8 blob in the same order, and an open-addressing slot
+table (power of two, at most half full) pointing into them. Lookup is a
+short linear probe, then a byte compare to rule out collisions, so
+membership stays exact. Netset arrays are stored as-is and come back as
+memoryviews.
+
+Publishing writes a temp file and renames it over the old one. Readers
+that still hold the old mapping keep it until they remap; nobody ever
+sees a half-written file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from threat_netset import Netset, _Family
+
+MAGIC = b"RILIETI\0"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+
+
+class SnapshotError(Exception):
+    """Snapshot missing, truncated, or written by another format version."""
+
+
+def hash64(text: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+class MappedStrings:
+    """Exact, read-only string set over four mapped snapshot sections."""
+
+    __slots__ = ("_hashes", "_offsets", "_blob", "_slots", "_mask")
+
+    def __init__(self, hashes, offsets, blob, slots):
+        self._hashes = hashes
+        self._offsets = offsets
+        self._blob = blob
+        self._slots = slots
+        self._mask = len(slots) - 1
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, text: object) -> bool:
+        if not isinstance(text, str):
+            return False
+        raw = text.encode("utf-8")
+        h = int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), "little")
+        return self.contains_hashed(raw, h)
+
+    def contains_hashed(self, raw: bytes, h: int) -> bool:
+        slots, mask = self._slots, self._mask
+        i = h & mask
+        entry = slots[i]
+        while entry:
+            j = entry - 1
+            if (self._hashes[j] == h
+                    and self._blob[self._offsets[j]:self._offsets[j + 1]] == raw):
+                return True
+            i = (i + 1) & mask
+            entry = slots[i]
+        return False
+
+    def __iter__(self):
+        for i in range(len(self._hashes)):
+            yield bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8")
+
+
+class DiskStrings:
+    """
+    The same string set read with pread() instead of a mapping.
+
+    Holds only an open descriptor and four offsets, so a worker pays no
+    resident memory for it at all. Each probe step costs a syscall, which
+    is why compact mode always puts a Bloom filter in front.
+    """
+
+    __slots__ = ("_owner", "_fd", "_hashes", "_offsets", "_blob", "_slots",
+                 "_mask", "_n")
+
+    _U32 = struct.Struct("<I")
+    _U64 = struct.Struct("<Q")
+    _U64x2 = struct.Struct("<QQ")
+
+    def __init__(self, owner: "MappedSnapshot", n: int, hashes: int,
+                 offsets: int, blob: int, slots: int, nslots: int):
+        self._owner = owner           # keeps the descriptor open
+        self._fd = owner.fd
+        self._n = n
+        self._hashes, self._offsets, self._blob, self._slots = hashes, offsets, blob, slots
+        self._mask = nslots - 1
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _slot(self, i: int) -> int:
+        return self._U32.unpack(os.pread(self._fd, 4, self._slots + 4 * i))[0]
+
+    def __contains__(self, text: object) -> bool:
+        if not isinstance(text, str):
+            return False
+        return self.contains_hashed(text.encode("utf-8"), hash64(text))
+
+    def contains_hashed(self, raw: bytes, h: int) -> bool:
+        i = h & self._mask
+        entry = self._slot(i)
+        while entry:
+            j = entry - 1
+            if self._U64.unpack(os.pread(self._fd, 8, self._hashes + 8 * j))[0] == h:
+                lo, hi = self._U64x2.unpack(os.pread(self._fd, 16, self._offsets + 8 * j))
+                if os.pread(self._fd, hi - lo, self._blob + lo) == raw:
+                    return True
+            i = (i + 1) & self._mask
+            entry = self._slot(i)
+        return False
+
+    def __iter__(self):
+        for j in range(self._n):
+            lo, hi = self._U64x2.unpack(os.pread(self._fd, 16, self._offsets + 8 * j))
+            yield os.pread(self._fd, hi - lo, self._blob + lo).decode("utf-8")
+
+
+def _pack_strings(values: Iterable[str]) -> Tuple[array, array, bytes, array]:
+    items = sorted((hash64(v), v.encode("utf-8")) for v in set(values))
+    hashes = array("Q", (h for h, _ in items))
+    offsets = array("Q", [0])
+    for _, raw in items:
+        offsets.append(offsets[-1] + len(raw))
+    size = 2
+    while size < 2 * len(items):
+        size <<= 1
+    mask = size - 1
+    slots = array("I", bytes(4 * size))
+    for j, h in enumerate(hashes):
+        i = h & mask
+        while slots[i]:
+            i = (i + 1) & mask
+        slots[i] = j + 1
+    return hashes, offsets, b"".join(raw for _, raw in items), slots
+
+
+def write_snapshot(
+    path: Path,
+    string_sets: Dict[str, Iterable[str]],
+    netsets: Dict[str, Netset],
+    meta: Dict[str, Any],
+    lists: Optional[Dict[str, Any]] = None,
+    blooms: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Serialize and atomically publish. Returns bytes written.
+
+    `lists` (the raw cache lists) go in zlib-compressed; only a process
+    taking over as refresher reads them back, to resume merging.
+    `blooms` are threat_bloom filters (.words, .k and .patterns).
+    """
+    sections: Dict[str, Tuple[str, bytes]] = {}
+    for name, values in string_sets.items():
+        hashes, offsets, blob, slots = _pack_strings(values)
+        sections[f"{name}.hashes"] = ("Q", hashes.tobytes())
+        sections[f"{name}.offsets"] = ("Q", offsets.tobytes())
+        sections[f"{name}.blob"] = ("B", blob)
+        sections[f"{name}.slots"] = ("I", slots.tobytes())
+    for name, netset in netsets.items():
+        for fam in netset.families:
+            for arr_name in _Family.ARRAYS:
+                arr = getattr(fam, arr_name)
+                sections[f"{name}.v{fam.version}.{arr_name}"] = (
+                    arr.typecode, arr.tobytes())
+        meta = {**meta, f"{name}.skipped": netset.skipped}
+    for name, bloom in (blooms or {}).items():
+        sections[f"{name}.bloom"] = ("Q", bloom.words.tobytes())
+        sections[f"{name}.bloom_patterns"] = ("Q", bloom.patterns.tobytes())
+        meta = {**meta, f"{name}.bloom_k": bloom.k}
+    if lists is not None:
+        sections["lists"] = ("B", zlib.compress(json.dumps(lists).encode(), 6))
+
+    # Directory offsets are relative to the first section, so the meta
+    # JSON can be sized before they are known.
+    directory: Dict[str, Tuple[int, int, str]] = {}
+    cursor = 0
+    for name, (code, data) in sections.items():
+        directory[name] = (cursor, len(data), code)
+        cursor += len(data) + (-len(data) % 8)
+    meta_bytes = json.dumps({**meta, "sections": directory}).encode("utf-8")
+    meta_bytes += b" " * (-(_HEADER.size + len(meta_bytes)) % 8)
+
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(meta_bytes)))
+        fh.write(meta_bytes)
+        for code, data in sections.values():
+            fh.write(data)
+            fh.write(b"\0" * (-len(data) % 8))
+        size = fh.tell()
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    return size
+
+
+class MappedSnapshot:
+    """A read-only mapping of one published snapshot file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            st = os.fstat(fh.fileno())
+            if st.st_size < _HEADER.size:
+                raise SnapshotError(f"{path}: truncated")
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            # Same inode as the mapping, even if a newer file is renamed in.
+            self.fd = os.dup(fh.fileno())
+        self.identity = (st.st_ino, st.st_mtime_ns, st.st_size)
+        magic, version, meta_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise SnapshotError(f"{path}: not a v{FORMAT_VERSION} threat snapshot")
+        start = _HEADER.size + meta_len
+        self.meta: Dict[str, Any] = json.loads(bytes(self._mm[_HEADER.size:start]))
+        self._base = start
+        self._view = memoryview(self._mm)
+
+    def __del__(self):
+        try:
+            os.close(self.fd)
+        except (AttributeError, OSError):
+            pass
+
+    def section(self, name: str):
+        offset, length, code = self.meta["sections"][name]
+        lo = self._base + offset
+        view = self._view[lo:lo + length]
+        return view if code == "B" else view.cast(code)
+
+    def strings(self, name: str) -> MappedStrings:
+        return MappedStrings(self.section(f"{name}.hashes"),
+                             self.section(f"{name}.offsets"),
+                             self.section(f"{name}.blob"),
+                             self.section(f"{name}.slots"))
+
+    def disk_strings(self, name: str) -> DiskStrings:
+        """Same set as strings(name), read with pread from its own descriptor."""
+        def where(part: str) -> Tuple[int, int]:
+            offset, length, _ = self.meta["sections"][f"{name}.{part}"]
+            return self._base + offset, length
+        hashes, hashes_len = where("hashes")
+        slots, slots_len = where("slots")
+        return DiskStrings(
+            self, hashes_len // 8, hashes,
+            where("offsets")[0], where("blob")[0], slots, slots_len // 4,
+        )
+
+    def bloom(self, name: str) -> Optional[Tuple[Any, int, Any]]:
+        """(mapped words, k, mapped patterns) for a stored filter, or None."""
+        if f"{name}.bloom" not in self.meta["sections"]:
+            return None
+        return (self.section(f"{name}.bloom"), self.meta[f"{name}.bloom_k"],
+                self.section(f"{name}.bloom_patterns"))
+
+    def netset(self, name: str) -> Netset:
+        families = [
+            _Family.from_arrays(version, **{
+                arr: self.section(f"{name}.v{version}.{arr}")
+                for arr in _Family.ARRAYS
+            })
+            for version in (4, 6)
+        ]
+        return Netset(*families, skipped=self.meta.get(f"{name}.skipped", 0))
+
+    def lists(self) -> Optional[Dict[str, Any]]:
+        if "lists" not in self.meta["sections"]:
+            return None
+        return json.loads(zlib.decompress(self.section("lists")))
+
+
+def file_identity(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime_ns, size) — changes whenever a new snapshot is renamed in."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)